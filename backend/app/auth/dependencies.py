@@ -57,3 +57,12 @@ async def require_auth(
     if user is None:
         raise HTTPException(401, "Authentication required")
     return user
+
+
+async def require_admin(
+    user: User = Depends(require_auth),
+) -> User:
+    """Admin-only endpoints — raises 403 for non-admin users."""
+    if not user.is_admin:
+        raise HTTPException(403, "Admin access required")
+    return user
@@ -8,6 +8,7 @@ class Settings(BaseSettings):
     upload_dir: Path = Path("./data/uploads")
     output_dir: Path = Path("./data/outputs")
     models_cache_dir: Path = Path("./data/models")
+    use_model_store: bool = True  # keep models (safetensors) under models_cache_dir
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./data/convertinx.db"
@@ -19,12 +20,65 @@ class Settings(BaseSettings):
 
     # Model settings
     whisper_model_size: str = "medium"
+    transcription_backend: str = "openai"  # "openai" or "faster-whisper" (CTranslate2)
+    faster_whisper_compute_type: str = "int8"  # CTranslate2 compute type, e.g. int8, int8_float16, float16
+    vad_chunking: bool = False  # split long audio at silences, transcribe chunks in parallel
+    vad_chunk_s: int = 30  # max seconds of speech per chunk
+    vad_min_silence_ms: int = 500  # shorter pauses stay inside a speech region
+    vad_threshold_db: float = -35.0  # speech = frames within this of the loud (p95) level
+    transcription_parallelism: int = 0  # chunks at once; 0 = Whisper pool size
+    whisper_batching: bool = False  # decode 30 s windows from concurrent jobs as one batch
+    whisper_batch_size: int = 8  # max windows per batched decode
+    whisper_batch_window_ms: int = 50
+    whisper_batch_workers: int = 1  # batched decodes at once, each on its own replica
+    transcription_cache_enabled: bool = True  # reuse transcripts of identical audio
+    transcription_cache_path: Path = Path("./data/transcription_cache.db")
+    transcription_cache_memory_entries: int = 64
+    transcription_cache_max_entries: int = 5000
+    whisper_replicas: int = 0  # 0 = as many as fit in whisper_memory_budget_mb
+    whisper_memory_budget_mb: int = 6144
+    preload_models: str = ""  # comma list: whisper, demucs, nllb, or pairs like en-es
+    model_idle_timeout_s: int = 0  # unload models unused for this long; 0 = never
+    model_idle_check_s: int = 60
     default_translation_model: str = "Helsinki-NLP/opus-mt"
+    translation_backend: str = "fp32"  # "fp32" or "int8" (dynamic quantization)
+    translation_routing: str = "balanced"  # quality | balanced | fast
+    translation_opus_pivot: bool = False  # pairs without a direct Opus-MT model go via English on Opus-MT
+    translation_batch_size: int = 16  # chunks per model.generate call
+    default_decoding_profile: str = "balanced"  # fast | balanced | quality
+    translation_batching: bool = True  # share one batcher per model across jobs
+    translation_batch_window_ms: int = 20
+    translation_batch_max_chunks: int = 64
+    translation_concurrency: int = 1  # concurrent generate calls per model when batching
+    translation_memory_budget_mb: int = 6144  # 0 = never evict translation models
+    translation_cache_enabled: bool = True
+    translation_cache_path: Path = Path("./data/translation_memory.db")
+    translation_cache_memory_entries: int = 10000
+    translation_cache_max_entries: int = 500000
 
     # Processing limits
+    text_streaming_threshold_mb: int = 1  # larger text files are streamed
+    text_stream_batch_paragraphs: int = 32
     max_file_size_mb: int = 500
     max_video_duration_seconds: int = 3600
     max_concurrent_jobs: int = 3
+    pipeline_streaming: bool = True  # translate/voice segments while audio/video transcription runs
+    pipeline_stream_batch_s: float = 10.0  # streamed segments are held until they span this long
+    pipeline_stream_batch_segments: int = 16  # ...or until this many are held
+    inference_workers: int = 0  # worker processes for inference; 0 = API-process threads
+
+    # CPU thread budget (0 threads = cores // max_concurrent_jobs;
+    # affinity is a core list like "0-3,8", empty = no pinning, Linux only)
+    thread_budget_enabled: bool = True
+    inference_interop_threads: int = 1
+    whisper_threads: int = 0
+    demucs_threads: int = 0
+    mt_threads: int = 0
+    ffmpeg_threads: int = 0
+    whisper_cpu_affinity: str = ""
+    demucs_cpu_affinity: str = ""
+    mt_cpu_affinity: str = ""
+    ffmpeg_cpu_affinity: str = ""
 
     # API
     api_rate_limit_per_minute: int = 60
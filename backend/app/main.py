@@ -9,7 +9,7 @@ from app.pipeline.orchestrator import JobOrchestrator
 from app.pipeline.progress import ProgressBroadcaster
 from app.config import settings
 from app import dependencies
-from app.routers import upload, jobs, languages, ws, auth, tools, dashboard, api_keys, distribution
+from app.routers import upload, jobs, languages, ws, auth, tools, dashboard, api_keys, distribution, admin
 
 
 @asynccontextmanager
@@ -47,6 +47,21 @@ async def lifespan(app: FastAPI):
     AudioSegment.converter = ffmpeg
     AudioSegment.ffprobe = ffmpeg.replace("ffmpeg", "ffprobe")
 
+    from app.utils.thread_budget import configure_torch
+    configure_torch()
+
+    # Load and warm configured models in the background; /api/ready gates traffic.
+    # With inference workers, each worker process preloads its own models.
+    from app.models.inference_workers import start_worker_pool, stop_worker_pool
+    preload = [name.strip() for name in settings.preload_models.split(",") if name.strip()]
+    worker_pool = start_worker_pool(preload)
+    if worker_pool is None:
+        model_manager.start_preload(preload)
+    else:
+        worker_pool.start_in_background()
+        print(f"Inference workers: {settings.inference_workers}")
+    model_manager.start_idle_reaper()
+
     print("ConvertinX backend starting...")
     print(f"Whisper model: {settings.whisper_model_size}")
     print(f"FFmpeg: {ffmpeg}")
@@ -56,6 +71,7 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    stop_worker_pool()
     model_manager.unload_all()
     from app.db.engine import dispose_engine
     await dispose_engine()
@@ -85,6 +101,7 @@ app.include_router(languages.router, prefix="/api")
 app.include_router(dashboard.router, prefix="/api")
 app.include_router(api_keys.router, prefix="/api")
 app.include_router(distribution.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
 app.include_router(ws.router)
 
 # Serve output files for download
@@ -98,3 +115,47 @@ app.mount(
 @app.get("/api/health")
 async def health_check():
     return {"status": "ok", "service": "ConvertinX", "version": "2.0.0"}
+
+
+@app.get("/api/ready")
+async def readiness_check():
+    """503 until every model in `preload_models` is loaded and warmed."""
+    from fastapi.responses import JSONResponse
+    from app.models.inference_workers import get_worker_pool
+    pool = get_worker_pool()
+    if pool is None:
+        readiness = dependencies.model_manager.readiness()
+    else:
+        readiness = {"ready": pool.ready, "workers": pool.worker_readiness}
+    return JSONResponse(readiness, status_code=200 if readiness["ready"] else 503)
+
+
+@app.get("/api/metrics")
+async def metrics():
+    """Runtime metrics for the inference layer."""
+    from app.services.translation_cache import get_translation_cache
+    from app.services.transcription_cache import get_transcription_cache
+    from app.models.inference_workers import get_worker_pool
+    from app.models.translation_router import get_throughput_tracker
+    from app.utils import thread_budget
+    cache = get_translation_cache()
+    transcripts = get_transcription_cache()
+    pool = get_worker_pool()
+    # With workers, the models live in the worker processes; the API
+    # process's ModelManager would only report empty sections
+    manager = dependencies.model_manager if pool is None else None
+    return {
+        "inference_workers": pool.stats() if pool else None,
+        "thread_budget": thread_budget.describe(),
+        "whisper_pool": manager.whisper_pool_stats() if manager else None,
+        "whisper_batcher": manager.whisper_batcher_stats() if manager else None,
+        "translation_models": manager.translation_model_stats() if manager else None,
+        "translation_batchers": manager.translation_batcher_stats() if manager else None,
+        "translation_routing": {
+            "preference": settings.translation_routing,
+            "routes": manager.translation_route_stats() if manager else None,
+            "throughput": get_throughput_tracker().stats() if manager else None,
+        },
+        "translation_cache": cache.stats() if cache else None,
+        "transcription_cache": transcripts.stats() if transcripts else None,
+    }
@@ -0,0 +1,315 @@
+"""
+Process-isolated inference workers.
+
+With `inference_workers > 0`, heavy calls (transcription, Demucs, translation,
+OCR) run in a pool of spawned worker processes instead of API threads, so
+their Python work no longer competes with the event loop for the GIL and a
+crashing model cannot take the server down. Each worker owns its own
+ModelManager. Arguments and results travel over the executor's pipe, except
+numpy arrays of `_SHM_MIN_BYTES` or more, which are copied into a
+`multiprocessing.shared_memory` block and sent as a small descriptor.
+
+Pipelines call `await run_inference(fn, *args, **kwargs)`. A `model_manager=`
+keyword is swapped for the worker's ModelManager on the other side; with
+workers disabled the call runs in the default thread executor as before.
+"""
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+from app.config import settings
+
+_SHM_MIN_BYTES = 1 << 20
+_MODEL_MANAGER = "__worker_model_manager__"
+
+# Set in each worker process by _init_worker
+_worker_model_manager = None
+
+
+@dataclass
+class _SharedArray:
+    name: str
+    shape: tuple
+    dtype: str
+
+
+def _pack(value, created: list[str]):
+    """Replace large numpy arrays with shared-memory descriptors."""
+    import numpy as np
+
+    if isinstance(value, np.ndarray) and value.nbytes >= _SHM_MIN_BYTES:
+        shm = shared_memory.SharedMemory(create=True, size=value.nbytes)
+        np.ndarray(value.shape, dtype=value.dtype, buffer=shm.buf)[...] = value
+        created.append(shm.name)
+        shm.close()
+        return _SharedArray(shm.name, value.shape, value.dtype.str)
+    if isinstance(value, dict):
+        return {k: _pack(v, created) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_pack(v, created) for v in value)
+    return value
+
+
+def _unpack(value):
+    """Copy shared-memory descriptors back into ordinary numpy arrays."""
+    import numpy as np
+
+    if isinstance(value, _SharedArray):
+        shm = shared_memory.SharedMemory(name=value.name)
+        try:
+            return np.ndarray(value.shape, dtype=value.dtype, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+    if isinstance(value, dict):
+        return {k: _unpack(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_unpack(v) for v in value)
+    return value
+
+
+def _unlink(names: list[str]):
+    for name in names:
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            continue
+        shm.close()
+        shm.unlink()
+
+
+def _init_worker(preload: list[str], ready_queue, generation: int):
+    global _worker_model_manager
+    from app.models.model_manager import ModelManager
+    from app.utils.thread_budget import configure_torch
+
+    configure_torch()
+    settings.ffmpeg_path = settings.resolve_ffmpeg()
+    from pydub import AudioSegment
+    AudioSegment.converter = settings.ffmpeg_path
+
+    _worker_model_manager = ModelManager()
+    # Block this worker's first task until its models are warm
+    thread = _worker_model_manager.start_preload(preload)
+    if thread is not None:
+        thread.join()
+    _worker_model_manager.start_idle_reaper()
+    # Report per process, so the pool knows which workers are ready
+    ready_queue.put((generation, os.getpid(), _worker_model_manager.readiness()))
+
+
+def _run_in_worker(fn, payload):
+    """Executed in the worker: unpack, call, pack the result."""
+    args, kwargs = _unpack(payload)
+    if kwargs.get("model_manager") == _MODEL_MANAGER:
+        kwargs["model_manager"] = _worker_model_manager
+    result = fn(*args, **kwargs)
+    created: list[str] = []
+    return _pack(result, created), created
+
+
+def _spawn_noop():
+    """Submitted once per worker so the executor spawns all of them."""
+    return None
+
+
+class InferenceWorkerPool:
+    """
+    Spawned worker processes; recreated if one of them dies. Each worker
+    reports its PID on `_ready_queue` when its initializer has finished
+    preloading, and the pool is ready once every worker of the current
+    executor generation has reported.
+    """
+
+    def __init__(self, workers: int, preload: list[str]):
+        self._workers = workers
+        self._preload = preload
+        self._lock = threading.Lock()
+        self._generation = 0
+        # pid -> readiness, for workers of the current generation
+        self._ready: dict[int, dict] = {}
+        self._ready_queue = multiprocessing.get_context("spawn").Queue()
+        self._ready_thread = threading.Thread(
+            target=self._watch_ready, name="inference-ready", daemon=True
+        )
+        self._ready_thread.start()
+        self._executor = self._new_executor()
+        # The latest start() task, kept so it is not garbage-collected mid-run
+        self._start_task: asyncio.Task | None = None
+        self.tasks = 0
+        self.failures = 0
+        self.restarts = 0
+        self.shm_bytes = 0
+        self.in_flight = 0
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._preload, self._ready_queue, self._generation),
+        )
+
+    async def start(self):
+        """
+        Spawn every worker. The executor starts one process per submitted
+        task while none is idle, so N tasks at once start all N; readiness
+        arrives separately on the queue.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            await asyncio.gather(*[
+                loop.run_in_executor(executor, _spawn_noop)
+                for _ in range(self._workers)
+            ])
+        except BrokenProcessPool:
+            self._restart(executor)
+
+    def start_in_background(self):
+        """Schedule start() on the running loop; its failures are printed."""
+        self._start_task = asyncio.get_running_loop().create_task(self.start())
+        self._start_task.add_done_callback(_report_start_failure)
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return len(self._ready) >= self._workers
+
+    @property
+    def worker_readiness(self) -> list[dict]:
+        with self._lock:
+            return [{"pid": pid, **state} for pid, state in self._ready.items()]
+
+    def _watch_ready(self):
+        while True:
+            message = self._ready_queue.get()
+            if message is None:
+                return
+            generation, pid, state = message
+            with self._lock:
+                if generation == self._generation:
+                    self._ready[pid] = state
+
+    async def run(self, fn, args: tuple, kwargs: dict):
+        created: list[str] = []
+        payload = _pack((args, kwargs), created)
+        executor = self._executor
+        self.tasks += 1
+        self.in_flight += 1
+        try:
+            packed, result_shm = await asyncio.wrap_future(
+                executor.submit(_run_in_worker, fn, payload)
+            )
+        except BrokenProcessPool:
+            self.failures += 1
+            self._restart(executor)
+            raise RuntimeError(
+                f"Inference worker crashed while running {fn.__name__}"
+            ) from None
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            _unlink(created)
+
+        try:
+            return _unpack(packed)
+        finally:
+            _unlink(result_shm)
+            self.shm_bytes += _shared_bytes(payload) + _shared_bytes(packed)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self._workers,
+            "ready": self.ready,
+            "in_flight": self.in_flight,
+            "tasks": self.tasks,
+            "failures": self.failures,
+            "restarts": self.restarts,
+            "shm_mb": round(self.shm_bytes / 2**20, 1),
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._ready_queue.put(None)
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        """Replace a broken executor once, however many callers noticed."""
+        with self._lock:
+            if self._executor is not broken:
+                return
+            print(
+                f"Inference worker died; restarting the worker pool "
+                f"(restart {self.restarts + 1})"
+            )
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._generation += 1
+            self._ready.clear()
+            self._executor = self._new_executor()
+            self.restarts += 1
+        # Spawn the new workers now rather than on the next job, so that
+        # /api/ready recovers on its own
+        self.start_in_background()
+
+
+def _report_start_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Inference worker pool failed to start: {task.exception()!r}")
+
+
+def _shared_bytes(value) -> int:
+    import numpy as np
+
+    if isinstance(value, _SharedArray):
+        return int(np.prod(value.shape)) * np.dtype(value.dtype).itemsize
+    if isinstance(value, dict):
+        return sum(_shared_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_shared_bytes(v) for v in value)
+    return 0
+
+
+_pool: InferenceWorkerPool | None = None
+
+
+def get_worker_pool() -> InferenceWorkerPool | None:
+    return _pool
+
+
+def start_worker_pool(preload: list[str]) -> InferenceWorkerPool | None:
+    """Create the process-wide pool from settings, or None when disabled."""
+    global _pool
+    if settings.inference_workers <= 0:
+        return None
+    _pool = InferenceWorkerPool(settings.inference_workers, preload)
+    return _pool
+
+
+def stop_worker_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+async def run_inference(fn, *args, **kwargs):
+    """
+    Run a blocking inference call off the event loop: in a worker process
+    when the pool is enabled, otherwise in the default thread executor.
+    `fn` must be a module-level function so it can be sent to a worker.
+    """
+    pool = _pool
+    if pool is None:
+        return await asyncio.get_event_loop().run_in_executor(
+            None, functools.partial(fn, *args, **kwargs)
+        )
+    if "model_manager" in kwargs:
+        kwargs = {**kwargs, "model_manager": _MODEL_MANAGER}
+    return await pool.run(fn, args, kwargs)
@@ -1,133 +1,835 @@
+import os
 import threading
+import time
 import asyncio
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
 from app.config import settings
-from app.utils.language_map import LANGUAGES, get_opus_codes, OPUS_DIRECT_PAIRS
+from app.models import model_store
+from app.models.translation_router import plan_route
+from app.models.whisper_pool import WhisperPool
+from app.utils.language_map import LANGUAGES, get_opus_codes
 
 
 class ModelManager:
     """
     Singleton-pattern model cache.
-    Whisper is loaded lazily on first use.
+    Whisper is loaded lazily on first use, as a pool of replicas.
     Translation models are loaded lazily per language pair and cached.
-    Priority: Opus-MT (direct pairs) -> NLLB-200 -> mBART-50
+    Each new pair is routed to an engine by translation_router.plan_route,
+    which weighs residency, measured throughput and `translation_routing`.
+    Translation models share a memory budget and are evicted least-recently-
+    used first; models pinned by use_translation_model() are never evicted.
+    Cache hits are lock-free. Each pair loads behind its own future, so
+    different pairs load in parallel and callers of the same pair share one
+    load. `_lock` only guards bookkeeping and is never held while loading.
+    Every model records its load time, hits and last use; with
+    `model_idle_timeout_s` set, a reaper thread unloads idle models.
     """
 
     def __init__(self):
-        self._whisper_model = None
+        self._whisper_pool = WhisperPool(self._load_whisper)
+        self._whisper_batcher = None
         self._demucs_model = None
+        self._demucs_usage: dict | None = None
         self._nllb_model = None
         self._nllb_tokenizer = None
+        self._mbart_model = None
+        self._mbart_tokenizer = None
         self._translation_models: dict[str, tuple] = {}
+        self._translation_loading: dict[str, Future] = {}
+        self._route_decisions: dict[str, dict] = {}
+        self._translation_batchers: dict[int, object] = {}
+        # id(model) -> {"name", "size", "refs", "loaded_at", "hits", "last_used"}
+        self._resident: dict[int, dict] = {}
+        self._evicted_names: set[str] = set()
+        self.translation_loads = 0
+        self.translation_evictions = 0
+        self.translation_reloads = 0
+        self.idle_unloads = 0
+        self._preload_status: dict[str, dict] = {}
+        self._reaper_stop = threading.Event()
         self._lock = threading.Lock()
-        self._whisper_lock = threading.Lock()
-        self._whisper_use_lock = threading.Lock()  # prevents concurrent transcription
+        self._batcher_lock = threading.Lock()
         self._demucs_lock = threading.Lock()
         self._nllb_lock = threading.Lock()
+        self._mbart_lock = threading.Lock()
 
-    def get_whisper(self):
-        """Load Whisper on first use and cache it."""
-        if self._whisper_model is None:
-            with self._whisper_lock:
-                if self._whisper_model is None:
-                    import whisper
-                    print(f"Loading Whisper model: {settings.whisper_model_size}...")
-                    self._whisper_model = whisper.load_model(
-                        settings.whisper_model_size
-                    )
-                    print("Whisper model loaded.")
-        return self._whisper_model
+    def whisper_replica(self):
+        """
+        Check out a Whisper replica for one transcription:
+        `with model_manager.whisper_replica() as model: ...`
+        Replicas are loaded on first use; see WhisperPool for sizing.
+        """
+        return self._whisper_pool.checkout()
+
+    def whisper_pool_stats(self) -> dict:
+        return self._whisper_pool.stats()
+
+    def get_whisper_batcher(self, factory):
+        """
+        Return the cross-job Whisper batcher, creating it with `factory()`
+        on first use. Its threads check replicas out of the pool per batch.
+        """
+        batcher = self._whisper_batcher
+        if batcher is None:
+            with self._batcher_lock:
+                batcher = self._whisper_batcher
+                if batcher is None:
+                    batcher = factory()
+                    self._whisper_batcher = batcher
+        return batcher
+
+    def whisper_batcher_stats(self) -> dict | None:
+        batcher = self._whisper_batcher
+        return batcher.stats() if batcher is not None else None
+
+    def _load_whisper(self):
+        backend = settings.transcription_backend
+        if backend == "faster-whisper":
+            return self._load_faster_whisper()
+        if backend != "openai":
+            raise ValueError(f"Unknown transcription backend: {backend}")
+        import whisper
+        print(f"Loading Whisper model: {settings.whisper_model_size}...")
+        download_root = (
+            str(model_store.whisper_dir()) if settings.use_model_store else None
+        )
+        return whisper.load_model(settings.whisper_model_size, download_root=download_root)
+
+    def _load_faster_whisper(self):
+        """
+        CTranslate2 Whisper with `faster_whisper_compute_type` weights (int8
+        by default). Its intra-op threads are fixed at load time, so the
+        whisper thread budget is applied here rather than per call.
+        """
+        from faster_whisper import WhisperModel
+        from faster_whisper.utils import download_model
+        from app.utils.thread_budget import threads_for
+
+        compute_type = settings.faster_whisper_compute_type
+        print(f"Loading faster-whisper model: {settings.whisper_model_size} ({compute_type})...")
+        cache_dir = (
+            str(model_store.faster_whisper_dir()) if settings.use_model_store else None
+        )
+        path = download_model(settings.whisper_model_size, cache_dir=cache_dir)
+        model = WhisperModel(
+            path, device="auto", compute_type=compute_type,
+            cpu_threads=threads_for("whisper"),
+        )
+        # No state dict to measure: size the pool from the converted weights
+        # file, which is float16, so int8 holds about half of it in memory.
+        nbytes = (Path(path) / "model.bin").stat().st_size
+        if compute_type.startswith("int8"):
+            nbytes //= 2
+        model.resident_bytes = nbytes
+        return model
 
     def get_demucs(self):
         """Load Demucs htdemucs model on first use and cache it."""
-        if self._demucs_model is None:
+        model = self._demucs_model
+        usage = self._demucs_usage
+        if model is not None and usage is not None:
+            usage["hits"] += 1
+            usage["last_used"] = time.monotonic()
+            return model
+        with self._demucs_lock:
+            if self._demucs_model is None:
+                from demucs.pretrained import get_model
+                import torch
+                if settings.use_model_store:
+                    torch.hub.set_dir(str(model_store.torch_hub_dir()))
+                print(f"Loading Demucs model: {model_store.DEMUCS_MODEL}...")
+                model = get_model(model_store.DEMUCS_MODEL)
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+                model.to(device)
+                self._demucs_usage = {
+                    "size": _model_nbytes(model),
+                    "refs": 0,
+                    "loaded_at": time.time(),
+                    "hits": 0,
+                    "last_used": time.monotonic(),
+                }
+                self._demucs_model = model
+                print(f"Demucs model loaded on {device}.")
+            return self._demucs_model
+
+    @contextmanager
+    def use_demucs(self):
+        """
+        Like get_demucs, but pins the model for the duration of the block so
+        neither the admin API nor the idle reaper unloads it mid-separation.
+        """
+        while True:
+            model = self.get_demucs()
             with self._demucs_lock:
-                if self._demucs_model is None:
-                    from demucs.pretrained import get_model
-                    import torch
-                    print("Loading Demucs model: htdemucs...")
-                    model = get_model("htdemucs")
-                    device = "cuda" if torch.cuda.is_available() else "cpu"
-                    model.to(device)
-                    self._demucs_model = model
-                    print(f"Demucs model loaded on {device}.")
-        return self._demucs_model
+                # It may have been unloaded between lookup and pin
+                if self._demucs_model is model:
+                    usage = self._demucs_usage
+                    usage["refs"] += 1
+                    break
+        try:
+            yield model
+        finally:
+            with self._demucs_lock:
+                usage["refs"] -= 1
 
     def get_nllb(self):
         """Load NLLB-200-distilled-600M on first use and cache it."""
-        if self._nllb_model is None:
-            with self._nllb_lock:
-                if self._nllb_model is None:
-                    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
-                    model_name = "facebook/nllb-200-distilled-600M"
-                    print(f"Loading NLLB model: {model_name}...")
-                    self._nllb_tokenizer = AutoTokenizer.from_pretrained(model_name)
-                    self._nllb_model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
-                    print("NLLB model loaded.")
-        return self._nllb_model, self._nllb_tokenizer
+        model, tokenizer = self._nllb_model, self._nllb_tokenizer
+        if model is not None:
+            return model, tokenizer
+        with self._nllb_lock:
+            if self._nllb_model is None:
+                from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+                model_name = model_store.NLLB_MODEL
+                print(f"Loading NLLB model: {model_name}...")
+                model, tokenizer = self._load_pretrained(
+                    model_name, AutoModelForSeq2SeqLM, AutoTokenizer
+                )
+                self._nllb_tokenizer = tokenizer
+                self._nllb_model = model
+                # Register now so a preloaded NLLB counts against the budget
+                with self._lock:
+                    self._register_translation_model(model)
+                print("NLLB model loaded.")
+            return self._nllb_model, self._nllb_tokenizer
+
+    def get_mbart(self):
+        """
+        Load mBART-50 on first use and cache it. One copy serves every pair,
+        so concurrent first loads of different pairs wait for the same one.
+        """
+        model, tokenizer = self._mbart_model, self._mbart_tokenizer
+        if model is not None:
+            return model, tokenizer
+        with self._mbart_lock:
+            if self._mbart_model is None:
+                from transformers import (
+                    MBartForConditionalGeneration,
+                    MBart50TokenizerFast,
+                )
+                print("Loading mBART-50...")
+                model, tokenizer = self._load_pretrained(
+                    model_store.MBART_MODEL, MBartForConditionalGeneration,
+                    MBart50TokenizerFast,
+                )
+                self._mbart_tokenizer = tokenizer
+                self._mbart_model = model
+                with self._lock:
+                    self._register_translation_model(model)
+                print("mBART-50 loaded.")
+            return self._mbart_model, self._mbart_tokenizer
 
     def get_translation_model(self, src_lang: str, tgt_lang: str):
         """
-        Load and cache a translation model for the given pair.
-        Priority: Opus-MT (direct pair) -> NLLB-200 -> mBART-50 (last resort)
+        Load and cache a translation model for the given pair, on the engine
+        chosen by the routing planner (see translation_route()).
         Returns: (model, tokenizer, engine: str) where engine is "opus", "nllb", or "mbart"
         """
-        src_opus, tgt_opus = get_opus_codes(src_lang, tgt_lang)
-        pair_key = f"{src_opus}-{tgt_opus}"
+        return self._translation_entry(src_lang, tgt_lang)
 
+    @contextmanager
+    def use_translation_model(self, src_lang: str, tgt_lang: str):
+        """
+        Like get_translation_model, but pins the model for the duration of
+        the block so the memory budget cannot evict it mid-generate.
+        """
+        pair_key = _pair_key(src_lang, tgt_lang)
+        while True:
+            entry = self._translation_entry(src_lang, tgt_lang)
+            with self._lock:
+                # The model may have been evicted between lookup and pin
+                if self._translation_models.get(pair_key) is entry:
+                    self._resident[id(entry[0])]["refs"] += 1
+                    break
+        try:
+            yield entry
+        finally:
+            with self._lock:
+                record = self._resident.get(id(entry[0]))
+                if record is not None:
+                    record["refs"] -= 1
+                self._evict_translation_models()
+
+    def translation_model_stats(self) -> dict:
         with self._lock:
-            if pair_key not in self._translation_models:
-                model, tokenizer, engine = self._load_translation_pair(
-                    src_lang, tgt_lang
-                )
-                self._translation_models[pair_key] = (model, tokenizer, engine)
+            return {
+                "budget_mb": settings.translation_memory_budget_mb,
+                "resident_mb": round(
+                    sum(r["size"] for r in self._resident.values()) / 2**20, 1
+                ),
+                "loads": self.translation_loads,
+                "evictions": self.translation_evictions,
+                "reloads": self.translation_reloads,
+                "idle_unloads": self.idle_unloads,
+                "models": [
+                    {
+                        "name": r["name"],
+                        "size_mb": round(r["size"] / 2**20, 1),
+                        "refs": r["refs"],
+                        "hits": r["hits"],
+                    }
+                    for r in self._resident.values()
+                ],
+            }
 
-        return self._translation_models[pair_key]
+    def _translation_entry(self, src_lang: str, tgt_lang: str):
+        """Look up a pair (no lock on a hit) and mark its model recently used."""
+        pair_key = _pair_key(src_lang, tgt_lang)
+        entry = self._translation_models.get(pair_key)
+        hit = entry is not None
+        if not hit:
+            entry = self._load_translation_shared(pair_key, src_lang, tgt_lang)
+        record = self._resident.get(id(entry[0]))
+        if record is not None:
+            record["last_used"] = time.monotonic()
+            if hit:
+                record["hits"] += 1
+        return entry
 
-    def _load_translation_pair(self, src: str, tgt: str):
-        src_opus, tgt_opus = get_opus_codes(src, tgt)
+    def _load_translation_shared(self, pair_key: str, src_lang: str, tgt_lang: str):
+        """Load a pair once; concurrent callers for the same pair wait on one future."""
+        with self._lock:
+            entry = self._translation_models.get(pair_key)
+            if entry is not None:
+                return entry
+            future = self._translation_loading.get(pair_key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._translation_loading[pair_key] = future
+        if not owner:
+            return future.result()
+
+        try:
+            entry = self._load_translation_pair(src_lang, tgt_lang)
+            with self._lock:
+                self._register_translation_model(entry[0])
+                self._translation_models[pair_key] = entry
+                del self._translation_loading[pair_key]
+        except BaseException as e:
+            with self._lock:
+                self._translation_loading.pop(pair_key, None)
+            future.set_exception(e)
+            raise
+        future.set_result(entry)
+        return entry
+
+    def _register_translation_model(self, model):
+        key = id(model)
+        if key in self._resident:
+            return  # NLLB serves many pairs with one model
+        name = getattr(model, "name_or_path", type(model).__name__)
+        self.translation_loads += 1
+        if name in self._evicted_names:
+            self.translation_reloads += 1
+            self._evicted_names.discard(name)
+        self._resident[key] = {
+            "name": name,
+            "size": _model_nbytes(model),
+            "refs": 0,
+            "loaded_at": time.time(),
+            "hits": 0,
+            "last_used": time.monotonic(),
+        }
+        self._evict_translation_models(keep=key)
+
+    def _evict_translation_models(self, keep: int | None = None):
+        """Evict unpinned models, least recently used first, until under budget."""
+        budget = settings.translation_memory_budget_mb * 2**20
+        if budget <= 0:
+            return
+        total = sum(r["size"] for r in self._resident.values())
+        by_age = sorted(self._resident.items(), key=lambda item: item[1]["last_used"])
+        for key, record in by_age:
+            if total <= budget:
+                return
+            if key == keep or record["refs"] > 0:
+                continue
+            self._drop_translation_model(key)
+            total -= record["size"]
+        if total > budget:
+            print(
+                f"Translation models use {total / 2**20:.0f} MB, over the "
+                f"{settings.translation_memory_budget_mb} MB budget (all pinned)"
+            )
+
+    def _drop_translation_model(self, key: int, reason: str = "budget"):
+        record = self._resident.pop(key)
+        for pair_key, entry in list(self._translation_models.items()):
+            if id(entry[0]) == key:
+                del self._translation_models[pair_key]
+        if self._nllb_model is not None and id(self._nllb_model) == key:
+            self._nllb_model = None
+            self._nllb_tokenizer = None
+        if self._mbart_model is not None and id(self._mbart_model) == key:
+            self._mbart_model = None
+            self._mbart_tokenizer = None
+        batcher = self._translation_batchers.pop(key, None)
+        if batcher is not None:
+            batcher.stop()
+        size_mb = record["size"] / 2**20
+        if reason == "budget":
+            self._evicted_names.add(record["name"])
+            self.translation_evictions += 1
+            print(f"Evicted translation model {record['name']} ({size_mb:.0f} MB)")
+        else:
+            print(f"Unloaded translation model {record['name']} ({size_mb:.0f} MB, {reason})")
+
+    def get_translation_batcher(self, model, factory):
+        """
+        Return the background batcher for a loaded translation model,
+        creating it with `factory()` on first use. One batcher per model,
+        so NLLB shares a single batcher across all of its language pairs.
+        """
+        key = id(model)
+        batcher = self._translation_batchers.get(key)
+        if batcher is None:
+            with self._batcher_lock:
+                batcher = self._translation_batchers.get(key)
+                if batcher is None:
+                    batcher = factory()
+                    self._translation_batchers[key] = batcher
+        return batcher
 
-        # 1. Try Opus-MT first (best quality for known direct pairs)
-        if (src_opus, tgt_opus) in OPUS_DIRECT_PAIRS:
+    def translation_batcher_stats(self) -> list[dict]:
+        return [b.stats() for b in list(self._translation_batchers.values())]
+
+    def translation_route(self, src_lang: str, tgt_lang: str) -> dict | None:
+        """The routing decision that picked the engine for a pair, if routed."""
+        decision = self._route_decisions.get(_pair_key(src_lang, tgt_lang))
+        return dict(decision) if decision is not None else None
+
+    def translation_route_stats(self) -> list[dict]:
+        return [dict(decision) for decision in list(self._route_decisions.values())]
+
+    def _load_translation_pair(self, src: str, tgt: str):
+        """
+        Route a pair to an engine (see translation_router.plan_route) and
+        load it. If the chosen engine fails to load, the remaining candidates
+        are tried in quality order; mBART-50 is the last resort.
+        """
+        decision = plan_route(src, tgt, self._resident_engines())
+        order = [decision["engine"]] + [
+            e for e in decision["candidates"] if e != decision["engine"]
+        ]
+        for engine in order:
             try:
-                from transformers import MarianMTModel, MarianTokenizer
-
-                model_name = f"Helsinki-NLP/opus-mt-{src_opus}-{tgt_opus}"
-                print(f"Loading translation model: {model_name}...")
-                tokenizer = MarianTokenizer.from_pretrained(model_name)
-                model = MarianMTModel.from_pretrained(model_name)
-                print(f"Translation model loaded: {model_name}")
-                return model, tokenizer, "opus"
+                model, tokenizer = self._load_engine(engine, src, tgt)
             except Exception as e:
-                print(f"Failed to load Opus-MT {src_opus}-{tgt_opus}: {e}")
+                if engine == order[-1]:
+                    raise
+                print(f"Failed to load {engine} for {src}->{tgt}: {e}")
+                continue
+            if engine != decision["engine"]:
+                decision["reason"] = f"{decision['engine']} failed to load, fell back"
+                decision["engine"] = engine
+            decision["model"] = getattr(model, "name_or_path", engine)
+            self._route_decisions[_pair_key(src, tgt)] = decision
+            print(f"Routed {src}->{tgt} to {engine} ({decision['reason']})")
+            return model, tokenizer, engine
+
+    def _resident_engines(self) -> set[str]:
+        """Engines that can serve any supported pair without a new load."""
+        engines = set()
+        if self._nllb_model is not None:
+            engines.add("nllb")
+        if self._mbart_model is not None:
+            engines.add("mbart")
+        return engines
+
+    def _load_engine(self, engine: str, src: str, tgt: str):
+        if engine == "opus":
+            from transformers import MarianMTModel, MarianTokenizer
+
+            model_name = model_store.opus_model_name(*get_opus_codes(src, tgt))
+            print(f"Loading translation model: {model_name}...")
+            model, tokenizer = self._load_pretrained(
+                model_name, MarianMTModel, MarianTokenizer
+            )
+            print(f"Translation model loaded: {model_name}")
+            return model, tokenizer
+        if engine == "nllb":
+            return self.get_nllb()
+        if engine == "mbart":
+            return self.get_mbart()
+        raise ValueError(f"Unknown translation engine: {engine}")
+
+    def _load_pretrained(self, model_name: str, model_cls, tokenizer_cls):
+        """
+        Load tokenizer and model from the local safetensors store (or the hub
+        when `use_model_store` is off) with the configured backend.
+        """
+        source = model_store.pretrained_source(model_name, model_cls, tokenizer_cls)
+        tokenizer = tokenizer_cls.from_pretrained(source)
+        model = self._load_seq2seq(model_name, model_cls, source)
+        # Cache keys and metrics use the hub name, not the local path
+        model.name_or_path = model_name
+        return model, tokenizer
+
+    def _load_seq2seq(self, model_name: str, model_cls, source: str):
+        """Load a translation model with the configured inference backend."""
+        backend = settings.translation_backend
+        if backend == "fp32":
+            return model_cls.from_pretrained(source)
+        if backend == "int8":
+            return self._load_int8(model_name, model_cls, source)
+        raise ValueError(f"Unknown translation backend: {backend}")
 
-        # 2. Try NLLB-200 (supports 200+ languages directly)
-        src_info = LANGUAGES.get(src, {})
-        tgt_info = LANGUAGES.get(tgt, {})
-        if "nllb_code" in src_info and "nllb_code" in tgt_info:
+    def _load_int8(self, model_name: str, model_cls, source: str):
+        """
+        Dynamic int8 quantization of every nn.Linear (weights int8, activations
+        quantized on the fly). The quantized state dict is saved under
+        models_cache_dir so later loads skip the fp32 checkpoint: the module
+        is rebuilt from its config, quantized empty and then filled in. The
+        file name carries the torch and transformers versions, since both
+        shape the module the state dict has to match.
+        """
+        import torch
+        import transformers
+        from transformers.modeling_utils import no_init_weights
+
+        versions = f"torch{torch.__version__}-transformers{transformers.__version__}"
+        cache_path = (
+            settings.models_cache_dir / "int8"
+            / f"{model_name.replace('/', '--')}-{versions}.pt"
+        )
+        if cache_path.exists():
+            print(f"Loading int8 model from cache: {cache_path}")
+            config = model_cls.config_class.from_pretrained(source)
+            with no_init_weights():
+                model = model_cls(config)
+            model = torch.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            model.load_state_dict(torch.load(cache_path, weights_only=True))
+        else:
+            print(f"Quantizing {model_name} to int8...")
+            model = model_cls.from_pretrained(source)
+            model = torch.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Written under a temporary name so other workers never read half a file
+            staging = cache_path.with_name(f"{cache_path.name}.tmp-{os.getpid()}")
+            torch.save(model.state_dict(), staging)
+            staging.replace(cache_path)
+        model.eval()
+        return model
+
+    def start_preload(self, names: list[str]) -> threading.Thread | None:
+        """
+        Load and warm the named models on a background thread. Names are
+        "whisper", "demucs", "nllb" or a language pair such as "en-es".
+        Every name is marked pending immediately so /api/ready reports
+        not-ready until the thread has warmed it.
+        """
+        if not names:
+            return None
+        for name in names:
+            self._preload_status[name] = {"status": "pending"}
+        thread = threading.Thread(
+            target=self._preload, args=(names,), name="model-preload", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def readiness(self) -> dict:
+        """Preload progress plus which models are currently resident."""
+        preload = {name: dict(record) for name, record in self._preload_status.items()}
+        with self._lock:
+            translation = [r["name"] for r in self._resident.values()]
+        return {
+            "ready": all(r["status"] == "ready" for r in preload.values()),
+            "preload": preload,
+            "resident": {
+                "whisper": self._whisper_pool.size > 0,
+                "whisper_replicas": self._whisper_pool.size,
+                "demucs": self._demucs_model is not None,
+                "nllb": self._nllb_model is not None,
+                "translation_models": translation,
+            },
+        }
+
+    def _preload(self, names: list[str]):
+        for name in names:
+            record = self._preload_status[name]
             try:
-                model, tokenizer = self.get_nllb()
-                print(f"Using NLLB-200 for {src}->{tgt}")
-                return model, tokenizer, "nllb"
+                record["status"] = "loading"
+                started = time.perf_counter()
+                warm = self._load_for_preload(name)
+                record["load_s"] = round(time.perf_counter() - started, 2)
+
+                record["status"] = "warming"
+                started = time.perf_counter()
+                warm()
+                record["warmup_s"] = round(time.perf_counter() - started, 2)
+                record["status"] = "ready"
+                print(f"Preloaded {name} (load {record['load_s']}s, warm-up {record['warmup_s']}s)")
             except Exception as e:
-                print(f"Failed to load NLLB: {e}")
+                record["status"] = "failed"
+                record["error"] = str(e)
+                print(f"Preload of {name} failed: {e}")
 
-        # 3. Fallback: mBART-50
-        print(f"Loading mBART-50 fallback for {src}-{tgt}...")
-        from transformers import (
-            MBartForConditionalGeneration,
-            MBart50TokenizerFast,
-        )
+    def _load_for_preload(self, name: str):
+        """Load one model and return a callable that runs a dummy inference."""
+        if name == "whisper":
+            replicas = self._whisper_pool.fill()
+            return lambda: self._warm_whisper(replicas)
+        if name == "demucs":
+            model = self.get_demucs()
+            return lambda: self._warm_demucs(model)
+        if name == "nllb":
+            model, tokenizer = self.get_nllb()
+            return lambda: self._warm_seq2seq(model, tokenizer)
+        src, sep, tgt = name.partition("-")
+        if sep and src in LANGUAGES and tgt in LANGUAGES:
+            self.get_translation_model(src, tgt)
 
-        model_name = "facebook/mbart-large-50-many-to-many-mmt"
-        tokenizer = MBart50TokenizerFast.from_pretrained(model_name)
-        model = MBartForConditionalGeneration.from_pretrained(model_name)
-        print("mBART-50 loaded.")
-        return model, tokenizer, "mbart"
+            def warm():
+                from app.services.translation import translate_text
+                translate_text("Hello, world.", src, tgt, self, use_cache=False)
+            return warm
+        raise ValueError(f"Unknown preload model: {name}")
+
+    def _warm_whisper(self, replicas: int):
+        import numpy as np
+        from app.services.transcription import run_whisper
+        from app.utils.thread_budget import thread_budget
+        silence = np.zeros(16000, dtype=np.float32)
+        # The pool hands replicas out FIFO, so each one is warmed once
+        for _ in range(replicas):
+            with self.whisper_replica() as model, thread_budget("whisper"):
+                run_whisper(model, silence)
+
+    def _warm_demucs(self, model):
+        import torch
+        from demucs.apply import apply_model
+        from app.utils.thread_budget import thread_budget
+        device = next(model.parameters()).device
+        silence = torch.zeros(1, 2, model.samplerate, device=device)
+        with torch.no_grad(), thread_budget("demucs"):
+            apply_model(model, silence, device=device, progress=False)
+
+    def _warm_seq2seq(self, model, tokenizer):
+        import torch
+        from app.utils.thread_budget import thread_budget
+        inputs = tokenizer(["Hello, world."], return_tensors="pt")
+        with torch.no_grad(), thread_budget("mt"):
+            model.generate(**inputs, max_new_tokens=8)
+
+    def model_residency(self) -> list[dict]:
+        """Every loaded model with its size, load time, hits and last use."""
+        now = time.monotonic()
+        models = []
+        whisper = self._whisper_pool.usage()
+        if whisper is not None:
+            record = _usage_record(f"whisper-{settings.whisper_model_size}", "whisper", whisper, now)
+            record.update(replicas=whisper["replicas"], in_use=whisper["in_use"])
+            models.append(record)
+        demucs = self._demucs_usage
+        if self._demucs_model is not None and demucs is not None:
+            record = _usage_record(model_store.DEMUCS_MODEL, "demucs", demucs, now)
+            record["refs"] = demucs["refs"]
+            models.append(record)
+        with self._lock:
+            for key, resident in self._resident.items():
+                record = _usage_record(resident["name"], "translation", resident, now)
+                record["refs"] = resident["refs"]
+                record["pairs"] = sorted(
+                    pair for pair, entry in self._translation_models.items()
+                    if id(entry[0]) == key
+                )
+                models.append(record)
+        return models
+
+    def load_model(self, name: str):
+        """
+        Load and warm one model now. Takes the same names as
+        `preload_models`; blocks until the model is warm.
+        """
+        self._load_for_preload(name)()
+
+    def unload_model(self, name: str):
+        """
+        Unload one model: "whisper" (its idle replicas), "demucs", "nllb", a
+        language pair such as "en-es", or a name from model_residency().
+        Raises ValueError if it is not loaded, RuntimeError if it is in use.
+        """
+        if name in ("whisper", f"whisper-{settings.whisper_model_size}"):
+            if self._whisper_pool.size == 0:
+                raise ValueError("Whisper is not loaded")
+            in_use = self._whisper_pool.in_use
+            if in_use:
+                raise RuntimeError(f"Whisper is in use ({in_use} replicas checked out)")
+            if not self._whisper_pool.release_idle():
+                raise RuntimeError("Whisper is in use")
+            print("Unloaded Whisper replicas (admin)")
+            return
+        if name in ("demucs", model_store.DEMUCS_MODEL):
+            with self._demucs_lock:
+                if self._demucs_model is None:
+                    raise ValueError("Demucs is not loaded")
+                if self._demucs_usage["refs"] > 0:
+                    raise RuntimeError("Demucs is in use")
+                self._demucs_model = None
+                self._demucs_usage = None
+            print("Unloaded Demucs (admin)")
+            return
+        with self._lock:
+            key = self._translation_key(name)
+            if key is None:
+                raise ValueError(f"{name} is not loaded")
+            if self._resident[key]["refs"] > 0:
+                raise RuntimeError(f"{name} is in use")
+            self._drop_translation_model(key, reason="admin")
+
+    def unload_idle(self, idle_s: float) -> list[str]:
+        """
+        Unload every model unused for `idle_s` seconds. Models listed in
+        `preload_models` and models pinned by a running job are kept.
+        Returns the names of the models unloaded.
+        """
+        now = time.monotonic()
+        keep = set(self._preload_status)
+        unloaded = []
+        if "whisper" not in keep and self._whisper_pool.release_idle(idle_s):
+            unloaded.append(f"whisper-{settings.whisper_model_size}")
+        if "demucs" not in keep:
+            with self._demucs_lock:
+                usage = self._demucs_usage
+                if (
+                    usage is not None and usage["refs"] == 0
+                    and now - usage["last_used"] >= idle_s
+                ):
+                    self._demucs_model = None
+                    self._demucs_usage = None
+                    unloaded.append(model_store.DEMUCS_MODEL)
+        with self._lock:
+            pinned = {self._translation_key(name) for name in keep}
+            for key, record in list(self._resident.items()):
+                if key in pinned or record["refs"] > 0:
+                    continue
+                if now - record["last_used"] < idle_s:
+                    continue
+                self._drop_translation_model(key, reason="idle")
+                unloaded.append(record["name"])
+            self.idle_unloads += len(unloaded)
+        return unloaded
+
+    def start_idle_reaper(self) -> threading.Thread | None:
+        """
+        Unload models idle for `model_idle_timeout_s` on a daemon thread,
+        checking every `model_idle_check_s`. No-op when the timeout is 0.
+        """
+        if settings.model_idle_timeout_s <= 0:
+            return None
+
+        def reap():
+            import gc
+            while not self._reaper_stop.wait(settings.model_idle_check_s):
+                try:
+                    unloaded = self.unload_idle(settings.model_idle_timeout_s)
+                except Exception as e:
+                    print(f"Idle model check failed: {e}")
+                    continue
+                if unloaded:
+                    gc.collect()
+                    print(f"Unloaded idle models: {', '.join(unloaded)}")
+
+        thread = threading.Thread(target=reap, name="model-idle-reaper", daemon=True)
+        thread.start()
+        return thread
+
+    def _translation_key(self, name: str) -> int | None:
+        """Resident key for "nllb", a pair like "en-es" or a model name. Caller holds _lock."""
+        if name == "nllb":
+            name = model_store.NLLB_MODEL
+        src, sep, tgt = name.partition("-")
+        if sep and src in LANGUAGES and tgt in LANGUAGES:
+            entry = self._translation_models.get(_pair_key(src, tgt))
+            return id(entry[0]) if entry is not None else None
+        for key, record in self._resident.items():
+            if record["name"] == name:
+                return key
+        return None
 
     def unload_all(self):
         """Free all loaded models."""
-        self._whisper_model = None
+        self._reaper_stop.set()
+        for batcher in self._translation_batchers.values():
+            batcher.stop()
+        self._translation_batchers.clear()
+        if self._whisper_batcher is not None:
+            self._whisper_batcher.stop()
+            self._whisper_batcher = None
+        self._whisper_pool.clear()
         self._demucs_model = None
+        self._demucs_usage = None
         self._nllb_model = None
         self._nllb_tokenizer = None
+        self._mbart_model = None
+        self._mbart_tokenizer = None
         self._translation_models.clear()
+        self._resident.clear()
+
+
+def _pair_key(src_lang: str, tgt_lang: str) -> str:
+    src_opus, tgt_opus = get_opus_codes(src_lang, tgt_lang)
+    return f"{src_opus}-{tgt_opus}"
+
+
+def _usage_record(name: str, kind: str, usage: dict, now: float) -> dict:
+    """Admin API view of a usage dict; monotonic last_used becomes wall-clock."""
+    idle_s = now - usage["last_used"]
+    return {
+        "name": name,
+        "kind": kind,
+        "size_mb": round(usage["size"] / 2**20, 1),
+        "loaded_at": _isoformat(usage["loaded_at"]),
+        "hits": usage["hits"],
+        "last_used": _isoformat(time.time() - idle_s),
+        "idle_s": round(idle_s, 1),
+    }
+
+
+def _isoformat(timestamp: float | None) -> str | None:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def _model_nbytes(model) -> int:
+    """
+    Bytes held by a model's weights and buffers. Walks the state dict so
+    dynamically quantized Linear layers (packed params) are counted too;
+    tied tensors are counted once.
+    """
+    if not hasattr(model, "state_dict"):
+        return getattr(model, "resident_bytes", 0)  # faster-whisper
+    seen = set()
+    total = 0
+
+    def add(value):
+        nonlocal total
+        if isinstance(value, (tuple, list)):
+            for item in value:
+                add(item)
+            return
+        if not hasattr(value, "element_size"):
+            return
+        try:
+            ptr = value.data_ptr()
+        except Exception:
+            ptr = id(value)
+        if ptr in seen:
+            return
+        seen.add(ptr)
+        total += value.numel() * value.element_size()
+
+    for value in model.state_dict().values():
+        add(value)
+    return total
@@ -0,0 +1,117 @@
+"""
+Local model store rooted at `settings.models_cache_dir`.
+
+Layout:
+    hub/                       Hugging Face download cache
+    transformers/<org>--<name>/ config, tokenizer and *.safetensors weights
+    whisper/                   Whisper checkpoints (download_root)
+    whisper/ctranslate2/       faster-whisper models
+    torch/                     torch.hub dir used by Demucs
+    int8/                      quantized translation modules
+
+Translation models are converted to safetensors once, so every later load
+(in any worker process) reads plain tensors from local disk instead of
+unpickling a hub checkpoint. from_pretrained still copies the weights into
+each process, so every worker holds its own copy of a loaded model.
+"""
+import os
+import shutil
+from pathlib import Path
+
+from app.config import settings
+
+NLLB_MODEL = "facebook/nllb-200-distilled-600M"
+MBART_MODEL = "facebook/mbart-large-50-many-to-many-mmt"
+DEMUCS_MODEL = "htdemucs"
+
+
+def opus_model_name(src_opus: str, tgt_opus: str) -> str:
+    return f"Helsinki-NLP/opus-mt-{src_opus}-{tgt_opus}"
+
+
+def hub_dir() -> Path:
+    return settings.models_cache_dir / "hub"
+
+
+def whisper_dir() -> Path:
+    return settings.models_cache_dir / "whisper"
+
+
+def faster_whisper_dir() -> Path:
+    return whisper_dir() / "ctranslate2"
+
+
+def torch_hub_dir() -> Path:
+    return settings.models_cache_dir / "torch"
+
+
+def translation_model_dir(model_name: str) -> Path:
+    return settings.models_cache_dir / "transformers" / model_name.replace("/", "--")
+
+
+def is_stored(model_name: str) -> bool:
+    path = translation_model_dir(model_name)
+    return path.is_dir() and any(path.glob("*.safetensors"))
+
+
+def is_whisper_stored(size: str, backend: str) -> bool:
+    """Whether the checkpoint `backend` would load for `size` is in the store."""
+    if backend == "faster-whisper":
+        # huggingface_hub cache layout: models--<org>--<name>/snapshots/<rev>/
+        repo_id = size if "/" in size else f"Systran/faster-whisper-{size}"
+        try:
+            from faster_whisper.utils import _MODELS
+            repo_id = _MODELS.get(size, repo_id)
+        except ImportError:
+            pass
+        repo_dir = faster_whisper_dir() / f"models--{repo_id.replace('/', '--')}"
+        return any(repo_dir.glob("snapshots/*/model.bin"))
+    # openai-whisper saves the checkpoint under its URL's file name
+    filename = f"{size}.pt"
+    try:
+        import whisper
+        if size in whisper._MODELS:
+            filename = os.path.basename(whisper._MODELS[size])
+    except ImportError:
+        pass
+    return (whisper_dir() / filename).is_file()
+
+
+def is_demucs_stored() -> bool:
+    """Whether torch.hub has downloaded a Demucs checkpoint into the store."""
+    return any((torch_hub_dir() / "checkpoints").glob("*.th"))
+
+
+def ensure_translation_model(model_name: str, model_cls, tokenizer_cls) -> Path:
+    """
+    Return the local safetensors directory for a translation model,
+    downloading and converting it first if needed. The directory is written
+    under a temporary name and renamed into place, so concurrent processes
+    never load a half-written copy.
+    """
+    target = translation_model_dir(model_name)
+    if is_stored(model_name):
+        return target
+
+    print(f"Storing {model_name} as safetensors in {target}...")
+    staging = target.with_name(f"{target.name}.tmp-{os.getpid()}")
+    tokenizer = tokenizer_cls.from_pretrained(model_name, cache_dir=hub_dir())
+    model = model_cls.from_pretrained(model_name, cache_dir=hub_dir())
+    model.save_pretrained(staging, safe_serialization=True)
+    tokenizer.save_pretrained(staging)
+    del model
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        staging.rename(target)
+    except OSError:
+        # Another process published it first
+        shutil.rmtree(staging, ignore_errors=True)
+    return target
+
+
+def pretrained_source(model_name: str, model_cls, tokenizer_cls) -> str:
+    """What to pass to from_pretrained: the store path, or the hub name."""
+    if not settings.use_model_store:
+        return model_name
+    return str(ensure_translation_model(model_name, model_cls, tokenizer_cls))
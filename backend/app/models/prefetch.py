@@ -0,0 +1,137 @@
+"""
+Download and convert every model the app can use into the local model store,
+so a fresh node never downloads at request time. Run from the backend dir:
+
+    python -m app.models.prefetch
+    python -m app.models.prefetch --only opus,nllb --pairs en-es,es-en
+    python -m app.models.prefetch --int8 --dry-run
+"""
+import argparse
+import sys
+import time
+
+from app.config import settings
+from app.models import model_store
+from app.utils.language_map import LANGUAGES, OPUS_DIRECT_PAIRS
+
+KINDS = ("opus", "nllb", "mbart", "whisper", "demucs")
+
+
+def _translation_jobs(kinds: set[str], pairs: set[str] | None) -> list[tuple]:
+    """(model_name, transformers model class, tokenizer class) names per model."""
+    jobs = []
+    if "opus" in kinds:
+        for src, tgt in sorted(OPUS_DIRECT_PAIRS):
+            if pairs is None or f"{src}-{tgt}" in pairs:
+                jobs.append((
+                    model_store.opus_model_name(src, tgt),
+                    "MarianMTModel", "MarianTokenizer",
+                ))
+    if "nllb" in kinds and any("nllb_code" in info for info in LANGUAGES.values()):
+        jobs.append((model_store.NLLB_MODEL, "AutoModelForSeq2SeqLM", "AutoTokenizer"))
+    if "mbart" in kinds:
+        jobs.append((
+            model_store.MBART_MODEL,
+            "MBartForConditionalGeneration", "MBart50TokenizerFast",
+        ))
+    return jobs
+
+
+def _prefetch_translation(model_name: str, model_cls_name: str, tokenizer_cls_name: str, int8: bool):
+    import transformers
+    from app.models.model_manager import ModelManager
+
+    model_cls = getattr(transformers, model_cls_name)
+    tokenizer_cls = getattr(transformers, tokenizer_cls_name)
+    path = model_store.ensure_translation_model(model_name, model_cls, tokenizer_cls)
+    if int8:
+        ModelManager()._load_int8(model_name, model_cls, str(path))
+
+
+def _prefetch_whisper():
+    from app.models.model_manager import ModelManager
+    # Downloads for the configured transcription_backend
+    ModelManager()._load_whisper()
+
+
+def _prefetch_demucs():
+    import torch
+    from demucs.pretrained import get_model
+    torch.hub.set_dir(str(model_store.torch_hub_dir()))
+    get_model(model_store.DEMUCS_MODEL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--only", default=",".join(KINDS),
+        help=f"Comma list of model kinds ({', '.join(KINDS)})",
+    )
+    parser.add_argument(
+        "--pairs", help="Only these Opus-MT pairs, as opus codes (e.g. en-es,en-jap)",
+    )
+    parser.add_argument(
+        "--int8", action="store_true",
+        help="Also build the int8 quantized copy of each translation model",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="List models and exit")
+    args = parser.parse_args()
+
+    kinds = {k.strip() for k in args.only.split(",") if k.strip()}
+    unknown = kinds - set(KINDS)
+    if unknown:
+        parser.error(f"Unknown model kinds: {', '.join(sorted(unknown))}")
+    pairs = {p.strip() for p in args.pairs.split(",")} if args.pairs else None
+
+    # (name, fetch, stored) where stored() is None when the model is not
+    # downloaded into the store (Whisper and Demucs with use_model_store off)
+    jobs = []
+    for job in _translation_jobs(kinds, pairs):
+        jobs.append((
+            job[0],
+            lambda job=job: _prefetch_translation(*job, args.int8),
+            lambda name=job[0]: model_store.is_stored(name),
+        ))
+    if "whisper" in kinds:
+        jobs.append((
+            f"whisper-{settings.whisper_model_size}", _prefetch_whisper,
+            lambda: model_store.is_whisper_stored(
+                settings.whisper_model_size, settings.transcription_backend,
+            ) if settings.use_model_store else None,
+        ))
+    if "demucs" in kinds:
+        jobs.append((
+            model_store.DEMUCS_MODEL, _prefetch_demucs,
+            lambda: model_store.is_demucs_stored() if settings.use_model_store else None,
+        ))
+
+    print(f"Model store: {settings.models_cache_dir.resolve()}")
+    if args.dry_run:
+        for name, _, stored in jobs:
+            state = stored()
+            if state is None:
+                print(f"  {name} (not managed by the store)")
+            else:
+                print(f"  {name}{' (stored)' if state else ''}")
+        return
+
+    failed = []
+    for i, (name, fetch, _) in enumerate(jobs, 1):
+        started = time.perf_counter()
+        print(f"[{i}/{len(jobs)}] {name}...")
+        try:
+            fetch()
+        except Exception as e:
+            print(f"  failed: {e}")
+            failed.append(name)
+        else:
+            print(f"  done in {time.perf_counter() - started:.1f}s")
+
+    print(f"Prefetched {len(jobs) - len(failed)}/{len(jobs)} models.")
+    if failed:
+        print("Failed: " + ", ".join(failed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
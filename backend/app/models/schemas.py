@@ -26,6 +26,12 @@ class ToolType(str, Enum):
     AUDIO_SEPARATE = "audio_separate"
 
 
+class DecodingProfile(str, Enum):
+    FAST = "fast"          # greedy, for bulk subtitle jobs
+    BALANCED = "balanced"  # small beam
+    QUALITY = "quality"    # wide beam, for premium documents
+
+
 class JobStatus(str, Enum):
     QUEUED = "queued"
     PROCESSING = "processing"
@@ -0,0 +1,123 @@
+"""
+Translation engine routing.
+
+Instead of always trying Opus-MT -> NLLB-200 -> mBART-50 in that order, the
+ModelManager asks `plan_route()` which engine should serve a new pair. The
+planner looks at the engines that can translate the pair, drops those below
+the quality floor of `translation_routing`, and picks the cheapest of the
+rest: an engine that is already resident over one that needs a load, then
+the highest measured throughput, then the better quality.
+
+    quality   best-quality engine only (the old fixed order)
+    balanced  NLLB-200 may stand in for Opus-MT; mBART-50 only as last resort
+    fast      any engine that covers the pair
+"""
+import threading
+
+from app.config import settings
+from app.utils.language_map import LANGUAGES, OPUS_DIRECT_PAIRS, get_opus_codes
+
+# Lower is better
+ENGINE_QUALITY = {"opus": 0, "nllb": 1, "mbart": 2}
+
+# Weight of the newest sample in the throughput moving average
+_EWMA_ALPHA = 0.3
+
+
+def candidate_engines(src: str, tgt: str) -> list[str]:
+    """Engines that can translate src->tgt, best quality first."""
+    engines = []
+    if get_opus_codes(src, tgt) in OPUS_DIRECT_PAIRS:
+        engines.append("opus")
+    if "nllb_code" in LANGUAGES.get(src, {}) and "nllb_code" in LANGUAGES.get(tgt, {}):
+        engines.append("nllb")
+    engines.append("mbart")  # last resort, as before
+    return engines
+
+
+def plan_route(src: str, tgt: str, resident: set[str], preference: str | None = None) -> dict:
+    """
+    Choose the engine for a pair. `resident` holds the engines whose model
+    is loaded and could serve the pair without a new load. Returns the
+    decision record stored by the ModelManager and reported in job results.
+    """
+    preference = preference or settings.translation_routing
+    if preference == "quality":
+        floor = None
+    elif preference == "balanced":
+        floor = ENGINE_QUALITY["nllb"]
+    elif preference == "fast":
+        floor = max(ENGINE_QUALITY.values())
+    else:
+        raise ValueError(f"Unknown translation routing preference: {preference}")
+
+    candidates = candidate_engines(src, tgt)
+    best = ENGINE_QUALITY[candidates[0]]
+    limit = best if floor is None else max(best, floor)
+    acceptable = [e for e in candidates if ENGINE_QUALITY[e] <= limit]
+
+    loaded = [e for e in acceptable if e in resident]
+    pool = loaded or acceptable
+    tracker = get_throughput_tracker()
+    measured = {e: tracker.get(e, src, tgt) for e in pool}
+    if len(pool) > 1 and all(rate is not None for rate in measured.values()):
+        engine = max(pool, key=lambda e: measured[e])
+        why = f"fastest measured ({measured[engine]:.0f} chars/s)"
+    else:
+        engine = pool[0]
+        why = "highest quality" if engine == candidates[0] else "best acceptable quality"
+
+    return {
+        "leg": f"{src}->{tgt}",
+        "engine": engine,
+        "reason": f"{'resident' if loaded else 'loaded on demand'}, {why}",
+        "preference": preference,
+        "candidates": candidates,
+    }
+
+
+class ThroughputTracker:
+    """Moving average of translated characters per second, per engine and pair."""
+
+    def __init__(self):
+        self._pairs: dict[tuple[str, str], float] = {}
+        self._engines: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, engine: str, src: str, tgt: str, chars: int, seconds: float):
+        if chars <= 0 or seconds <= 0:
+            return
+        rate = chars / seconds
+        with self._lock:
+            for table, key in ((self._pairs, (engine, f"{src}-{tgt}")), (self._engines, engine)):
+                previous = table.get(key)
+                table[key] = rate if previous is None else (
+                    _EWMA_ALPHA * rate + (1 - _EWMA_ALPHA) * previous
+                )
+
+    def get(self, engine: str, src: str, tgt: str) -> float | None:
+        """Throughput for the pair, else the engine-wide average, else None."""
+        with self._lock:
+            rate = self._pairs.get((engine, f"{src}-{tgt}"))
+            return rate if rate is not None else self._engines.get(engine)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "engines": {e: round(r, 1) for e, r in self._engines.items()},
+                "pairs": {f"{e}:{p}": round(r, 1) for (e, p), r in self._pairs.items()},
+            }
+
+
+_tracker: ThroughputTracker | None = None
+_tracker_lock = threading.Lock()
+
+
+def get_throughput_tracker() -> ThroughputTracker:
+    """Process-wide throughput tracker."""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = ThroughputTracker()
+    return _tracker
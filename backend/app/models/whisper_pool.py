@@ -0,0 +1,175 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable
+
+from app.config import settings
+
+
+class WhisperPool:
+    """
+    A pool of independent Whisper replicas. A replica's decoder kv-cache is
+    not thread-safe, so each one serves a single transcription at a time;
+    jobs check one out, transcribe, and return it.
+
+    Replicas are loaded on demand when every existing one is busy, up to the
+    target count: `whisper_replicas` if set, otherwise as many as fit in
+    `whisper_memory_budget_mb` (measured from the first replica), never more
+    than `max_concurrent_jobs`.
+    """
+
+    def __init__(self, load_fn: Callable[[], object]):
+        self._load_fn = load_fn
+        self._idle: deque = deque()
+        self._replicas: list = []
+        self._replica_bytes = 0
+        self._creating = 0
+        self._cond = threading.Condition()
+        self._waiting = 0
+        self._checkouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._loaded_at: float | None = None
+        self._last_used = time.monotonic()
+
+    @contextmanager
+    def checkout(self):
+        """Borrow a replica for the duration of the block."""
+        started = time.monotonic()
+        model = self._acquire()
+        waited = time.monotonic() - started
+        with self._cond:
+            self._checkouts += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+            self._last_used = time.monotonic()
+        try:
+            yield model
+        finally:
+            self._release(model)
+
+    def fill(self) -> int:
+        """Load replicas up to the target count. Returns the pool size."""
+        while True:
+            with self._cond:
+                if len(self._replicas) + self._creating >= self.target():
+                    return len(self._replicas)
+                self._creating += 1
+            self._release(self._grow())
+
+    def target(self) -> int:
+        if settings.whisper_replicas > 0:
+            return settings.whisper_replicas
+        if not self._replica_bytes:
+            return 1  # size unknown until the first replica is loaded
+        fit = settings.whisper_memory_budget_mb * 2**20 // self._replica_bytes
+        return max(1, min(fit, settings.max_concurrent_jobs))
+
+    @property
+    def size(self) -> int:
+        return len(self._replicas)
+
+    @property
+    def in_use(self) -> int:
+        """Replicas currently checked out."""
+        with self._cond:
+            return len(self._replicas) - len(self._idle)
+
+    @property
+    def idle_s(self) -> float:
+        """Seconds since a replica was last checked out."""
+        return time.monotonic() - self._last_used
+
+    def release_idle(self, idle_s: float = 0) -> int:
+        """
+        Drop the idle replicas if the pool has not been used for `idle_s`
+        seconds. Checked-out replicas are kept. Returns how many were dropped.
+        """
+        with self._cond:
+            if not self._idle or self.idle_s < idle_s:
+                return 0
+            dropped = len(self._idle)
+            for model in self._idle:
+                self._replicas.remove(model)
+            self._idle.clear()
+            if not self._replicas:
+                self._loaded_at = None
+            return dropped
+
+    def usage(self) -> dict | None:
+        """Residency record for the admin API, or None when nothing is loaded."""
+        with self._cond:
+            if not self._replicas:
+                return None
+            return {
+                "size": self._replica_bytes * len(self._replicas),
+                "loaded_at": self._loaded_at,
+                "hits": self._checkouts,
+                "last_used": self._last_used,
+                "replicas": len(self._replicas),
+                "in_use": len(self._replicas) - len(self._idle),
+            }
+
+    def clear(self):
+        with self._cond:
+            self._replicas.clear()
+            self._idle.clear()
+            self._replica_bytes = 0
+            self._loaded_at = None
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "replicas": len(self._replicas),
+                "target_replicas": self.target(),
+                "replica_mb": round(self._replica_bytes / 2**20, 1),
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "checkouts": self._checkouts,
+                "avg_wait_ms": (
+                    1000 * self._total_wait / self._checkouts if self._checkouts else 0.0
+                ),
+                "max_wait_ms": 1000 * self._max_wait,
+            }
+
+    def _acquire(self):
+        with self._cond:
+            while True:
+                if self._idle:
+                    return self._idle.popleft()
+                if len(self._replicas) + self._creating < self.target():
+                    self._creating += 1
+                    break
+                self._waiting += 1
+                self._cond.wait()
+                self._waiting -= 1
+        return self._grow()
+
+    def _release(self, model):
+        with self._cond:
+            # Dropped by clear() or release_idle() while checked out: let it go
+            if any(replica is model for replica in self._replicas):
+                self._idle.append(model)
+            self._cond.notify()
+
+    def _grow(self):
+        """Load one more replica. Caller has already counted it in _creating."""
+        from app.models.model_manager import _model_nbytes
+
+        try:
+            model = self._load_fn()
+            size = _model_nbytes(model)
+        except BaseException:
+            with self._cond:
+                self._creating -= 1
+                self._cond.notify_all()  # let a waiter retry the load
+            raise
+        with self._cond:
+            self._creating -= 1
+            self._replicas.append(model)
+            self._replica_bytes = self._replica_bytes or size
+            self._loaded_at = self._loaded_at or time.time()
+            self._cond.notify_all()  # the target may have grown
+            print(f"Whisper replica loaded ({len(self._replicas)}/{self.target()}).")
+        return model
@@ -1,11 +1,7 @@
-import asyncio
-
 from app.models.model_manager import ModelManager
 from app.pipeline.progress import ProgressBroadcaster
-from app.services.transcription import transcribe_audio
-from app.services.translation import translate_text
-from app.utils.language_map import normalize_language
-from app.services.tts import generate_tts_for_segments
+from app.pipeline.streaming import transcribe_translate_speak
+from app.services.translation import plan_translation
 from app.services.audio import merge_audio_segments
 
 
@@ -16,53 +12,33 @@ async def run_audio_pipeline(
     tgt_langs: list[str],
     model_manager: ModelManager,
     progress: ProgressBroadcaster,
+    params: dict | None = None,
 ) -> dict:
-    """Audio pipeline: transcribe -> translate -> TTS -> merge."""
-
-    # Step 1: Transcribe with Whisper
-    await progress.broadcast(job_id, 0.05, "Transcribing audio", "Running Whisper...")
-    segments = await asyncio.get_event_loop().run_in_executor(
-        None, transcribe_audio, file_path, src_lang, model_manager
-    )
-
-    detected_lang = normalize_language(segments["language"])
-    src_lang = src_lang or detected_lang
-    await progress.broadcast(
-        job_id, 0.25, "Transcription complete",
-        f"Detected: {detected_lang}, {len(segments['segments'])} segments"
+    """Audio pipeline: transcribe -> translate -> TTS (overlapped) -> merge."""
+    use_cache = not (params or {}).get("bypass_cache", False)
+    profile = (params or {}).get("decoding_profile")
+
+    # Steps 1-3: Transcribe with Whisper, translating every target and
+    # generating TTS for each batch of segments as soon as it is decoded
+    stage = await transcribe_translate_speak(
+        job_id, file_path, src_lang, tgt_langs, model_manager, progress,
+        progress_range=(0.05, 0.80), use_cache=use_cache, profile=profile,
     )
+    segments = stage["transcription"]
+    src_lang = stage["src_lang"]
 
+    plan = plan_translation(src_lang, tgt_langs, stage["routes"])
     results = {}
-    per_lang_weight = 0.70 / len(tgt_langs)
+    per_lang_weight = 0.15 / len(tgt_langs)
 
     for i, tgt_lang in enumerate(tgt_langs):
-        base = 0.25 + (per_lang_weight * i)
-
-        # Step 2: Translate each segment
-        await progress.broadcast(job_id, base + 0.05, f"Translating to {tgt_lang}")
-        translated_segments = []
-        for seg in segments["segments"]:
-            translated_text = await asyncio.get_event_loop().run_in_executor(
-                None, translate_text, seg["text"], src_lang, tgt_lang, model_manager
-            )
-            translated_segments.append({
-                "start": seg["start"],
-                "end": seg["end"],
-                "text": translated_text,
-                "original_duration": seg["end"] - seg["start"],
-            })
-
-        # Step 3: Generate TTS for each segment
-        await progress.broadcast(
-            job_id, base + per_lang_weight * 0.5,
-            f"Generating speech ({tgt_lang})"
-        )
-        tts_segments = await generate_tts_for_segments(translated_segments, tgt_lang)
+        base = 0.80 + (per_lang_weight * i)
+        translated_segments = stage["translated"][tgt_lang]
+        tts_segments = stage["tts"][tgt_lang]
 
         # Step 4: Merge audio with original timing
         await progress.broadcast(
-            job_id, base + per_lang_weight * 0.8,
-            f"Assembling audio ({tgt_lang})"
+            job_id, base, f"Assembling audio ({tgt_lang})"
         )
         output_path = await merge_audio_segments(
             job_id, tgt_lang, tts_segments, total_duration=segments["duration"]
@@ -71,6 +47,7 @@ async def run_audio_pipeline(
         results[tgt_lang] = {
             "audio_file": f"/outputs/{job_id}/{tgt_lang}_audio.mp3",
             "transcript": [s["text"] for s in translated_segments],
+            "translation_plan": plan[tgt_lang],
         }
 
     return results
@@ -1,5 +1,4 @@
-import asyncio
-
+from app.models.inference_workers import run_inference
 from app.models.model_manager import ModelManager
 from app.pipeline.progress import ProgressBroadcaster
 from app.utils.file_utils import get_job_output_dir
@@ -22,8 +21,8 @@ async def run_audio_separate_pipeline(
 
     # Run separation (heavy — uses Demucs on CPU/GPU)
     from app.services.vocal_separator import separate_all_stems
-    stems = await asyncio.get_event_loop().run_in_executor(
-        None, separate_all_stems, file_path, job_id, model_manager
+    stems = await run_inference(
+        separate_all_stems, file_path, job_id, model_manager=model_manager
     )
 
     await progress.broadcast(job_id, 0.9, "Finalizing", "Exporting stems...")
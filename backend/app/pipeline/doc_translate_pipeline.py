@@ -4,6 +4,7 @@ Document Translation pipeline: PDF/DOCX/PPTX → translated document.
 import asyncio
 from pathlib import Path
 
+from app.models.inference_workers import run_inference
 from app.models.model_manager import ModelManager
 from app.pipeline.progress import ProgressBroadcaster
 from app.services.document import (
@@ -11,7 +12,7 @@ from app.services.document import (
     extract_text_from_pdf, extract_text_from_docx, extract_text_from_pptx,
     rebuild_pdf, rebuild_docx, rebuild_pptx,
 )
-from app.services.translation import translate_text
+from app.services.translation import plan_translation, translate_and_route, translate_batch
 from app.utils.file_utils import get_job_output_dir
 
 
@@ -41,8 +42,11 @@ async def run_doc_translate_pipeline(
     tgt_langs: list[str],
     model_manager: ModelManager,
     progress: ProgressBroadcaster,
+    params: dict | None = None,
 ) -> dict:
     """Translate a document (PDF/DOCX/PPTX) to target languages."""
+    use_cache = not (params or {}).get("bypass_cache", False)
+    profile = (params or {}).get("decoding_profile")
     if not file_path:
         raise ValueError("No document file provided")
 
@@ -73,22 +77,18 @@ async def run_doc_translate_pipeline(
         f"Found {len(blocks)} text blocks, translating to {tgt}..."
     )
 
-    # Translate each block
+    # Translate all blocks in one batch
     total = len(blocks)
-    translated_blocks = []
-    for i, block in enumerate(blocks):
-        translated_text = await asyncio.get_event_loop().run_in_executor(
-            None, translate_text, block["text"], src, tgt, model_manager
-        )
-        translated_block = {**block, "text": translated_text}
-        translated_blocks.append(translated_block)
-
-        pct = 0.2 + 0.6 * ((i + 1) / total)
-        if (i + 1) % 5 == 0 or i == total - 1:
-            await progress.broadcast(
-                job_id, pct, "Translating",
-                f"Block {i + 1}/{total}"
-            )
+    translated_texts, routes = await run_inference(
+        translate_and_route, translate_batch,
+        [block["text"] for block in blocks], src, tgt,
+        model_manager=model_manager, use_cache=use_cache, profile=profile,
+    )
+    translated_blocks = [
+        {**block, "text": translated_text}
+        for block, translated_text in zip(blocks, translated_texts)
+    ]
+    await progress.broadcast(job_id, 0.8, "Translating", f"Block {total}/{total}")
 
     await progress.broadcast(job_id, 0.85, "Rebuilding document", "Creating translated file...")
 
@@ -111,4 +111,5 @@ async def run_doc_translate_pipeline(
         "source_language": src,
         "target_language": tgt,
         "block_count": total,
+        "translation_plan": plan_translation(src, [tgt], routes)[tgt],
     }
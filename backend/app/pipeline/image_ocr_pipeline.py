@@ -4,10 +4,11 @@ Image OCR + Translation pipeline: image → extracted text + translated overlay.
 import asyncio
 from pathlib import Path
 
+from app.models.inference_workers import run_inference
 from app.models.model_manager import ModelManager
 from app.pipeline.progress import ProgressBroadcaster
 from app.services.ocr import extract_text_regions, overlay_translated_text
-from app.services.translation import translate_text
+from app.services.translation import plan_translation, translate_and_route, translate_batch
 from app.utils.file_utils import get_job_output_dir
 
 
@@ -18,8 +19,11 @@ async def run_image_ocr_pipeline(
     tgt_langs: list[str],
     model_manager: ModelManager,
     progress: ProgressBroadcaster,
+    params: dict | None = None,
 ) -> dict:
     """OCR an image, translate text regions, overlay translations."""
+    use_cache = not (params or {}).get("bypass_cache", False)
+    profile = (params or {}).get("decoding_profile")
     if not file_path:
         raise ValueError("No image file provided")
 
@@ -32,9 +36,7 @@ async def run_image_ocr_pipeline(
     await progress.broadcast(job_id, 0.1, "Running OCR", "Detecting text in image...")
 
     # Extract text regions
-    regions = await asyncio.get_event_loop().run_in_executor(
-        None, extract_text_regions, file_path, src
-    )
+    regions = await run_inference(extract_text_regions, file_path, src)
 
     if not regions:
         raise ValueError("No text detected in the image")
@@ -44,20 +46,16 @@ async def run_image_ocr_pipeline(
         f"Found {len(regions)} text regions, translating..."
     )
 
-    # Translate each region
-    translated_texts = []
-    for i, region in enumerate(regions):
-        translated = await asyncio.get_event_loop().run_in_executor(
-            None, translate_text, region.text, src, tgt, model_manager
-        )
-        translated_texts.append(translated)
-
-        pct = 0.4 + 0.3 * ((i + 1) / len(regions))
-        if (i + 1) % 3 == 0 or i == len(regions) - 1:
-            await progress.broadcast(
-                job_id, pct, "Translating",
-                f"Region {i + 1}/{len(regions)}"
-            )
+    # Translate all regions in one batch
+    translated_texts, routes = await run_inference(
+        translate_and_route, translate_batch,
+        [region.text for region in regions], src, tgt,
+        model_manager=model_manager, use_cache=use_cache, profile=profile,
+    )
+    await progress.broadcast(
+        job_id, 0.7, "Translating",
+        f"Region {len(regions)}/{len(regions)}"
+    )
 
     await progress.broadcast(job_id, 0.8, "Overlaying text", "Creating translated image...")
 
@@ -96,6 +94,7 @@ async def run_image_ocr_pipeline(
         "source_language": src,
         "target_language": tgt,
         "region_count": len(regions),
+        "translation_plan": plan_translation(src, [tgt], routes)[tgt],
         "regions": [
             {"text": r.text, "translated": t, "confidence": r.confidence}
             for r, t in zip(regions, translated_texts)
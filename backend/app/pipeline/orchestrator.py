@@ -59,6 +59,7 @@ class JobOrchestrator:
         target_languages: list[str],
         singing_mode: bool = False,
         user_id: str | None = None,
+        extra_params: dict | None = None,
     ) -> str:
         tool = _resolve_tool(content_type, singing_mode)
         return await self.submit_tool_job(
@@ -69,6 +70,7 @@ class JobOrchestrator:
             target_languages=target_languages,
             singing_mode=singing_mode,
             user_id=user_id,
+            extra_params=extra_params,
         )
 
     # ── Tool-based submit (new unified method) ──
@@ -205,25 +207,25 @@ class JobOrchestrator:
             from app.pipeline.text_pipeline import run_text_pipeline
             return await run_text_pipeline(
                 job_id, file_path, src_lang, tgt_langs,
-                self.model_manager, self.broadcaster,
+                self.model_manager, self.broadcaster, extra_params,
             )
         elif tool == ToolType.TRANSLATE_SINGING:
             from app.pipeline.singing_pipeline import run_singing_pipeline
             return await run_singing_pipeline(
                 job_id, file_path, src_lang, tgt_langs,
-                self.model_manager, self.broadcaster,
+                self.model_manager, self.broadcaster, extra_params,
             )
         elif tool == ToolType.TRANSLATE_AUDIO:
             from app.pipeline.audio_pipeline import run_audio_pipeline
             return await run_audio_pipeline(
                 job_id, file_path, src_lang, tgt_langs,
-                self.model_manager, self.broadcaster,
+                self.model_manager, self.broadcaster, extra_params,
             )
         elif tool == ToolType.TRANSLATE_VIDEO:
             from app.pipeline.video_pipeline import run_video_pipeline
             return await run_video_pipeline(
                 job_id, file_path, src_lang, tgt_langs,
-                self.model_manager, self.broadcaster,
+                self.model_manager, self.broadcaster, extra_params,
             )
         # New tools — will be implemented in Phase 3/4
         elif tool == ToolType.TEXT_TO_SPEECH:
@@ -246,13 +248,13 @@ class JobOrchestrator:
             from app.pipeline.doc_translate_pipeline import run_doc_translate_pipeline
             return await run_doc_translate_pipeline(
                 job_id, file_path, src_lang, tgt_langs,
-                self.model_manager, self.broadcaster,
+                self.model_manager, self.broadcaster, extra_params,
             )
         elif tool == ToolType.IMAGE_OCR:
             from app.pipeline.image_ocr_pipeline import run_image_ocr_pipeline
             return await run_image_ocr_pipeline(
                 job_id, file_path, src_lang, tgt_langs,
-                self.model_manager, self.broadcaster,
+                self.model_manager, self.broadcaster, extra_params,
             )
         else:
             raise ValueError(f"Unknown tool: {tool}")
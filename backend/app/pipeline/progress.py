@@ -24,14 +24,18 @@ class ProgressBroadcaster:
                 del self._connections[job_id]
 
     async def broadcast(
-        self, job_id: str, progress: float, step: str, detail: str = ""
+        self, job_id: str, progress: float, step: str, detail: str = "",
+        transcript: list[dict] | None = None,
     ):
+        """`transcript` carries newly decoded segments while a job transcribes."""
         message = {
             "job_id": job_id,
             "progress": progress,
             "step": step,
             "detail": detail,
         }
+        if transcript is not None:
+            message["transcript"] = transcript
         if job_id in self._connections:
             dead = []
             for ws in self._connections[job_id]:
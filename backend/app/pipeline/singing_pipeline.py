@@ -1,9 +1,8 @@
-import asyncio
-
+from app.models.inference_workers import run_inference
 from app.models.model_manager import ModelManager
 from app.pipeline.progress import ProgressBroadcaster
 from app.services.transcription import transcribe_audio
-from app.services.translation import translate_text
+from app.services.translation import plan_translation, translate_and_route, translate_multi
 from app.services.tts import generate_tts_for_segments
 from app.services.vocal_separator import separate_vocals
 from app.services.audio_mixer import mix_vocals_over_instrumental
@@ -17,18 +16,21 @@ async def run_singing_pipeline(
     tgt_langs: list[str],
     model_manager: ModelManager,
     progress: ProgressBroadcaster,
+    params: dict | None = None,
 ) -> dict:
     """
     Singing pipeline: separate vocals → transcribe → translate → TTS → mix over instrumental.
     """
+    use_cache = not (params or {}).get("bypass_cache", False)
+    profile = (params or {}).get("decoding_profile")
 
     # Step 1: Separate vocals from instrumental using Demucs
     await progress.broadcast(
         job_id, 0.02, "Separating vocals",
         "Running Demucs... this may take a few minutes on CPU"
     )
-    separation = await asyncio.get_event_loop().run_in_executor(
-        None, separate_vocals, file_path, job_id, model_manager
+    separation = await run_inference(
+        separate_vocals, file_path, job_id, model_manager=model_manager
     )
     vocals_path = separation["vocals_path"]
     instrumental_path = separation["instrumental_path"]
@@ -43,8 +45,8 @@ async def run_singing_pipeline(
         job_id, 0.22, "Transcribing lyrics",
         "Running Whisper on isolated vocals..."
     )
-    segments = await asyncio.get_event_loop().run_in_executor(
-        None, transcribe_audio, vocals_path, src_lang, model_manager
+    segments = await run_inference(
+        transcribe_audio, vocals_path, src_lang, model_manager=model_manager
     )
 
     detected_lang = normalize_language(segments["language"])
@@ -54,19 +56,25 @@ async def run_singing_pipeline(
         f"Detected: {detected_lang}, {len(segments['segments'])} segments"
     )
 
+    # Step 3: Translate all lyric segments into every target language at once
+    await progress.broadcast(
+        job_id, 0.37, "Translating lyrics", f"Targets: {', '.join(tgt_langs)}"
+    )
+    translations, routes = await run_inference(
+        translate_and_route, translate_multi,
+        [seg["text"] for seg in segments["segments"]], src_lang, tgt_langs,
+        model_manager=model_manager, use_cache=use_cache, profile=profile,
+    )
+
+    plan = plan_translation(src_lang, tgt_langs, routes)
     results = {}
-    per_lang_weight = 0.60 / len(tgt_langs)
+    per_lang_weight = 0.55 / len(tgt_langs)
 
     for i, tgt_lang in enumerate(tgt_langs):
-        base = 0.35 + (per_lang_weight * i)
+        base = 0.40 + (per_lang_weight * i)
 
-        # Step 3: Translate each lyric segment
-        await progress.broadcast(job_id, base, f"Translating lyrics to {tgt_lang}")
         translated_segments = []
-        for seg in segments["segments"]:
-            translated_text = await asyncio.get_event_loop().run_in_executor(
-                None, translate_text, seg["text"], src_lang, tgt_lang, model_manager
-            )
+        for seg, translated_text in zip(segments["segments"], translations[tgt_lang]):
             translated_segments.append({
                 "start": seg["start"],
                 "end": seg["end"],
@@ -99,6 +107,7 @@ async def run_singing_pipeline(
         results[tgt_lang] = {
             "audio_file": f"/outputs/{job_id}/{tgt_lang}_singing_audio.mp3",
             "transcript": [s["text"] for s in translated_segments],
+            "translation_plan": plan[tgt_lang],
         }
 
     return results
@@ -0,0 +1,161 @@
+"""
+Incremental transcription for the dubbing pipelines.
+
+`TranscriptionStream` runs `transcribe_audio` in an executor thread and
+hands its segments to the event loop as they are decoded, so translation
+and TTS start on the first segments while Whisper is still working on the
+rest. `transcribe_translate_speak` is that overlapped stage, shared by the
+audio and video pipelines.
+"""
+import asyncio
+import functools
+
+from app.config import settings
+from app.models.inference_workers import get_worker_pool, run_inference
+from app.models.model_manager import ModelManager
+from app.pipeline.progress import ProgressBroadcaster
+from app.services.transcription import transcribe_audio
+from app.services.translation import translate_and_route, translate_multi
+from app.services.tts import generate_tts_for_segments
+from app.utils.language_map import normalize_language
+
+
+class TranscriptionStream:
+    """
+    `async for language, segments, audio_s in stream:` yields finished
+    segments in order; `stream.result` is the full transcription afterwards.
+    Segments that pile up while the consumer is busy arrive as one batch.
+    With `pipeline_streaming` off or inference in worker processes, where
+    the callback cannot cross the process boundary, everything arrives as a
+    single batch at the end.
+    """
+
+    def __init__(self, media, src_lang: str | None, model_manager: ModelManager):
+        self.media = media  # file path or decoded 16 kHz samples
+        self.src_lang = src_lang
+        self.model_manager = model_manager
+        self.result: dict | None = None
+
+    async def __aiter__(self):
+        if not settings.pipeline_streaming or get_worker_pool() is not None:
+            self.result = await run_inference(
+                transcribe_audio, self.media, self.src_lang,
+                model_manager=self.model_manager,
+            )
+            result = self.result
+            if result["segments"]:
+                yield result["language"], result["segments"], result["duration"]
+            return
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def on_segments(language: str, segments: list[dict], audio_s: float | None):
+            loop.call_soon_threadsafe(queue.put_nowait, (language, segments, audio_s))
+
+        future = loop.run_in_executor(None, functools.partial(
+            transcribe_audio, self.media, self.src_lang, self.model_manager,
+            on_segments=on_segments,
+        ))
+        # Scheduled after every on_segments call, so it always comes last
+        future.add_done_callback(lambda _: queue.put_nowait(None))
+
+        done = False
+        while not done:
+            item = await queue.get()
+            if item is None:
+                break
+            language, segments, audio_s = item
+            segments = list(segments)
+            while not queue.empty():
+                more = queue.get_nowait()
+                if more is None:
+                    done = True
+                    break
+                segments.extend(more[1])
+            yield language, segments, audio_s
+
+        self.result = await future
+
+
+async def transcribe_translate_speak(
+    job_id: str,
+    media,
+    src_lang: str | None,
+    tgt_langs: list[str],
+    model_manager: ModelManager,
+    progress: ProgressBroadcaster,
+    progress_range: tuple[float, float],
+    use_cache: bool = True,
+    profile: str | None = None,
+) -> dict:
+    """
+    Transcribe, translate into every target and generate TTS, overlapping
+    the stages: each batch of segments is translated and voiced as soon as
+    Whisper emits it, and pushed to progress listeners as a partial
+    transcript. Returns {"transcription", "src_lang", "routes",
+    "translated": {tgt: segments}, "tts": {tgt: tts segments}}.
+    """
+    start, end = progress_range
+    await progress.broadcast(job_id, start, "Transcribing audio", "Running Whisper...")
+
+    translated = {tgt: [] for tgt in tgt_langs}
+    tts = {tgt: [] for tgt in tgt_langs}
+    routes = None
+    count = 0
+    voiced = 0.0  # fraction of the media translated and voiced so far
+
+    stream = TranscriptionStream(media, src_lang, model_manager)
+    async for language, segments, audio_s in stream:
+        src_lang = src_lang or normalize_language(language)
+        count += len(segments)
+        await progress.broadcast(
+            job_id, start + (end - start) * voiced, "Transcribing audio",
+            f"{count} segments so far",
+            transcript=[
+                {"start": seg["start"], "end": seg["end"], "text": seg["text"]}
+                for seg in segments
+            ],
+        )
+
+        translations, batch_routes = await run_inference(
+            translate_and_route, translate_multi,
+            [seg["text"] for seg in segments], src_lang, tgt_langs,
+            model_manager=model_manager, use_cache=use_cache, profile=profile,
+        )
+        routes = routes or batch_routes
+
+        for tgt_lang in tgt_langs:
+            new_segments = [
+                {
+                    "start": seg["start"],
+                    "end": seg["end"],
+                    "text": translated_text,
+                    "original_duration": seg["end"] - seg["start"],
+                    "words": seg.get("words", []),
+                }
+                for seg, translated_text in zip(segments, translations[tgt_lang])
+            ]
+            translated[tgt_lang].extend(new_segments)
+            tts[tgt_lang].extend(await generate_tts_for_segments(new_segments, tgt_lang))
+
+        voiced = min(1.0, segments[-1]["end"] / audio_s) if audio_s else 1.0
+        await progress.broadcast(
+            job_id, start + (end - start) * voiced, "Translating and generating speech",
+            f"{count} segments into {', '.join(tgt_langs)}",
+        )
+
+    transcription = stream.result
+    src_lang = src_lang or normalize_language(transcription["language"])
+    await progress.broadcast(
+        job_id, end, "Speech generated",
+        f"Detected: {normalize_language(transcription['language'])}, "
+        f"{len(transcription['segments'])} segments",
+    )
+    return {
+        "transcription": transcription,
+        "src_lang": src_lang,
+        "routes": routes,
+        "translated": translated,
+        "tts": tts,
+    }
@@ -1,5 +1,4 @@
-import asyncio
-
+from app.models.inference_workers import run_inference
 from app.models.model_manager import ModelManager
 from app.pipeline.progress import ProgressBroadcaster
 from app.services.transcription import transcribe_audio
@@ -22,8 +21,8 @@ async def run_stt_pipeline(
 
     await progress.broadcast(job_id, 0.1, "Transcribing", "Running Whisper...")
 
-    segments = await asyncio.get_event_loop().run_in_executor(
-        None, transcribe_audio, file_path, src_lang, model_manager
+    segments = await run_inference(
+        transcribe_audio, file_path, src_lang, model_manager=model_manager
     )
 
     detected_lang = normalize_language(segments["language"])
@@ -1,10 +1,12 @@
 import asyncio
 from pathlib import Path
 
+from app.config import settings
+from app.models.inference_workers import run_inference
 from app.models.model_manager import ModelManager
 from app.pipeline.progress import ProgressBroadcaster
 from app.services.language_detect import detect_language
-from app.services.translation import translate_text
+from app.services.translation import plan_translation, translate_and_route, translate_multi
 from app.utils.file_utils import get_job_output_dir
 
 
@@ -15,8 +17,18 @@ async def run_text_pipeline(
     tgt_langs: list[str],
     model_manager: ModelManager,
     progress: ProgressBroadcaster,
+    params: dict | None = None,
 ) -> dict:
     """Text pipeline: detect language -> translate -> save files."""
+    use_cache = not (params or {}).get("bypass_cache", False)
+    profile = (params or {}).get("decoding_profile")
+
+    threshold = settings.text_streaming_threshold_mb * 1024 * 1024
+    if Path(file_path).stat().st_size >= threshold:
+        return await _run_text_pipeline_streaming(
+            job_id, file_path, src_lang, tgt_langs, model_manager, progress,
+            use_cache, profile,
+        )
 
     await progress.broadcast(job_id, 0.05, "Reading file")
     text = Path(file_path).read_text(encoding="utf-8")
@@ -27,15 +39,20 @@ async def run_text_pipeline(
         src_lang = detect_language(text)
         await progress.broadcast(job_id, 0.15, "Language detected", f"Detected: {src_lang}")
 
-    results = {}
-    for i, tgt_lang in enumerate(tgt_langs):
-        pct = 0.15 + (0.80 * (i / len(tgt_langs)))
-        await progress.broadcast(job_id, pct, f"Translating to {tgt_lang}")
+    await progress.broadcast(
+        job_id, 0.20, "Translating", f"Targets: {', '.join(tgt_langs)}"
+    )
 
-        # Run translation in executor to avoid blocking event loop
-        translated = await asyncio.get_event_loop().run_in_executor(
-            None, translate_text, text, src_lang, tgt_lang, model_manager
-        )
+    # Run translation in executor to avoid blocking event loop
+    translations, routes = await run_inference(
+        translate_and_route, translate_multi, [text], src_lang, tgt_langs,
+        model_manager=model_manager, use_cache=use_cache, profile=profile,
+    )
+
+    plan = plan_translation(src_lang, tgt_langs, routes)
+    results = {}
+    for tgt_lang in tgt_langs:
+        translated = translations[tgt_lang][0]
 
         # Save translated text
         output_dir = get_job_output_dir(job_id)
@@ -45,6 +62,128 @@ async def run_text_pipeline(
         results[tgt_lang] = {
             "text_file": f"/outputs/{job_id}/{tgt_lang}_translated.txt",
             "preview": translated[:500],
+            "translation_plan": plan[tgt_lang],
         }
 
     return results
+
+
+async def _run_text_pipeline_streaming(
+    job_id: str,
+    file_path: str,
+    src_lang: str | None,
+    tgt_langs: list[str],
+    model_manager: ModelManager,
+    progress: ProgressBroadcaster,
+    use_cache: bool,
+    profile: str | None,
+) -> dict:
+    """
+    Streaming mode for large files: read paragraphs lazily, translate them in
+    bounded batches, and append to each {lang}_translated.txt as we go.
+    Only one batch is held in memory, regardless of file size.
+    """
+    loop = asyncio.get_event_loop()
+    total_bytes = Path(file_path).stat().st_size
+
+    if not src_lang:
+        await progress.broadcast(job_id, 0.05, "Detecting language")
+        sample = await loop.run_in_executor(None, _read_sample, file_path, 5000)
+        src_lang = detect_language(sample)
+        await progress.broadcast(job_id, 0.08, "Language detected", f"Detected: {src_lang}")
+
+    output_dir = get_job_output_dir(job_id)
+    outputs = {
+        tgt: open(output_dir / f"{tgt}_translated.txt", "w", encoding="utf-8")
+        for tgt in tgt_langs
+    }
+    previews = {tgt: "" for tgt in tgt_langs}
+    paragraphs_done = 0
+    pending_sep = {tgt: "" for tgt in tgt_langs}
+    routes = None
+
+    batches = _iter_paragraph_batches(file_path, settings.text_stream_batch_paragraphs)
+    try:
+        while True:
+            batch = await loop.run_in_executor(None, next, batches, None)
+            if batch is None:
+                break
+            texts = [text for text, _, _ in batch]
+            translations, routes = await run_inference(
+                translate_and_route, translate_multi, texts, src_lang, tgt_langs,
+                model_manager=model_manager, use_cache=use_cache, profile=profile,
+            )
+
+            # Paragraph by paragraph, so progress and preview follow the output
+            for i, (_, sep, bytes_done) in enumerate(batch):
+                for tgt in tgt_langs:
+                    piece = pending_sep[tgt] + translations[tgt][i]
+                    outputs[tgt].write(piece)
+                    pending_sep[tgt] = sep
+                    if len(previews[tgt]) < 500:
+                        previews[tgt] = (previews[tgt] + piece)[:500]
+                paragraphs_done += 1
+                pct = 0.10 + 0.85 * (bytes_done / total_bytes if total_bytes else 1.0)
+                await progress.broadcast(
+                    job_id, pct, f"Translated {paragraphs_done} paragraphs",
+                    translations[tgt_langs[0]][i][:200],
+                )
+            for out in outputs.values():
+                out.flush()
+    finally:
+        for out in outputs.values():
+            out.close()
+        try:
+            batches.close()  # closes the source file when a batch fails
+        except ValueError:
+            pass  # still running in the executor after a cancel; closed when collected
+
+    plan = plan_translation(src_lang, tgt_langs, routes)
+    return {
+        tgt: {
+            "text_file": f"/outputs/{job_id}/{tgt}_translated.txt",
+            "preview": previews[tgt],
+            "paragraphs": paragraphs_done,
+            "translation_plan": plan[tgt],
+        }
+        for tgt in tgt_langs
+    }
+
+
+def _read_sample(file_path: str, size: int) -> str:
+    with open(file_path, encoding="utf-8") as f:
+        return f.read(size)
+
+
+def _iter_paragraph_batches(file_path: str, batch_size: int):
+    """
+    Yield lists of (paragraph, separator, bytes_read) read lazily from disk.
+    Paragraphs end at blank lines; one that grows past 20k characters is cut
+    at a line boundary so a file without blank lines still streams.
+    `separator` is what followed the paragraph in the source ("\n\n" or "\n").
+    """
+    max_chars = 20000
+    batch = []
+    lines: list[str] = []
+    chars = 0
+    bytes_read = 0
+
+    with open(file_path, encoding="utf-8") as f:
+        for line in f:
+            bytes_read += len(line.encode("utf-8"))
+            stripped = line.strip()
+            if stripped:
+                lines.append(stripped)
+                chars += len(stripped)
+            if lines and (not stripped or chars >= max_chars):
+                batch.append((" ".join(lines), "\n\n" if not stripped else "\n", bytes_read))
+                lines = []
+                chars = 0
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+    if lines:
+        batch.append((" ".join(lines), "\n", bytes_read))
+    if batch:
+        yield batch
@@ -1,13 +1,9 @@
-import asyncio
-
 from app.models.model_manager import ModelManager
 from app.pipeline.progress import ProgressBroadcaster
-from app.services.video import extract_audio, burn_subtitles_and_replace_audio
-from app.services.transcription import transcribe_audio
-from app.services.translation import translate_text
-from app.utils.language_map import normalize_language
-from app.services.tts import generate_tts_for_segments
-from app.services.audio import merge_audio_segments
+from app.pipeline.streaming import transcribe_translate_speak
+from app.services.video import burn_subtitles_and_replace_audio
+from app.services.translation import plan_translation
+from app.services.audio import decode_audio_async, merge_audio_segments
 from app.services.subtitle import generate_ass_subtitles, generate_srt_subtitles
 
 
@@ -18,55 +14,38 @@ async def run_video_pipeline(
     tgt_langs: list[str],
     model_manager: ModelManager,
     progress: ProgressBroadcaster,
+    params: dict | None = None,
 ) -> dict:
-    """Video pipeline: extract audio -> transcribe -> translate -> TTS -> subs -> burn."""
+    """Video pipeline: extract audio -> transcribe/translate/TTS (overlapped) -> subs -> burn."""
+    use_cache = not (params or {}).get("bypass_cache", False)
+    profile = (params or {}).get("decoding_profile")
 
-    # Step 1: Extract audio from video
+    # Step 1: Decode the audio track into memory through an ffmpeg pipe;
+    # Whisper gets the samples directly, so no WAV is written or re-decoded
     await progress.broadcast(job_id, 0.02, "Extracting audio from video")
-    audio_path = await extract_audio(file_path, job_id)
+    audio = await decode_audio_async(file_path)
 
-    # Step 2: Transcribe
-    await progress.broadcast(job_id, 0.05, "Transcribing audio", "Running Whisper...")
-    segments = await asyncio.get_event_loop().run_in_executor(
-        None, transcribe_audio, audio_path, src_lang, model_manager
-    )
-    src_lang = src_lang or normalize_language(segments["language"])
-    await progress.broadcast(
-        job_id, 0.20, "Transcription complete",
-        f"Detected: {src_lang}, {len(segments['segments'])} segments"
+    # Steps 2-4: Transcribe, translating every target and generating TTS for
+    # each batch of segments as soon as it is decoded
+    stage = await transcribe_translate_speak(
+        job_id, audio, src_lang, tgt_langs, model_manager, progress,
+        progress_range=(0.05, 0.60), use_cache=use_cache, profile=profile,
     )
+    segments = stage["transcription"]
+    src_lang = stage["src_lang"]
 
+    plan = plan_translation(src_lang, tgt_langs, stage["routes"])
     results = {}
-    per_lang_weight = 0.75 / len(tgt_langs)
+    per_lang_weight = 0.35 / len(tgt_langs)
 
     for i, tgt_lang in enumerate(tgt_langs):
-        base = 0.20 + (per_lang_weight * i)
-
-        # Step 3: Translate each segment
-        await progress.broadcast(job_id, base, f"Translating to {tgt_lang}")
-        translated_segments = []
-        for seg in segments["segments"]:
-            translated_text = await asyncio.get_event_loop().run_in_executor(
-                None, translate_text, seg["text"], src_lang, tgt_lang, model_manager
-            )
-            translated_segments.append({
-                "start": seg["start"],
-                "end": seg["end"],
-                "text": translated_text,
-                "original_duration": seg["end"] - seg["start"],
-                "words": seg.get("words", []),
-            })
-
-        # Step 4: Generate TTS for each segment
-        await progress.broadcast(
-            job_id, base + per_lang_weight * 0.3,
-            f"Generating speech ({tgt_lang})"
-        )
-        tts_segments = await generate_tts_for_segments(translated_segments, tgt_lang)
+        base = 0.60 + (per_lang_weight * i)
+        translated_segments = stage["translated"][tgt_lang]
+        tts_segments = stage["tts"][tgt_lang]
 
         # Step 5: Merge TTS into single audio track
         await progress.broadcast(
-            job_id, base + per_lang_weight * 0.5,
+            job_id, base,
             f"Assembling audio ({tgt_lang})"
         )
         dubbed_audio = await merge_audio_segments(
@@ -75,7 +54,7 @@ async def run_video_pipeline(
 
         # Step 6: Generate subtitles (ASS for burning, SRT for download)
         await progress.broadcast(
-            job_id, base + per_lang_weight * 0.65,
+            job_id, base + per_lang_weight * 0.2,
             f"Generating subtitles ({tgt_lang})"
         )
         subtitle_ass = generate_ass_subtitles(job_id, tgt_lang, translated_segments)
@@ -83,7 +62,7 @@ async def run_video_pipeline(
 
         # Step 7: Burn subtitles + replace audio -> final video
         await progress.broadcast(
-            job_id, base + per_lang_weight * 0.8,
+            job_id, base + per_lang_weight * 0.3,
             f"Rendering final video ({tgt_lang})"
         )
         final_video = await burn_subtitles_and_replace_audio(
@@ -98,6 +77,7 @@ async def run_video_pipeline(
             "video_file": f"/outputs/{job_id}/{tgt_lang}_final.mp4",
             "subtitle_file": f"/outputs/{job_id}/{tgt_lang}_subtitles.srt",
             "audio_file": f"/outputs/{job_id}/{tgt_lang}_audio.mp3",
+            "translation_plan": plan[tgt_lang],
         }
 
     return results
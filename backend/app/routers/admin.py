@@ -0,0 +1,63 @@
+"""
+Model residency admin endpoints.
+Requires an admin user. With inference workers the models live in the worker
+processes, which cannot be addressed one by one, so these endpoints answer 409.
+"""
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.auth.dependencies import require_admin
+from app.config import settings
+from app.db.models import User
+from app.dependencies import get_model_manager
+
+router = APIRouter()
+
+
+def _require_in_process():
+    from app.models.inference_workers import get_worker_pool
+    if get_worker_pool() is not None:
+        raise HTTPException(
+            409,
+            "Models are loaded in the inference worker processes "
+            "(inference_workers > 0) and cannot be managed from the API process",
+        )
+
+
+@router.get("/admin/models")
+async def list_models(user: User = Depends(require_admin)):
+    """Loaded models with size, load time, hit count and last use."""
+    _require_in_process()
+    model_manager = get_model_manager()
+    return {
+        "idle_timeout_s": settings.model_idle_timeout_s,
+        "models": model_manager.model_residency(),
+    }
+
+
+@router.post("/admin/models/{name:path}")
+async def load_model(name: str, user: User = Depends(require_admin)):
+    """Load and warm a model ("whisper", "demucs", "nllb" or a pair like "en-es")."""
+    _require_in_process()
+    model_manager = get_model_manager()
+    loop = asyncio.get_event_loop()
+    try:
+        await loop.run_in_executor(None, model_manager.load_model, name)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    return {"loaded": name, "models": model_manager.model_residency()}
+
+
+@router.delete("/admin/models/{name:path}")
+async def unload_model(name: str, user: User = Depends(require_admin)):
+    """Unload a model now; 409 while a job is using it."""
+    _require_in_process()
+    model_manager = get_model_manager()
+    try:
+        model_manager.unload_model(name)
+    except ValueError as e:
+        raise HTTPException(404, str(e))
+    except RuntimeError as e:
+        raise HTTPException(409, str(e))
+    return {"unloaded": name, "models": model_manager.model_residency()}
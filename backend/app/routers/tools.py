@@ -1,7 +1,7 @@
 import json
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
 
-from app.models.schemas import ContentType, ToolType
+from app.models.schemas import ContentType, ToolType, DecodingProfile
 from app.utils.file_utils import save_upload
 from app.dependencies import get_orchestrator
 from app.config import settings
@@ -94,6 +94,8 @@ async def tool_doc_translate(
     file: UploadFile = File(...),
     source_language: str = Form("en"),
     target_language: str = Form(...),
+    bypass_cache: bool = Form(False),
+    decoding_profile: DecodingProfile | None = Form(None),
     user: User | None = Depends(get_current_user_optional),
 ):
     """Document Translation: translate PDF, DOCX, or PPTX."""
@@ -118,6 +120,10 @@ async def tool_doc_translate(
         source_language=source_language,
         target_languages=[target_language],
         user_id=user.id if user else None,
+        extra_params={
+            "bypass_cache": bypass_cache,
+            "decoding_profile": decoding_profile.value if decoding_profile else None,
+        },
     )
 
     return {"job_id": job_id, "tool": "doc_translate", "status": "queued"}
@@ -128,6 +134,8 @@ async def tool_image_ocr(
     file: UploadFile = File(...),
     source_language: str = Form("en"),
     target_language: str = Form(...),
+    bypass_cache: bool = Form(False),
+    decoding_profile: DecodingProfile | None = Form(None),
     user: User | None = Depends(get_current_user_optional),
 ):
     """Image OCR + Translation: extract text from image, translate, overlay."""
@@ -155,6 +163,10 @@ async def tool_image_ocr(
         source_language=source_language,
         target_languages=[target_language],
         user_id=user.id if user else None,
+        extra_params={
+            "bypass_cache": bypass_cache,
+            "decoding_profile": decoding_profile.value if decoding_profile else None,
+        },
     )
 
     # Copy original image to output dir
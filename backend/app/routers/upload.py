@@ -1,7 +1,7 @@
 import json
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
 
-from app.models.schemas import ContentType
+from app.models.schemas import ContentType, DecodingProfile
 from app.utils.file_utils import detect_content_type, save_upload
 from app.dependencies import get_orchestrator
 from app.config import settings
@@ -16,7 +16,9 @@ async def upload_file(
     file: UploadFile = File(...),
     target_languages: str = Form(...),
     source_language: str = Form(None),
-    singing_mode: str = Form("false"),
+    singing_mode: bool = Form(False),
+    bypass_cache: bool = Form(False),
+    decoding_profile: DecodingProfile | None = Form(None),
     user: User | None = Depends(get_current_user_optional),
 ):
     """Upload a file and start a localization job."""
@@ -38,8 +40,7 @@ async def upload_file(
     if not tgt_langs or not isinstance(tgt_langs, list):
         raise HTTPException(400, "At least one target language required")
 
-    is_singing = singing_mode.lower() in ("true", "1", "yes")
-    if is_singing and content_type != ContentType.AUDIO:
+    if singing_mode and content_type != ContentType.AUDIO:
         raise HTTPException(400, "Song mode is only available for audio files")
 
     file_path = await save_upload(file)
@@ -50,13 +51,17 @@ async def upload_file(
         content_type=content_type,
         source_language=source_language if source_language else None,
         target_languages=tgt_langs,
-        singing_mode=is_singing,
+        singing_mode=singing_mode,
         user_id=user.id if user else None,
+        extra_params={
+            "bypass_cache": bypass_cache,
+            "decoding_profile": decoding_profile.value if decoding_profile else None,
+        },
     )
 
     return {
         "job_id": job_id,
         "content_type": content_type.value,
-        "singing_mode": is_singing,
+        "singing_mode": singing_mode,
         "message": "Job submitted successfully",
     }
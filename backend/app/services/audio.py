@@ -1,6 +1,53 @@
+import asyncio
+import subprocess
 from pathlib import Path
 from pydub import AudioSegment
+from app.config import settings
 from app.utils.file_utils import get_job_output_dir
+from app.utils.thread_budget import ffmpeg_command_prefix, ffmpeg_thread_args
+
+
+def decode_audio(file_path: str, sample_rate: int = 16000):
+    """
+    Decode the audio of any media file to mono float32 samples at
+    `sample_rate`, read straight from ffmpeg's stdout (no temporary WAV).
+    """
+    import numpy as np
+
+    result = subprocess.run(
+        _decode_cmd(file_path, sample_rate), capture_output=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg audio decoding failed: {result.stderr.decode()}")
+    return np.frombuffer(result.stdout, dtype=np.float32)
+
+
+async def decode_audio_async(file_path: str, sample_rate: int = 16000):
+    """decode_audio without blocking the event loop, e.g. the audio track of a video."""
+    import numpy as np
+
+    process = await asyncio.create_subprocess_exec(
+        *_decode_cmd(file_path, sample_rate),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"FFmpeg audio decoding failed: {stderr.decode()}")
+    return np.frombuffer(stdout, dtype=np.float32)
+
+
+def _decode_cmd(file_path: str, sample_rate: int) -> list[str]:
+    return [
+        *ffmpeg_command_prefix(), settings.ffmpeg_path, "-nostdin",
+        "-i", file_path,
+        "-vn",
+        "-ac", "1",
+        "-ar", str(sample_rate),
+        "-f", "f32le",
+        *ffmpeg_thread_args(),
+        "-",
+    ]
 
 
 async def merge_audio_segments(
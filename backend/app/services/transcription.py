@@ -1,38 +1,550 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from app.config import settings
 from app.models.model_manager import ModelManager
+from app.services.audio import decode_audio
+from app.services.transcription_cache import get_transcription_cache, make_key
+from app.services.vad import SAMPLE_RATE, plan_chunks
+from app.services.translation_batcher import MicroBatcher
+from app.utils.thread_budget import thread_budget
+
+TRANSCRIPTION_BACKENDS = ("openai", "faster-whisper")
+
+# Whisper's input window; batched windows must fit in one
+WINDOW_S = 30
+
+# on_segments(language, segments, audio_seconds or None)
+SegmentCallback = Callable[[str, list[dict], float | None], None]
 
 
 def transcribe_audio(
-    file_path: str, src_lang: str | None, model_manager: ModelManager
+    media,
+    src_lang: str | None,
+    model_manager: ModelManager,
+    on_segments: SegmentCallback | None = None,
 ) -> dict:
     """
     Transcribe audio with Whisper, returning segments with word-level timestamps.
-    Uses a lock to prevent concurrent transcription (Whisper's kv_cache is not thread-safe).
+    `media` is a file path, or samples already decoded to 16 kHz mono float32
+    (decode_audio), which are used as they are.
+    Checks out a replica from the Whisper pool, since one model's kv_cache is
+    not thread-safe; concurrent jobs use separate replicas.
+    With `vad_chunking`, audio longer than `vad_chunk_s` is split at silences
+    and the chunks are transcribed in parallel (see _transcribe_chunked).
+    Results are cached by a hash of the decoded audio, so the same media run
+    through another tool or uploaded again skips Whisper.
+    With `whisper_batching`, audio is cut into windows of at most 30 s that
+    are decoded together with other jobs' windows (see _whisper_batcher).
+    `on_segments` receives finished segments in order while decoding goes
+    on: per VAD chunk, per ~30 s window with openai-whisper, or as
+    faster-whisper produces them, held back until a batch is worth
+    translating (see _Emitter). Whatever could not be streamed is passed on
+    before returning.
+    """
+    cache = get_transcription_cache()
+    chunking = settings.vad_chunking or settings.whisper_batching
+    audio = media
+    if isinstance(media, str) and (cache is not None or chunking or on_segments):
+        # Decoded once; the same samples are hashed and fed to Whisper
+        audio = decode_audio(media, SAMPLE_RATE)
+
+    audio_s = None if isinstance(audio, str) else len(audio) / SAMPLE_RATE
+    emit = _Emitter(on_segments, audio_s)
+    key = None
+    if cache is not None:
+        key = make_key(audio, src_lang)
+        cached = cache.get(key)
+        if cached is not None:
+            name = Path(media).name if isinstance(media, str) else "decoded audio"
+            print(f"Transcription cache hit for {name}")
+            emit.flush(cached)
+            return cached
+
+    if chunking and len(audio) > _chunk_s() * SAMPLE_RATE:
+        result = _transcribe_chunked(audio, src_lang, model_manager, emit)
+    elif settings.whisper_batching:
+        raw = _whisper_batcher(model_manager).run([audio], src_lang)[0]
+        result = _build_result(raw["language"], raw["segments"])
+    else:
+        with model_manager.whisper_replica() as model, thread_budget("whisper"):
+            raw = run_whisper(model, audio, src_lang, on_segment=emit)
+        result = _build_result(raw["language"], raw["segments"])
+
+    if cache is not None:
+        cache.put(key, result)
+    emit.flush(result)
+    return result
+
+
+class _Emitter:
+    """
+    Passes finished segments to an on_segments callback, once each, in order.
+    Segments are held until they span `pipeline_stream_batch_s` seconds or
+    number `pipeline_stream_batch_segments`, so a backend that produces one
+    segment at a time does not cost one translate and TTS round per segment.
+    """
+
+    def __init__(self, on_segments: SegmentCallback | None, audio_s: float | None):
+        self._on_segments = on_segments
+        self._audio_s = audio_s
+        self._sent = 0
+        self._held: list[dict] = []
+
+    def __call__(self, language: str, segments: list[dict]):
+        """Raw (run_whisper-style) segments, on the source timeline."""
+        if self._on_segments is None or not segments:
+            return
+        self._held.extend(_segment(seg) for seg in segments)
+        span = self._held[-1]["end"] - self._held[0]["start"]
+        if (
+            span < settings.pipeline_stream_batch_s
+            and len(self._held) < settings.pipeline_stream_batch_segments
+        ):
+            return
+        self._on_segments(language, self._held, self._audio_s)
+        self._sent += len(self._held)
+        self._held = []
+
+    def flush(self, result: dict):
+        """Send the result's segments that were not streamed, held ones included."""
+        self._held = []
+        rest = result["segments"][self._sent:]
+        if self._on_segments is not None and rest:
+            self._on_segments(result["language"], rest, self._audio_s)
+            self._sent += len(rest)
+
+
+def _chunk_s() -> float:
+    """Longest chunk: `vad_chunk_s`, capped to one window when batching."""
+    if settings.whisper_batching:
+        return min(settings.vad_chunk_s, WINDOW_S)
+    return settings.vad_chunk_s
+
+
+def _whisper_batcher(model_manager: ModelManager) -> MicroBatcher:
+    """
+    Cross-job batcher of 30 s windows, one decode per language (None lets
+    the backend detect it per window). `.run([samples], language)` returns
+    [{"language", "segments"}].
+    """
+    def run(windows: list, language: str | None) -> list[dict]:
+        with model_manager.whisper_replica() as model, thread_budget("whisper"):
+            return run_whisper_batch(model, windows, language)
+
+    return model_manager.get_whisper_batcher(
+        lambda: MicroBatcher(
+            "whisper",
+            run,
+            window_ms=settings.whisper_batch_window_ms,
+            max_items=settings.whisper_batch_size,
+            workers=settings.whisper_batch_workers,
+        )
+    )
+
+
+def _build_result(language: str, segments: list[dict]) -> dict:
+    duration = segments[-1]["end"] if segments else 0
+
+    return {
+        "language": language,
+        "duration": duration,
+        "segments": [_segment(seg) for seg in segments],
+    }
+
+
+def _segment(seg: dict) -> dict:
+    return {
+        "start": seg["start"],
+        "end": seg["end"],
+        "text": seg["text"].strip(),
+        "words": seg["words"],
+    }
+
+
+def _transcribe_chunked(
+    audio, src_lang: str | None, model_manager: ModelManager, emit: _Emitter,
+) -> dict:
+    """
+    Transcribe VAD chunks on several Whisper replicas at once. Silent
+    stretches are never decoded. The first chunk runs alone to detect the
+    language when none is given, so every chunk decodes in the same one.
+    Parallelism is `transcription_parallelism`, or the Whisper pool's target
+    size; each chunk gets an equal share of the whisper thread budget.
+    With `whisper_batching`, enough chunks are queued at once to fill the
+    batcher's batches instead.
+    """
+    chunks = plan_chunks(audio, _chunk_s())
+    if not chunks:
+        return _build_result(src_lang or "en", [])
+
+    first = _transcribe_chunk(audio, chunks[0], src_lang, model_manager, 1)
+    language = src_lang or first["language"]
+    segments = first["segments"]
+    emit(language, segments)
+
+    rest = chunks[1:]
+    if settings.whisper_batching:
+        parallel = settings.whisper_batch_size * settings.whisper_batch_workers
+    else:
+        parallel = (
+            settings.transcription_parallelism
+            or model_manager.whisper_pool_stats()["target_replicas"]
+        )
+    parallel = max(1, min(parallel, len(rest) or 1))
+    if rest:
+        with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="whisper-chunk") as pool:
+            results = pool.map(
+                lambda pieces: _transcribe_chunk(
+                    audio, pieces, language, model_manager, parallel
+                ),
+                rest,
+            )
+            # In chunk order, so each chunk streams once those before it are done
+            for result in results:
+                segments.extend(result["segments"])
+                emit(language, result["segments"])
+
+    speech_s = sum(e - s for pieces in chunks for s, e in pieces) / SAMPLE_RATE
+    print(
+        f"Transcribed {len(chunks)} VAD chunks ({speech_s:.0f}s of speech in "
+        f"{len(audio) / SAMPLE_RATE:.0f}s of audio)"
+        + (" through the Whisper batcher" if settings.whisper_batching
+           else f" on {parallel} replicas")
+    )
+    return _build_result(language, segments)
+
+
+def _transcribe_chunk(
+    audio, pieces: list[tuple[int, int]], language: str | None,
+    model_manager: ModelManager, parallel: int,
+) -> dict:
+    """Transcribe concatenated speech pieces; map timestamps back to the source."""
+    import numpy as np
+
+    samples = np.concatenate([audio[start:end] for start, end in pieces])
+    if settings.whisper_batching:
+        result = _whisper_batcher(model_manager).run([samples], language)[0]
+    else:
+        with model_manager.whisper_replica() as model, thread_budget("whisper", parallel):
+            result = run_whisper(model, samples, language)
+    return _map_to_source(result, pieces)
+
+
+def _map_to_source(result: dict, pieces: list[tuple[int, int]]) -> dict:
+    """Move a result decoded from concatenated `pieces` onto the source timeline."""
+    # (offset in chunk, offset in source, length), in seconds
+    spans = []
+    offset = 0
+    for start, end in pieces:
+        spans.append((offset / SAMPLE_RATE, start / SAMPLE_RATE, (end - start) / SAMPLE_RATE))
+        offset += end - start
+
+    segments = []
+    for seg in result["segments"]:
+        segments.append({
+            **seg,
+            "start": _to_source(seg["start"], spans),
+            "end": _to_source(seg["end"], spans),
+            "words": [
+                {
+                    **word,
+                    "start": _to_source(word["start"], spans),
+                    "end": _to_source(word["end"], spans),
+                }
+                for word in seg["words"]
+            ],
+        })
+    return {"language": result["language"], "segments": segments}
+
+
+def _to_source(t: float, spans: list[tuple[float, float, float]]) -> float:
+    """Map a time within a concatenated chunk to the source recording."""
+    for chunk_offset, source_offset, length in spans:
+        if t < chunk_offset + length:
+            return round(source_offset + max(0.0, t - chunk_offset), 2)
+    chunk_offset, source_offset, length = spans[-1]
+    return round(source_offset + min(t - chunk_offset, length), 2)
+
+
+def run_whisper(
+    model, audio, src_lang: str | None = None,
+    on_segment: Callable[[str, list[dict]], None] | None = None,
+) -> dict:
     """
-    model = model_manager.get_whisper()
+    One Whisper pass over a file path or 16 kHz float32 array with the
+    configured `transcription_backend`. Both backends return
+    {"language", "segments"}, each segment with start, end, text and
+    words ({"word", "start", "end", "probability"}). faster-whisper decodes
+    lazily and passes each segment to `on_segment` as it is produced;
+    openai-whisper does so per window of about 30 s of speech (arrays only).
+    """
+    backend = settings.transcription_backend
+    if backend == "openai":
+        if on_segment is not None and not isinstance(audio, str):
+            return _run_openai_windows(model, audio, src_lang, on_segment)
+        return _run_openai(model, audio, src_lang)
+    if backend == "faster-whisper":
+        return _run_faster_whisper(model, audio, src_lang, on_segment)
+    raise ValueError(f"Unknown transcription backend: {backend}")
+
 
+def _run_openai(model, audio, src_lang: str | None, **extra) -> dict:
     options = {
         "word_timestamps": True,
         "verbose": False,
+        **extra,
     }
     if src_lang:
         options["language"] = src_lang
 
-    with model_manager._whisper_use_lock:
-        result = model.transcribe(file_path, **options)
-
-    segments = result.get("segments", [])
-    duration = segments[-1]["end"] if segments else 0
-
+    result = model.transcribe(audio, **options)
     return {
         "language": result.get("language", "en"),
-        "duration": duration,
         "segments": [
             {
                 "start": seg["start"],
                 "end": seg["end"],
-                "text": seg["text"].strip(),
+                "text": seg["text"],
                 "words": seg.get("words", []),
             }
-            for seg in segments
+            for seg in result.get("segments", [])
         ],
     }
+
+
+def _run_openai_windows(model, audio, src_lang: str | None, on_segment) -> dict:
+    """
+    openai-whisper's transcribe has no per-segment hook, so for streaming
+    the audio is decoded one VAD-planned window at a time. Only the window's
+    speech pieces are passed in (transcribe computes the log-mel of its
+    whole input), and timestamps are mapped back like a VAD chunk's.
+    Windows end in silence, take the language of the first one, and get the
+    previous window's text as `initial_prompt`, standing in for
+    transcribe's conditioning on previous text.
+    """
+    import numpy as np
+
+    windows = plan_chunks(audio, WINDOW_S)
+    if len(windows) <= 1:
+        result = _run_openai(model, audio, src_lang)
+        on_segment(result["language"], result["segments"])
+        return result
+
+    language = src_lang
+    segments = []
+    prompt = None
+    for pieces in windows:
+        samples = np.concatenate([audio[start:end] for start, end in pieces])
+        result = _map_to_source(
+            _run_openai(model, samples, language, initial_prompt=prompt), pieces,
+        )
+        language = language or result["language"]
+        segments.extend(result["segments"])
+        on_segment(language, result["segments"])
+        prompt = "".join(seg["text"] for seg in result["segments"]) or prompt
+    return {"language": language, "segments": segments}
+
+
+def _run_faster_whisper(model, audio, src_lang: str | None, on_segment=None) -> dict:
+    """faster-whisper (CTranslate2) yields segments lazily; decode them all here."""
+    segments, info = model.transcribe(audio, language=src_lang, word_timestamps=True)
+    language = info.language or "en"
+    decoded = []
+    for seg in segments:
+        decoded.append({
+            "start": seg.start,
+            "end": seg.end,
+            "text": seg.text,
+            "words": [
+                {
+                    "word": word.word,
+                    "start": word.start,
+                    "end": word.end,
+                    "probability": word.probability,
+                }
+                for word in seg.words or []
+            ],
+        })
+        if on_segment is not None:
+            on_segment(language, decoded[-1:])
+    return {"language": language, "segments": decoded}
+
+
+def run_whisper_batch(model, windows: list, language: str | None = None) -> list[dict]:
+    """
+    Decode several 16 kHz float32 windows of at most 30 s in one batch with
+    the configured `transcription_backend`. Returns one run_whisper-style
+    result per window, with times relative to that window.
+    """
+    backend = settings.transcription_backend
+    if backend == "openai":
+        return _run_openai_batch(model, windows, language)
+    if backend == "faster-whisper":
+        return _run_faster_whisper_batch(model, windows, language)
+    raise ValueError(f"Unknown transcription backend: {backend}")
+
+
+def _run_openai_batch(model, windows: list, language: str | None) -> list[dict]:
+    """
+    One batched encoder + decoder pass over the stacked log-mel windows,
+    then segments are cut at the timestamp tokens and word timings aligned
+    per window, as model.transcribe does for a single window. Windows that
+    fail whisper's quality checks are redone with model.transcribe, which
+    retries at higher temperatures.
+    """
+    import torch
+    from whisper.audio import HOP_LENGTH, N_FRAMES, log_mel_spectrogram, pad_or_trim
+    from whisper.decoding import DecodingOptions, decode
+    from whisper.timing import add_word_timestamps
+    from whisper.tokenizer import get_tokenizer
+
+    fp16 = model.device.type == "cuda"
+    mels = torch.stack([
+        log_mel_spectrogram(pad_or_trim(samples), model.dims.n_mels) for samples in windows
+    ]).to(model.device)
+    if fp16:
+        mels = mels.half()
+    options = DecodingOptions(
+        task="transcribe", language=language, fp16=fp16, without_timestamps=False,
+    )
+    decoded = decode(model, mels, options)
+
+    # Seconds per timestamp token: two mel frames per encoder position
+    time_precision = (N_FRAMES // model.dims.n_audio_ctx) * HOP_LENGTH / SAMPLE_RATE
+    results = []
+    for samples, mel, result in zip(windows, mels, decoded):
+        if result.compression_ratio > 2.4 or result.avg_logprob < -1.0:
+            if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+                results.append({"language": result.language, "segments": []})
+            else:
+                results.append(_run_openai(model, samples, result.language))
+            continue
+
+        tokenizer = get_tokenizer(
+            model.is_multilingual, num_languages=model.num_languages,
+            language=result.language, task="transcribe",
+        )
+        duration = len(samples) / SAMPLE_RATE
+        segments = [
+            {
+                "seek": 0,
+                "start": start,
+                "end": min(end, duration),
+                "tokens": tokens,
+                "text": tokenizer.decode([t for t in tokens if t < tokenizer.eot]),
+            }
+            for start, end, tokens in _split_at_timestamps(
+                result.tokens, tokenizer.timestamp_begin, time_precision, duration
+            )
+        ]
+        if segments:
+            add_word_timestamps(
+                segments=segments, model=model, tokenizer=tokenizer, mel=mel,
+                num_frames=len(samples) // HOP_LENGTH, last_speech_timestamp=0.0,
+            )
+        results.append({
+            "language": result.language,
+            "segments": [
+                {
+                    "start": seg["start"],
+                    "end": seg["end"],
+                    "text": seg["text"],
+                    "words": seg.get("words", []),
+                }
+                for seg in segments
+            ],
+        })
+    return results
+
+
+def _split_at_timestamps(
+    tokens: list[int], timestamp_begin: int, precision: float, duration: float
+) -> list[tuple[float, float, list[int]]]:
+    """
+    (start, end, tokens) segments from one window's sampled tokens. As in
+    model.transcribe, a pair of consecutive timestamp tokens ends a segment.
+    """
+    def seconds(token: int) -> float:
+        return (token - timestamp_begin) * precision
+
+    is_ts = [token >= timestamp_begin for token in tokens]
+    cuts = [i for i in range(1, len(tokens)) if is_ts[i - 1] and is_ts[i]]
+    if len(tokens) >= 2 and is_ts[-1] and not is_ts[-2]:
+        cuts.append(len(tokens))  # single timestamp ending
+
+    if not cuts:
+        # No segment boundaries: one segment up to the last timestamp
+        timestamps = [t for t in tokens if t > timestamp_begin]
+        end = seconds(timestamps[-1]) if timestamps else duration
+        spans = [(0.0, end, tokens)]
+    else:
+        spans = []
+        last = 0
+        for cut in cuts + [len(tokens)]:
+            if cut <= last:
+                continue
+            piece = tokens[last:cut]
+            start = seconds(piece[0]) if is_ts[last] else (spans[-1][1] if spans else 0.0)
+            # Past the last cut: speech running to the end of the window
+            end = seconds(piece[-1]) if cut in cuts else duration
+            spans.append((start, end, piece))
+            last = cut
+
+    return [
+        (start, end, piece) for start, end, piece in spans
+        if any(token < timestamp_begin for token in piece)
+    ]
+
+
+def _run_faster_whisper_batch(model, windows: list, language: str | None) -> list[dict]:
+    """
+    faster-whisper's BatchedInferencePipeline over the windows laid end to
+    end, one clip per window, then segments are split back by clip. The
+    pipeline decodes in one language, so undetected windows are grouped by
+    their detected language first.
+    """
+    import numpy as np
+    from faster_whisper import BatchedInferencePipeline
+
+    if language is None:
+        by_language: dict[str, list[int]] = {}
+        for i, samples in enumerate(windows):
+            detected, _, _ = model.detect_language(samples)
+            by_language.setdefault(detected, []).append(i)
+        results: list[dict | None] = [None] * len(windows)
+        for detected, indices in by_language.items():
+            group = _run_faster_whisper_batch(model, [windows[i] for i in indices], detected)
+            for i, result in zip(indices, group):
+                results[i] = result
+        return results
+
+    offsets = np.cumsum([0] + [len(samples) for samples in windows])
+    clips = [{"start": int(s), "end": int(e)} for s, e in zip(offsets[:-1], offsets[1:])]
+    segments, _ = BatchedInferencePipeline(model=model).transcribe(
+        np.concatenate(windows), language=language, clip_timestamps=clips,
+        vad_filter=False, word_timestamps=True, without_timestamps=False,
+        batch_size=len(windows),
+    )
+
+    results = [{"language": language, "segments": []} for _ in windows]
+    bounds = offsets / SAMPLE_RATE
+    for seg in segments:
+        i = min(int(np.searchsorted(bounds, seg.start, side="right")) - 1, len(windows) - 1)
+        shift = bounds[i]
+        results[i]["segments"].append({
+            "start": seg.start - shift,
+            "end": seg.end - shift,
+            "text": seg.text,
+            "words": [
+                {
+                    "word": word.word,
+                    "start": word.start - shift,
+                    "end": word.end - shift,
+                    "probability": word.probability,
+                }
+                for word in seg.words or []
+            ],
+        })
+    return results
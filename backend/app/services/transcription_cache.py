@@ -0,0 +1,78 @@
+"""
+Transcription cache: an in-process LRU in front of a persistent SQLite tier
+(see two_tier_cache.py).
+
+Entries are keyed by a hash of the decoded 16 kHz mono audio together with
+everything that changes Whisper's output (model size, backend, compute type,
+language option, word timestamps, VAD chunking and batching). The same media
+run through STT and then dubbing, re-uploaded, or re-encoded into another
+container maps to the same key and skips Whisper entirely.
+"""
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from app.config import settings
+from app.services.two_tier_cache import TwoTierCache
+
+
+def make_key(audio, src_lang: str | None, word_timestamps: bool = True) -> str:
+    """Key for a decoded float32 audio array and the current transcription settings."""
+    digest = hashlib.sha256(memoryview(audio).cast("B")).hexdigest()
+    compute = (
+        settings.faster_whisper_compute_type
+        if settings.transcription_backend == "faster-whisper" else "fp32"
+    )
+    vad = (
+        f"vad{settings.vad_chunk_s}/{settings.vad_min_silence_ms}/{settings.vad_threshold_db}"
+        if settings.vad_chunking or settings.whisper_batching else "novad"
+    )
+    if settings.whisper_batching:
+        vad += "/batched"
+    return "|".join([
+        settings.transcription_backend,
+        settings.whisper_model_size,
+        compute,
+        src_lang or "auto",
+        "words" if word_timestamps else "nowords",
+        vad,
+        digest,
+    ])
+
+
+class TranscriptionCache(TwoTierCache):
+    """Audio keys to transcription results, stored as JSON in the transcriptions table."""
+
+    def __init__(self, db_path: Path, memory_entries: int, max_entries: int):
+        super().__init__(
+            db_path, "transcriptions", memory_entries, max_entries, column="result",
+        )
+
+    def get(self, key: str) -> dict | None:
+        # Decoded per hit, so callers never share a mutable dict
+        data = super().get(key)
+        return json.loads(data) if data is not None else None
+
+    def put(self, key: str, result: dict):
+        super().put(key, json.dumps(result, ensure_ascii=False))
+
+
+_cache: TranscriptionCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_transcription_cache() -> TranscriptionCache | None:
+    """Process-wide cache, or None when disabled in settings."""
+    global _cache
+    if not settings.transcription_cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TranscriptionCache(
+                    settings.transcription_cache_path,
+                    memory_entries=settings.transcription_cache_memory_entries,
+                    max_entries=settings.transcription_cache_max_entries,
+                )
+    return _cache
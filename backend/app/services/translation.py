@@ -1,123 +1,632 @@
 import re
+import time
+from app.config import settings
 from app.models.model_manager import ModelManager
+from app.models.schemas import DecodingProfile
+from app.models.translation_router import get_throughput_tracker
+from app.services.translation_batcher import TranslationBatcher
+from app.services.translation_cache import get_translation_cache, make_key
 from app.utils.language_map import LANGUAGES, needs_pivot, get_pivot_chain
+from app.utils.thread_budget import thread_budget
+
+
+# Named decoding profiles. max_new_tokens is scaled from the longest input
+# in each bucket: int(length_ratio * input_tokens) + 10, capped at 512.
+# Keyed by the DecodingProfile values the API accepts.
+DECODING_PROFILES = {
+    DecodingProfile.FAST.value: {"num_beams": 1, "length_ratio": 1.5},
+    DecodingProfile.BALANCED.value: {
+        "num_beams": 4, "length_ratio": 2.0, "early_stopping": True,
+    },
+    DecodingProfile.QUALITY.value: {
+        "num_beams": 6, "length_ratio": 3.0, "early_stopping": True,
+    },
+}
+
+
+def resolve_profile(profile: str | None) -> str:
+    """Fall back to the configured default and reject unknown names."""
+    profile = profile or settings.default_decoding_profile
+    if profile not in DECODING_PROFILES:
+        raise ValueError(f"Unknown decoding profile: {profile}")
+    return profile
 
 
 def translate_text(
-    text: str, src: str, tgt: str, model_manager: ModelManager
+    text: str, src: str, tgt: str, model_manager: ModelManager,
+    use_cache: bool = True, profile: str | None = None,
 ) -> str:
     """
     Translate text, handling pivot through English if needed.
     Splits long text into chunks to respect model's 512-token limit.
     """
+    return translate_batch([text], src, tgt, model_manager, use_cache, profile)[0]
+
+
+def translate_batch(
+    texts: list[str], src: str, tgt: str, model_manager: ModelManager,
+    use_cache: bool = True, profile: str | None = None,
+) -> list[str]:
+    """
+    Translate many strings at once, handling pivot through English if needed.
+    Chunks from all texts are sorted by length and generated in buckets,
+    so a single model.generate call covers many segments with little padding.
+    Each leg goes through the translation memory unless `use_cache` is False.
+    `profile` names an entry in DECODING_PROFILES (default from settings).
+    Returns translations in the same order as `texts`.
+    """
     if src == tgt:
-        return text
+        return list(texts)
 
+    profile = resolve_profile(profile)
     chain = get_pivot_chain(src, tgt)
-    result = text
+    results = list(texts)
     for pair_src, pair_tgt in chain:
-        result = _translate_single(result, pair_src, pair_tgt, model_manager)
-    return result
+        results = _translate_batch_single(
+            results, pair_src, pair_tgt, model_manager, use_cache, profile
+        )
+    return results
 
 
-def _translate_single(
-    text: str, src: str, tgt: str, model_manager: ModelManager
-) -> str:
-    model, tokenizer, engine = model_manager.get_translation_model(src, tgt)
+def translate_multi(
+    texts: list[str], src: str, tgt_langs: list[str], model_manager: ModelManager,
+    use_cache: bool = True, profile: str | None = None,
+) -> dict[str, list[str]]:
+    """
+    Translate the same texts into several target languages.
+    Targets that route directly to NLLB share one tokenize + encoder pass per
+    chunk and only decode once per target. Targets that pivot through English
+    share a single src→en leg, whose output is then fanned out like a direct
+    multi-target job from English. Returns {target_language: translations in
+    the order of `texts`}.
+    """
+    profile = resolve_profile(profile)
+    results: dict[str, list[str]] = {}
+    nllb_targets = []
+    pivot_targets = []
+    for tgt in dict.fromkeys(tgt_langs):
+        if tgt == src:
+            results[tgt] = list(texts)
+            continue
+        if len(get_pivot_chain(src, tgt)) > 1:
+            pivot_targets.append(tgt)
+            continue
+        _, _, engine = model_manager.get_translation_model(src, tgt)
+        if engine == "nllb":
+            nllb_targets.append(tgt)
+            continue
+        results[tgt] = translate_batch(
+            texts, src, tgt, model_manager, use_cache, profile
+        )
+
+    if nllb_targets:
+        with model_manager.use_translation_model(src, nllb_targets[0]) as (
+            model, tokenizer, _,
+        ):
+            results.update(_translate_nllb_targets(
+                texts, src, nllb_targets, model, tokenizer, model_manager,
+                use_cache, profile,
+            ))
+
+    if pivot_targets:
+        # English may already be a requested target; otherwise compute it once
+        if "en" in results:
+            english = results["en"]
+        else:
+            english = translate_batch(
+                texts, src, "en", model_manager, use_cache, profile
+            )
+        results.update(translate_multi(
+            english, "en", pivot_targets, model_manager, use_cache, profile
+        ))
+
+    return {tgt: results[tgt] for tgt in tgt_langs}
+
+
+def translate_and_route(
+    fn, texts: list[str], src: str, tgt: str | list[str],
+    model_manager: ModelManager, **kwargs,
+):
+    """
+    Run translate_batch or translate_multi and return (result, routes),
+    where routes come from translation_routes. Both run in the same call, so
+    with inference workers the routes are those of the worker that translated.
+    """
+    result = fn(texts, src, tgt, model_manager, **kwargs)
+    tgt_langs = tgt if isinstance(tgt, list) else [tgt]
+    return result, translation_routes(src, tgt_langs, model_manager)
+
+
+def translation_routes(
+    src: str, tgt_langs: list[str], model_manager: ModelManager
+) -> dict[str, list[dict]]:
+    """Engine, model and routing reason for every leg of every target."""
+    routes = {}
+    for tgt in dict.fromkeys(tgt_langs):
+        chain = [] if tgt == src else get_pivot_chain(src, tgt)
+        routes[tgt] = [
+            model_manager.translation_route(a, b) or {"leg": f"{a}->{b}"}
+            for a, b in chain
+        ]
+    return routes
+
+
+def plan_translation(
+    src: str, tgt_langs: list[str], routes: dict[str, list[dict]] | None = None,
+) -> dict[str, dict]:
+    """
+    Describe how translate_multi routes each target, for the job results:
+    the legs it runs, the pivot language (if any) and whether that pivot leg
+    is shared with other targets of the same job. With `routes` (from
+    translate_and_route), each target also lists the engine chosen per leg.
+    """
+    pivot_targets = [
+        tgt for tgt in dict.fromkeys(tgt_langs)
+        if tgt != src and len(get_pivot_chain(src, tgt)) > 1
+    ]
+    shared = len(pivot_targets) > 1 or (bool(pivot_targets) and "en" in tgt_langs)
+    plan = {}
+    for tgt in tgt_langs:
+        chain = [] if tgt == src else get_pivot_chain(src, tgt)
+        plan[tgt] = {
+            "legs": [f"{a}->{b}" for a, b in chain],
+            "pivot": "en" if len(chain) > 1 else None,
+            "shared_pivot": tgt in pivot_targets and shared,
+        }
+        if routes is not None:
+            plan[tgt]["routes"] = routes.get(tgt, [])
+    return plan
+
+
+def _translate_nllb_targets(
+    texts: list[str], src: str, tgts: list[str], model, tokenizer,
+    model_manager: ModelManager, use_cache: bool, profile: str,
+) -> dict[str, list[str]]:
+    cache = get_translation_cache() if use_cache else None
+    model_name = getattr(model, "name_or_path", "nllb")
+    keys = {
+        tgt: [make_key("nllb", model_name, profile, src, tgt, text) for text in texts]
+        for tgt in tgts
+    }
+    hits: dict[str, str] = {}
+    if cache is not None:
+        hits = cache.get_many([
+            key for tgt in tgts
+            for key, text in zip(keys[tgt], texts) if text.strip()
+        ])
+
+    # Encode each distinct text once if any target still needs it
+    missing: dict[str, None] = {}
+    for i, text in enumerate(texts):
+        if text.strip() and any(keys[tgt][i] not in hits for tgt in tgts):
+            missing.setdefault(text)
+    if missing:
+        translated = _translate_uncached(
+            list(missing), src, tuple(tgts), model, tokenizer, "nllb",
+            model_manager, profile,
+        )
+        by_text = dict(zip(missing, translated))
+        fresh = {}
+        for i, text in enumerate(texts):
+            if text in by_text:
+                for j, tgt in enumerate(tgts):
+                    fresh[keys[tgt][i]] = by_text[text][j]
+        if cache is not None:
+            cache.put_many(fresh)
+        hits.update(fresh)
+
+    return {
+        tgt: [hits.get(key, text) for key, text in zip(keys[tgt], texts)]
+        for tgt in tgts
+    }
+
+
+def _translate_batch_single(
+    texts: list[str], src: str, tgt: str, model_manager: ModelManager,
+    use_cache: bool, profile: str,
+) -> list[str]:
+    with model_manager.use_translation_model(src, tgt) as (model, tokenizer, engine):
+        return _translate_with_cache(
+            texts, src, tgt, model, tokenizer, engine, model_manager,
+            use_cache, profile,
+        )
+
+
+def _translate_with_cache(
+    texts: list[str], src: str, tgt: str, model, tokenizer, engine: str,
+    model_manager: ModelManager, use_cache: bool, profile: str,
+) -> list[str]:
+    cache = get_translation_cache() if use_cache else None
+    if cache is None:
+        return _translate_uncached(
+            texts, src, tgt, model, tokenizer, engine, model_manager, profile
+        )
+
+    model_name = getattr(model, "name_or_path", engine)
+    keys = [make_key(engine, model_name, profile, src, tgt, text) for text in texts]
+    hits = cache.get_many([key for key, text in zip(keys, texts) if text.strip()])
+
+    # Translate each distinct missing text once, then fill every occurrence
+    misses: dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if text.strip() and key not in hits:
+            misses.setdefault(key, text)
+    if misses:
+        translated = _translate_uncached(
+            list(misses.values()), src, tgt, model, tokenizer, engine,
+            model_manager, profile,
+        )
+        fresh = dict(zip(misses.keys(), translated))
+        cache.put_many(fresh)
+        hits.update(fresh)
+
+    return [hits.get(key, text) for key, text in zip(keys, texts)]
+
+
+def _translate_uncached(
+    texts: list[str], src: str, tgt: str | tuple[str, ...], model, tokenizer,
+    engine: str, model_manager: ModelManager, profile: str,
+) -> list:
+    """
+    Chunk, generate and reassemble. With a tuple of targets (NLLB only),
+    each result is a tuple of translations aligned with `tgt`.
+    """
+    # Split every text into chunks, remembering which text each chunk came from
+    chunks = []
+    owners = []
+    for i, text in enumerate(texts):
+        if not text.strip():
+            continue
+        for chunk in _split_text_into_chunks(text, tokenizer, max_tokens=512):
+            chunks.append(chunk)
+            owners.append(i)
+
+    if not chunks:
+        if isinstance(tgt, tuple):
+            return [tuple(text for _ in tgt) for text in texts]
+        return list(texts)
+
+    if settings.translation_batching:
+        batcher = _get_batcher(model_manager, model, tokenizer, engine)
+        translated = batcher.translate(chunks, src, tgt, profile)
+    else:
+        translated = _run_engine(chunks, src, tgt, profile, model, tokenizer, engine)
+
+    if isinstance(tgt, tuple):
+        columns = [
+            _join_chunks(texts, owners, [row[j] for row in translated])
+            for j in range(len(tgt))
+        ]
+        return list(zip(*columns))
+    return _join_chunks(texts, owners, translated)
+
+
+def _join_chunks(
+    texts: list[str], owners: list[int], translated: list[str]
+) -> list[str]:
+    pieces: list[list[str]] = [[] for _ in texts]
+    for owner, chunk in zip(owners, translated):
+        pieces[owner].append(chunk)
+
+    return [
+        _chunk_separator("".join(parts)).join(parts) if parts else text
+        for parts, text in zip(pieces, texts)
+    ]
+
 
+def _get_batcher(
+    model_manager: ModelManager, model, tokenizer, engine: str
+) -> TranslationBatcher:
+    """Shared cross-job batcher for this model (one per loaded model)."""
+    return model_manager.get_translation_batcher(
+        model,
+        lambda: TranslationBatcher(
+            name=getattr(model, "name_or_path", engine),
+            run_fn=lambda chunks, src, tgt, profile: _run_engine(
+                chunks, src, tgt, profile, model, tokenizer, engine
+            ),
+            window_ms=settings.translation_batch_window_ms,
+            max_chunks=settings.translation_batch_max_chunks,
+            workers=settings.translation_concurrency,
+        ),
+    )
+
+
+def _run_engine(
+    chunks: list[str], src: str, tgt: str | tuple[str, ...], profile: str,
+    model, tokenizer, engine: str,
+) -> list:
+    started = time.perf_counter()
+    with thread_budget("mt"):
+        translated = _dispatch_engine(chunks, src, tgt, profile, model, tokenizer, engine)
+    # Feed the routing planner; multi-target NLLB output counts for every target
+    elapsed = time.perf_counter() - started
+    tgts = tgt if isinstance(tgt, tuple) else (tgt,)
+    chars = sum(len(chunk) for chunk in chunks) * len(tgts)
+    tracker = get_throughput_tracker()
+    for one_tgt in tgts:
+        tracker.record(engine, src, one_tgt, chars, elapsed)
+    return translated
+
+
+def _dispatch_engine(
+    chunks: list[str], src: str, tgt: str | tuple[str, ...], profile: str,
+    model, tokenizer, engine: str,
+) -> list:
+    if isinstance(tgt, tuple):
+        if engine != "nllb":
+            raise ValueError(f"Multi-target decoding is not supported for {engine}")
+        return _translate_nllb_multi(chunks, src, tgt, model, tokenizer, profile)
     if engine == "opus":
-        return _translate_opus(text, model, tokenizer)
+        return _translate_opus(chunks, model, tokenizer, profile)
     elif engine == "nllb":
-        return _translate_nllb(text, src, tgt, model, tokenizer)
+        return _translate_nllb(chunks, src, tgt, model, tokenizer, profile)
     elif engine == "mbart":
-        return _translate_mbart(text, src, tgt, model, tokenizer)
+        return _translate_mbart(chunks, src, tgt, model, tokenizer, profile)
     else:
         raise ValueError(f"Unknown translation engine: {engine}")
 
 
-def _translate_opus(text: str, model, tokenizer) -> str:
+def _translate_opus(
+    chunks: list[str], model, tokenizer, profile: str
+) -> list[str]:
     """Translate using Opus-MT (MarianMT)."""
-    chunks = _split_text_into_chunks(text, tokenizer, max_tokens=512)
-    translated_chunks = []
-
-    for chunk in chunks:
-        inputs = tokenizer(
-            chunk, return_tensors="pt", padding=True, truncation=True, max_length=512
-        )
-        output = model.generate(**inputs)
-        translated = tokenizer.decode(output[0], skip_special_tokens=True)
-        translated_chunks.append(translated)
-
-    return " ".join(translated_chunks)
+    return _generate_bucketed(chunks, model, tokenizer, profile)
 
 
-def _translate_nllb(text: str, src: str, tgt: str, model, tokenizer) -> str:
+def _translate_nllb(
+    chunks: list[str], src: str, tgt: str, model, tokenizer, profile: str
+) -> list[str]:
     """Translate using NLLB-200."""
     src_nllb = LANGUAGES[src]["nllb_code"]
     tgt_nllb = LANGUAGES[tgt]["nllb_code"]
-    tokenizer.src_lang = src_nllb
 
-    chunks = _split_text_into_chunks(text, tokenizer, max_tokens=512)
-    translated_chunks = []
+    tgt_lang_id = tokenizer.convert_tokens_to_ids(tgt_nllb)
+    return _generate_bucketed(
+        chunks, model, tokenizer, profile, src_lang_code=src_nllb,
+        forced_bos_token_id=tgt_lang_id,
+    )
 
-    for chunk in chunks:
-        inputs = tokenizer(
-            chunk, return_tensors="pt", padding=True, truncation=True, max_length=512
-        )
-        tgt_lang_id = tokenizer.convert_tokens_to_ids(tgt_nllb)
-        output = model.generate(
-            **inputs, forced_bos_token_id=tgt_lang_id, max_length=512
-        )
-        translated = tokenizer.decode(output[0], skip_special_tokens=True)
-        translated_chunks.append(translated)
 
-    return " ".join(translated_chunks)
+def _translate_nllb_multi(
+    chunks: list[str], src: str, tgts: tuple[str, ...], model, tokenizer,
+    profile: str,
+) -> list[tuple[str, ...]]:
+    """
+    Translate with NLLB-200 into several targets, running the encoder once
+    per bucket and reusing its outputs for each target's forced-BOS decode.
+    """
+    import torch
+    from transformers.modeling_outputs import BaseModelOutput
 
+    src_nllb = LANGUAGES[src]["nllb_code"]
+    tgt_ids = [
+        tokenizer.convert_tokens_to_ids(LANGUAGES[tgt]["nllb_code"]) for tgt in tgts
+    ]
 
-def _translate_mbart(text: str, src: str, tgt: str, model, tokenizer) -> str:
+    batch_size = max(1, settings.translation_batch_size)
+    order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
+    outputs: list[list[str]] = [[""] * len(tgts) for _ in chunks]
+
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        inputs = _encode_batch([chunks[i] for i in bucket], tokenizer, src_nllb)
+        with torch.no_grad():
+            encoded = model.get_encoder()(**inputs)
+
+        for j, tgt_lang_id in enumerate(tgt_ids):
+            # generate() expands encoder outputs in place for beam search,
+            # so every target gets its own wrapper around the shared tensor
+            output = model.generate(
+                encoder_outputs=BaseModelOutput(
+                    last_hidden_state=encoded.last_hidden_state
+                ),
+                attention_mask=inputs["attention_mask"],
+                forced_bos_token_id=tgt_lang_id,
+                **_decoding_kwargs(profile, inputs),
+            )
+            decoded = tokenizer.batch_decode(output, skip_special_tokens=True)
+            for i, translated in zip(bucket, decoded):
+                outputs[i][j] = translated
+
+    return [tuple(row) for row in outputs]
+
+
+def _translate_mbart(
+    chunks: list[str], src: str, tgt: str, model, tokenizer, profile: str
+) -> list[str]:
     """Translate using mBART-50."""
     src_mbart = LANGUAGES[src]["mbart_code"]
     tgt_mbart = LANGUAGES[tgt]["mbart_code"]
-    tokenizer.src_lang = src_mbart
 
-    chunks = _split_text_into_chunks(text, tokenizer, max_tokens=512)
-    translated_chunks = []
+    return _generate_bucketed(
+        chunks, model, tokenizer, profile, src_lang_code=src_mbart,
+        forced_bos_token_id=tokenizer.convert_tokens_to_ids(tgt_mbart),
+    )
 
-    for chunk in chunks:
-        inputs = tokenizer(
-            chunk, return_tensors="pt", padding=True, truncation=True, max_length=512
-        )
+
+def _generate_bucketed(
+    chunks: list[str], model, tokenizer, profile: str,
+    src_lang_code: str | None = None, **generate_kwargs
+) -> list[str]:
+    """
+    Run model.generate over length-sorted buckets of chunks.
+    Sorting keeps similarly sized inputs together so padding stays low.
+    `src_lang_code` is the NLLB/mBART source language token.
+    """
+    batch_size = max(1, settings.translation_batch_size)
+    order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
+    outputs = [""] * len(chunks)
+
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        inputs = _encode_batch([chunks[i] for i in bucket], tokenizer, src_lang_code)
         output = model.generate(
-            **inputs, forced_bos_token_id=tokenizer.lang_code_to_id[tgt_mbart]
+            **inputs, **generate_kwargs, **_decoding_kwargs(profile, inputs)
         )
-        translated = tokenizer.decode(output[0], skip_special_tokens=True)
-        translated_chunks.append(translated)
+        decoded = tokenizer.batch_decode(output, skip_special_tokens=True)
+        for i, translated in zip(bucket, decoded):
+            outputs[i] = translated
+
+    return outputs
+
 
-    return " ".join(translated_chunks)
+def _encode_batch(
+    texts: list[str], tokenizer, src_lang_code: str | None = None,
+    max_length: int = 512,
+) -> dict:
+    """
+    Tokenize a bucket without touching shared tokenizer state, so one cached
+    tokenizer can serve concurrent jobs. Setting `tokenizer.src_lang`, or
+    switching padding/truncation on a fast tokenizer, mutates it for every
+    thread. Instead the plain token ids are fetched with the same call
+    _token_counts uses. The source language and </s> tokens are added here,
+    then the rows are truncated and right-padded in Python.
+    """
+    import torch
+
+    prefix, suffix = _special_ids(tokenizer, src_lang_code)
+    budget = max_length - len(prefix) - len(suffix)
+    rows = [
+        prefix + ids[:budget] + suffix
+        for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]
+    ]
+    width = max(len(row) for row in rows)
+    pad_id = tokenizer.pad_token_id
+    return {
+        "input_ids": torch.tensor(
+            [row + [pad_id] * (width - len(row)) for row in rows]
+        ),
+        "attention_mask": torch.tensor(
+            [[1] * len(row) + [0] * (width - len(row)) for row in rows]
+        ),
+    }
+
+
+def _special_ids(tokenizer, src_lang_code: str | None) -> tuple[list[int], list[int]]:
+    """
+    Prefix and suffix ids the tokenizer would add itself: `</s>` for Marian,
+    `<lang> ... </s>` for NLLB and mBART-50 (`... </s> <lang>` for NLLB's
+    legacy_behaviour).
+    """
+    eos = [tokenizer.eos_token_id]
+    if src_lang_code is None:
+        return [], eos
+    lang = [tokenizer.convert_tokens_to_ids(src_lang_code)]
+    if getattr(tokenizer, "legacy_behaviour", False):
+        return [], eos + lang
+    return lang, eos
+
+
+def _decoding_kwargs(profile: str, inputs) -> dict:
+    """generate() arguments for a profile, sized to this bucket's inputs."""
+    config = DECODING_PROFILES[profile]
+    input_tokens = len(inputs["input_ids"][0])
+    kwargs = {
+        "num_beams": config["num_beams"],
+        "max_new_tokens": min(512, int(config["length_ratio"] * input_tokens) + 10),
+    }
+    if config["num_beams"] > 1 and config.get("early_stopping"):
+        kwargs["early_stopping"] = True
+    return kwargs
+
+
+# Thai, Lao, Myanmar, Khmer, kana and Han: written without spaces between words
+_UNSPACED_SCRIPT = re.compile(
+    r"[\u0e00-\u0eff\u1000-\u109f\u1780-\u17ff\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff]"
+)
+
+
+def _chunk_separator(text: str) -> str:
+    """
+    How to rejoin pieces of `text`: "" when it is mostly unspaced script,
+    counting each unspaced character against each word in any other script.
+    """
+    unspaced = len(_UNSPACED_SCRIPT.findall(text))
+    words = len(re.findall(r"[^\W\d_]+", _UNSPACED_SCRIPT.sub(" ", text)))
+    return "" if unspaced and unspaced >= words else " "
 
 
 def _split_text_into_chunks(
     text: str, tokenizer, max_tokens: int = 512
 ) -> list[str]:
-    """Split text at sentence boundaries to keep each chunk under max_tokens."""
-    sentences = re.split(r"(?<=[.!?])\s+", text)
+    """
+    Split text at sentence boundaries to keep each chunk under max_tokens.
+    Sentences are tokenized once in a single batch call and packed by summing
+    their token counts. A sentence that alone exceeds the limit is split at
+    clause, then word boundaries, then into character windows, instead of
+    being truncated by the model. CJK full-width punctuation counts as a
+    boundary without a following space, and pieces of text in a script
+    written without spaces are rejoined without one.
+    """
+    sentences = [s for s in re.split(r"(?<=[.!?])\s+|(?<=[。！？])", text) if s]
     if not sentences:
         return [text]
 
-    chunks = []
-    current_chunk = ""
-
-    for sentence in sentences:
-        candidate = (current_chunk + " " + sentence).strip() if current_chunk else sentence
-        token_count = len(tokenizer.encode(candidate))
+    # Leave room for the special tokens each engine adds (lang code, </s>)
+    budget = max_tokens - 4
 
-        if token_count > max_tokens and current_chunk:
-            chunks.append(current_chunk)
-            current_chunk = sentence
+    pieces: list[tuple[str, int]] = []
+    for sentence, count in zip(sentences, _token_counts(sentences, tokenizer)):
+        if count > budget:
+            pieces.extend(_split_oversize_sentence(sentence, tokenizer, budget))
         else:
-            current_chunk = candidate
+            pieces.append((sentence, count))
 
-    if current_chunk:
-        chunks.append(current_chunk)
+    separator = _chunk_separator(text)
+    chunks = []
+    current: list[str] = []
+    current_tokens = 0
+    for piece, count in pieces:
+        if current and current_tokens + count > budget:
+            chunks.append(separator.join(current))
+            current = []
+            current_tokens = 0
+        current.append(piece)
+        current_tokens += count
+
+    if current:
+        chunks.append(separator.join(current))
 
     return chunks if chunks else [text]
+
+
+def _split_oversize_sentence(
+    sentence: str, tokenizer, budget: int
+) -> list[tuple[str, int]]:
+    """Break one over-long sentence into clause or word pieces with token counts."""
+    clauses = [c for c in re.split(r"(?<=[,;:])\s+|(?<=[，；：、])", sentence) if c]
+    pieces = []
+    for clause, count in zip(clauses, _token_counts(clauses, tokenizer)):
+        if count <= budget:
+            pieces.append((clause, count))
+            continue
+        words = clause.split()
+        for word, word_count in zip(words, _token_counts(words, tokenizer)):
+            if word_count <= budget:
+                pieces.append((word, word_count))
+            else:
+                pieces.extend(_split_by_characters(word, word_count, tokenizer, budget))
+    return pieces
+
+
+def _split_by_characters(
+    text: str, count: int, tokenizer, budget: int
+) -> list[tuple[str, int]]:
+    """
+    Last resort for text with no usable boundary, such as unpunctuated CJK:
+    fixed-size character windows, shrunk until every window fits the budget.
+    """
+    size = max(1, len(text) * budget // count)
+    while True:
+        parts = [text[i:i + size] for i in range(0, len(text), size)]
+        counts = _token_counts(parts, tokenizer)
+        if size == 1 or max(counts) <= budget:
+            return list(zip(parts, counts))
+        size = max(1, min(size - 1, size * budget // max(counts)))
+
+
+def _token_counts(texts: list[str], tokenizer) -> list[int]:
+    """Token count per string, from one batched tokenizer call."""
+    encoded = tokenizer(texts, add_special_tokens=False)["input_ids"]
+    return [len(ids) for ids in encoded]
@@ -0,0 +1,202 @@
+"""
+Cross-job dynamic micro-batching.
+
+`MicroBatcher` runs `workers` background threads (one by default). Jobs
+submit lists of items and block on futures; a free thread gathers whatever
+arrives within a short window, groups it with `key_fn` and runs each group
+as one batch. With more than one worker, batches generate concurrently.
+
+Every loaded translation model gets a `TranslationBatcher`, which groups
+chunks per language pair and decoding profile. The cross-job Whisper
+batcher is a plain `MicroBatcher` over 30 s windows, grouped per language.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Hashable
+
+
+@dataclass
+class _Request:
+    items: list
+    args: tuple
+    future: Future = field(default_factory=Future)
+    submitted_at: float = field(default_factory=time.monotonic)
+
+
+class MicroBatcher:
+    """
+    Collects requests from all running jobs. Requests whose
+    `key_fn(*args)` match are merged: `run_fn(items, *args)` gets their
+    items concatenated and must return one result per item, in order.
+    By default requests group by their exact `args`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run_fn: Callable[..., list],
+        window_ms: int,
+        max_items: int,
+        workers: int = 1,
+        key_fn: Callable[..., Hashable] | None = None,
+    ):
+        self.name = name
+        self._run_fn = run_fn
+        self._key_fn = key_fn or (lambda *args: args)
+        self._window = window_ms / 1000.0
+        self._max_items = max(1, max_items)
+        self._queue: queue.Queue[_Request | None] = queue.Queue()
+        self._pending_items = 0
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._batches = 0
+        self._batched_items = 0
+        self._max_batch = 0
+        self._last_batch = 0
+        self._total_wait = 0.0
+        self._workers = max(1, workers)
+        self._alive = self._workers
+        self._threads = [
+            threading.Thread(
+                target=self._run, name=f"batcher-{name}-{i}", daemon=True
+            )
+            for i in range(self._workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, items: list, *args) -> Future:
+        """Queue items; the future resolves to their results, in order."""
+        request = _Request(list(items), args)
+        with self._stats_lock:
+            self._pending_items += len(request.items)
+        self._queue.put(request)
+        return request.future
+
+    def run(self, items: list, *args) -> list:
+        """Blocking helper for executor threads."""
+        return self.submit(items, *args).result()
+
+    def stop(self):
+        # One sentinel per worker; each worker consumes exactly one
+        for _ in range(self._workers):
+            self._queue.put(None)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "model": self.name,
+                "workers": self._workers,
+                "queue_depth": self._pending_items,
+                "requests": self._requests,
+                "batches": self._batches,
+                "avg_batch_size": (
+                    self._batched_items / self._batches if self._batches else 0.0
+                ),
+                "max_batch_size": self._max_batch,
+                "last_batch_size": self._last_batch,
+                "avg_wait_ms": (
+                    1000 * self._total_wait / self._requests if self._requests else 0.0
+                ),
+            }
+
+    def _collect(self, first: _Request) -> tuple[list[_Request], bool]:
+        """Gather requests until the window closes or the batch is full."""
+        batch = [first]
+        size = len(first.items)
+        deadline = time.monotonic() + self._window
+        while size < self._max_items:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                return batch, True
+            batch.append(request)
+            size += len(request.items)
+        return batch, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+            batch, stopping = self._collect(first)
+
+            groups: dict[Hashable, list[_Request]] = {}
+            for request in batch:
+                groups.setdefault(self._key_fn(*request.args), []).append(request)
+
+            started = time.monotonic()
+            for requests in groups.values():
+                items = [item for r in requests for item in r.items]
+                try:
+                    results = self._run_fn(items, *requests[0].args)
+                except Exception as e:
+                    for r in requests:
+                        r.future.set_exception(e)
+                else:
+                    offset = 0
+                    for r in requests:
+                        r.future.set_result(results[offset:offset + len(r.items)])
+                        offset += len(r.items)
+                self._record(requests, len(items), started)
+
+        with self._stats_lock:
+            self._alive -= 1
+            if self._alive:
+                return
+
+        # Last worker out: fail anything that slipped in after stop()
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request.future.set_exception(
+                    RuntimeError(f"Batcher {self.name} stopped")
+                )
+
+    def _record(self, requests: list[_Request], size: int, started: float):
+        with self._stats_lock:
+            self._pending_items -= size
+            self._requests += len(requests)
+            self._batches += 1
+            self._batched_items += size
+            self._max_batch = max(self._max_batch, size)
+            self._last_batch = size
+            self._total_wait += sum(started - r.submitted_at for r in requests)
+
+
+class TranslationBatcher(MicroBatcher):
+    """
+    Collects translation requests from all running jobs for one model.
+    `run_fn(chunks, src, tgt, profile)` does the actual generate and must return
+    one result per chunk, in order. `tgt` may be a tuple of languages for
+    engines that decode several targets from one encoder pass. Chunks are
+    batched per language pair and decoding profile.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run_fn: Callable[[list[str], str, str | tuple[str, ...], str], list],
+        window_ms: int,
+        max_chunks: int,
+        workers: int = 1,
+    ):
+        super().__init__(name, run_fn, window_ms, max_chunks, workers)
+
+    def translate(
+        self, chunks: list[str], src: str, tgt: str | tuple[str, ...], profile: str
+    ) -> list:
+        """Blocking helper for executor threads."""
+        return self.run(chunks, src, tgt, profile)
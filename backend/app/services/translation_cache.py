@@ -0,0 +1,57 @@
+"""
+Translation memory: an in-process LRU in front of a persistent SQLite tier
+(see two_tier_cache.py).
+
+Entries are keyed by engine, inference backend (fp32/int8), model name,
+decoding profile, language pair and a hash of the whitespace-normalized source text, so repeated headers,
+lyric lines, OCR labels and re-submitted files skip the model entirely.
+"""
+import hashlib
+import threading
+from pathlib import Path
+
+from app.config import settings
+from app.services.two_tier_cache import TwoTierCache
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def make_key(
+    engine: str, model_name: str, profile: str, src: str, tgt: str, text: str
+) -> str:
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    # int8 and fp32 copies of a model translate slightly differently
+    backend = settings.translation_backend
+    return f"{engine}|{backend}|{model_name}|{profile}|{src}|{tgt}|{digest}"
+
+
+class TranslationCache(TwoTierCache):
+    """Source-text keys to translations, in the translation_memory table."""
+
+    def __init__(self, db_path: Path, memory_entries: int, max_entries: int):
+        super().__init__(
+            db_path, "translation_memory", memory_entries, max_entries,
+            column="translation",
+        )
+
+
+_cache: TranslationCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_translation_cache() -> TranslationCache | None:
+    """Process-wide cache, or None when disabled in settings."""
+    global _cache
+    if not settings.translation_cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TranslationCache(
+                    settings.translation_cache_path,
+                    memory_entries=settings.translation_cache_memory_entries,
+                    max_entries=settings.translation_cache_max_entries,
+                )
+    return _cache
@@ -107,14 +107,16 @@ def _compute_rate_string(text: str, target_duration: float) -> str:
 def _speed_up_audio(tmp_path: str, duration_ratio: float) -> str:
     """Speed up audio using FFmpeg atempo filter."""
     from app.config import settings
+    from app.utils.thread_budget import ffmpeg_command_prefix, ffmpeg_thread_args
     adjusted_path = tempfile.mktemp(suffix=".mp3")
     atempo = min(duration_ratio, 2.0)
 
     subprocess.run(
         [
-            settings.ffmpeg_path, "-y", "-i", tmp_path,
+            *ffmpeg_command_prefix(), settings.ffmpeg_path, "-y", "-i", tmp_path,
             "-filter:a", f"atempo={atempo}",
             "-loglevel", "error",
+            *ffmpeg_thread_args(),
             adjusted_path,
         ],
         capture_output=True,
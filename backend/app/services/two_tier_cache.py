@@ -0,0 +1,171 @@
+"""
+Two-tier string store: an in-process LRU in front of a persistent SQLite table.
+
+The translation memory and the transcription cache are both built on it,
+each in its own table. Values are plain strings; callers own the encoding.
+The disk tier is capped at `max_entries` rows and drops the least recently
+used rows beyond it. The row count is kept as a running total, counted once
+at open and then re-read every _RECOUNT_WRITES writes, because inference
+worker processes write to the same file.
+"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# put_many calls between exact row counts
+_RECOUNT_WRITES = 256
+
+
+class TwoTierCache:
+    """Thread-safe; one instance per table, shared by all jobs in the process."""
+
+    def __init__(
+        self, db_path: Path, table: str, memory_entries: int, max_entries: int,
+        column: str = "value",
+    ):
+        self._table = table
+        self._column = column
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._memory_entries = max(0, memory_entries)
+        self._max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " key TEXT PRIMARY KEY,"
+            f" {column} TEXT NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._db.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_last_used"
+            f" ON {table} (last_used)"
+        )
+        self._db.commit()
+        self._disk_entries = self._count()
+        self._writes = 0
+
+    def get(self, key: str) -> str | None:
+        return self.get_many([key]).get(key)
+
+    def put(self, key: str, value: str):
+        self.put_many({key: value})
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Look up keys in memory, then on disk. Returns only the hits."""
+        found: dict[str, str] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                    self.memory_hits += 1
+                else:
+                    missing.append(key)
+
+            if missing:
+                unique = list(dict.fromkeys(missing))
+                rows = []
+                for start in range(0, len(unique), 500):
+                    batch = unique[start:start + 500]
+                    placeholders = ",".join("?" * len(batch))
+                    rows += self._db.execute(
+                        f"SELECT key, {self._column} FROM {self._table}"
+                        f" WHERE key IN ({placeholders})",
+                        batch,
+                    ).fetchall()
+                disk = dict(rows)
+                if disk:
+                    now = time.time()
+                    self._db.executemany(
+                        f"UPDATE {self._table} SET last_used = ? WHERE key = ?",
+                        [(now, key) for key in disk],
+                    )
+                    self._db.commit()
+                for key in missing:
+                    if key in disk:
+                        found[key] = disk[key]
+                        self._remember(key, disk[key])
+                        self.disk_hits += 1
+                    else:
+                        self.misses += 1
+        return found
+
+    def put_many(self, items: dict[str, str]):
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            for key, value in items.items():
+                self._remember(key, value)
+            self._writes += 1
+            if self._writes % _RECOUNT_WRITES == 0:
+                self._disk_entries = self._count()
+            self._disk_entries += len(items) - self._count_existing(list(items))
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO {self._table} (key, {self._column}, last_used)"
+                " VALUES (?, ?, ?)",
+                [(key, value, now) for key, value in items.items()],
+            )
+            self._evict()
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            disk_entries = self._disk_entries
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (
+                    (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+                ),
+                "evictions": self.evictions,
+            }
+
+    def _remember(self, key: str, value: str):
+        if not self._memory_entries:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
+
+    def _count(self) -> int:
+        return self._db.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+    def _count_existing(self, keys: list[str]) -> int:
+        """How many of `keys` already have a row (primary-key lookups only)."""
+        existing = 0
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            existing += self._db.execute(
+                f"SELECT COUNT(*) FROM {self._table} WHERE key IN ({placeholders})",
+                batch,
+            ).fetchone()[0]
+        return existing
+
+    def _evict(self):
+        """Drop least-recently-used disk rows beyond the size cap."""
+        excess = self._disk_entries - self._max_entries
+        if excess > 0:
+            deleted = self._db.execute(
+                f"DELETE FROM {self._table} WHERE key IN ("
+                f" SELECT key FROM {self._table} ORDER BY last_used LIMIT ?)",
+                (excess,),
+            ).rowcount
+            self._disk_entries -= deleted
+            self.evictions += deleted
@@ -0,0 +1,104 @@
+"""
+Energy-based voice activity detection for chunked transcription.
+
+Long recordings are cut into chunks of at most `vad_chunk_s` seconds of
+speech so they can be transcribed in parallel. Speech is found from 30 ms
+frame energies relative to the recording's loud frames. Silences of at
+least `vad_min_silence_ms` are dropped, and a chunk is built from whole
+speech regions, so cuts fall in silence. A region longer than a chunk is
+cut at its quietest frame.
+"""
+from app.config import settings
+
+SAMPLE_RATE = 16000
+FRAME_SAMPLES = 480  # 30 ms
+_SPEECH_PAD_S = 0.2
+_MIN_SPEECH_S = 0.25
+_FLOOR_DB = -60.0
+
+
+def frame_energies(audio):
+    """RMS level of each 30 ms frame, in dBFS."""
+    import numpy as np
+
+    frames = len(audio) // FRAME_SAMPLES
+    if frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    x = audio[:frames * FRAME_SAMPLES].reshape(frames, FRAME_SAMPLES)
+    rms = np.sqrt(np.mean(np.square(x, dtype=np.float32), axis=1))
+    return 20 * np.log10(rms + 1e-10)
+
+
+def speech_regions(audio) -> list[tuple[int, int]]:
+    """
+    (start, end) sample ranges containing speech, padded by 200 ms and with
+    gaps shorter than `vad_min_silence_ms` merged.
+    """
+    import numpy as np
+
+    db = frame_energies(audio)
+    if not len(db):
+        return []
+    threshold = max(np.percentile(db, 95) + settings.vad_threshold_db, _FLOOR_DB)
+    speech = db > threshold
+
+    # Runs of speech frames -> [start, end) frame ranges
+    edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    pad = int(_SPEECH_PAD_S * SAMPLE_RATE)
+    min_gap = int(settings.vad_min_silence_ms / 1000 * SAMPLE_RATE)
+    min_speech = int(_MIN_SPEECH_S * SAMPLE_RATE)
+    regions: list[list[int]] = []
+    for start, end in zip(starts * FRAME_SAMPLES, ends * FRAME_SAMPLES):
+        start = max(0, int(start) - pad)
+        end = min(len(audio), int(end) + pad)
+        if regions and start - regions[-1][1] < min_gap:
+            regions[-1][1] = max(regions[-1][1], end)
+        else:
+            regions.append([start, end])
+    return [(s, e) for s, e in regions if e - s >= min_speech]
+
+
+def plan_chunks(audio, max_s: float | None = None) -> list[list[tuple[int, int]]]:
+    """
+    Group speech regions into chunks of at most `max_s` (default
+    `vad_chunk_s`) seconds of audio. Each chunk is a list of (start, end)
+    sample ranges that are concatenated for transcription; the silence
+    between them is skipped.
+    """
+    max_len = int((max_s or settings.vad_chunk_s) * SAMPLE_RATE)
+    db = frame_energies(audio)
+
+    pieces = []
+    for start, end in speech_regions(audio):
+        pieces.extend(_split_long(start, end, max_len, db))
+
+    chunks: list[list[tuple[int, int]]] = []
+    current: list[tuple[int, int]] = []
+    length = 0
+    for start, end in pieces:
+        if current and length + (end - start) > max_len:
+            chunks.append(current)
+            current, length = [], 0
+        current.append((start, end))
+        length += end - start
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_long(start: int, end: int, max_len: int, db) -> list[tuple[int, int]]:
+    """Cut a region longer than max_len at the quietest frame of each window's second half."""
+    import numpy as np
+
+    pieces = []
+    while end - start > max_len:
+        lo = (start + max_len // 2) // FRAME_SAMPLES
+        hi = (start + max_len) // FRAME_SAMPLES
+        cut = (lo + int(np.argmin(db[lo:hi]))) * FRAME_SAMPLES if hi > lo else start + max_len
+        pieces.append((start, cut))
+        start = cut
+    pieces.append((start, end))
+    return pieces
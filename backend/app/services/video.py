@@ -2,34 +2,7 @@ import asyncio
 from pathlib import Path
 from app.config import settings
 from app.utils.file_utils import get_job_output_dir
-
-
-async def extract_audio(video_path: str, job_id: str) -> str:
-    """Extract audio track from video as WAV (Whisper prefers WAV at 16kHz mono)."""
-    output_dir = get_job_output_dir(job_id)
-    output_path = output_dir / "extracted_audio.wav"
-
-    cmd = [
-        settings.ffmpeg_path, "-y",
-        "-i", video_path,
-        "-vn",
-        "-acodec", "pcm_s16le",
-        "-ar", "16000",
-        "-ac", "1",
-        str(output_path),
-    ]
-
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    _, stderr = await process.communicate()
-
-    if process.returncode != 0:
-        raise RuntimeError(f"FFmpeg audio extraction failed: {stderr.decode()}")
-
-    return str(output_path)
+from app.utils.thread_budget import ffmpeg_command_prefix, ffmpeg_thread_args
 
 
 async def burn_subtitles_and_replace_audio(
@@ -51,7 +24,7 @@ async def burn_subtitles_and_replace_audio(
     subtitle_filter_path = subtitle_filter_path.replace(":", "\\:")
 
     cmd = [
-        settings.ffmpeg_path, "-y",
+        *ffmpeg_command_prefix(), settings.ffmpeg_path, "-y",
         "-i", original_video,
         "-i", dubbed_audio,
         "-filter_complex",
@@ -64,6 +37,7 @@ async def burn_subtitles_and_replace_audio(
         "-c:a", "aac",
         "-b:a", "192k",
         "-movflags", "+faststart",
+        *ffmpeg_thread_args(),
         str(output_path),
     ]
 
@@ -6,6 +6,7 @@ from scipy.io import wavfile
 
 from app.models.model_manager import ModelManager
 from app.utils.file_utils import get_job_output_dir
+from app.utils.thread_budget import thread_budget
 
 
 def _load_audio_as_tensor(audio_path: str, target_sr: int) -> torch.Tensor:
@@ -53,27 +54,27 @@ def separate_vocals(
     """
     from demucs.apply import apply_model
 
-    model = model_manager.get_demucs()
-    device = next(model.parameters()).device
-    sr = model.samplerate  # 44100 for htdemucs
+    with model_manager.use_demucs() as model:
+        device = next(model.parameters()).device
+        sr = model.samplerate  # 44100 for htdemucs
 
-    # Load audio using pydub (FFmpeg), resample to model's expected rate
-    wav = _load_audio_as_tensor(audio_path, sr)
+        # Load audio using pydub (FFmpeg), resample to model's expected rate
+        wav = _load_audio_as_tensor(audio_path, sr)
 
-    # Normalize
-    ref = wav.mean(0)
-    wav_mean = ref.mean()
-    wav_std = ref.std()
-    if wav_std == 0:
-        wav_std = torch.tensor(1.0)
-    wav_normed = (wav - wav_mean) / wav_std
+        # Normalize
+        ref = wav.mean(0)
+        wav_mean = ref.mean()
+        wav_std = ref.std()
+        if wav_std == 0:
+            wav_std = torch.tensor(1.0)
+        wav_normed = (wav - wav_mean) / wav_std
 
-    # Add batch dimension: (channels, samples) -> (1, channels, samples)
-    wav_batch = wav_normed.unsqueeze(0).to(device)
+        # Add batch dimension: (channels, samples) -> (1, channels, samples)
+        wav_batch = wav_normed.unsqueeze(0).to(device)
 
-    # Apply Demucs model
-    with torch.no_grad():
-        sources = apply_model(model, wav_batch, device=device, progress=False)
+        # Apply Demucs model
+        with torch.no_grad(), thread_budget("demucs"):
+            sources = apply_model(model, wav_batch, device=device, progress=False)
 
     # sources: (1, num_sources, channels, samples)
     sources = sources[0]  # Remove batch dim
@@ -116,23 +117,23 @@ def separate_all_stems(
     """
     from demucs.apply import apply_model
 
-    model = model_manager.get_demucs()
-    device = next(model.parameters()).device
-    sr = model.samplerate
+    with model_manager.use_demucs() as model:
+        device = next(model.parameters()).device
+        sr = model.samplerate
 
-    wav = _load_audio_as_tensor(audio_path, sr)
+        wav = _load_audio_as_tensor(audio_path, sr)
 
-    ref = wav.mean(0)
-    wav_mean = ref.mean()
-    wav_std = ref.std()
-    if wav_std == 0:
-        wav_std = torch.tensor(1.0)
-    wav_normed = (wav - wav_mean) / wav_std
+        ref = wav.mean(0)
+        wav_mean = ref.mean()
+        wav_std = ref.std()
+        if wav_std == 0:
+            wav_std = torch.tensor(1.0)
+        wav_normed = (wav - wav_mean) / wav_std
 
-    wav_batch = wav_normed.unsqueeze(0).to(device)
+        wav_batch = wav_normed.unsqueeze(0).to(device)
 
-    with torch.no_grad():
-        sources = apply_model(model, wav_batch, device=device, progress=False)
+        with torch.no_grad(), thread_budget("demucs"):
+            sources = apply_model(model, wav_batch, device=device, progress=False)
 
     sources = sources[0]  # Remove batch dim
     source_names = model.sources  # ['drums', 'bass', 'other', 'vocals']
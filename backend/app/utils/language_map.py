@@ -1,3 +1,6 @@
+from app.config import settings
+
+
 LANGUAGES = {
     "en": {
         "name": "English",
@@ -320,6 +323,11 @@ def needs_pivot(src: str, tgt: str) -> bool:
     src_opus, tgt_opus = get_opus_codes(src, tgt)
     if (src_opus, tgt_opus) in OPUS_DIRECT_PAIRS:
         return False
+    # Optionally keep pairs on Opus-MT by chaining two English legs
+    if settings.translation_opus_pivot and "en" not in (src, tgt):
+        en_opus = LANGUAGES["en"]["opus_code"]
+        if (src_opus, en_opus) in OPUS_DIRECT_PAIRS and (en_opus, tgt_opus) in OPUS_DIRECT_PAIRS:
+            return True
     # NLLB handles all pairs directly — no pivot needed
     if "nllb_code" in LANGUAGES.get(src, {}) and "nllb_code" in LANGUAGES.get(tgt, {}):
         return False
@@ -0,0 +1,155 @@
+"""
+CPU thread budgeting for concurrent inference jobs.
+
+Whisper, Demucs, the translation models and ffmpeg all default to "use every
+core". With several jobs running in parallel executor threads that
+oversubscribes the machine, so each resource class gets a share instead:
+`cpu_count // max_concurrent_jobs` threads unless set explicitly, optionally
+pinned to a configured core set.
+
+`thread_budget(cls)` wraps a single inference call. Linux CPU affinity is
+per-thread and is restored afterwards. torch's intra-op count is per-thread
+under OpenMP but process-wide on some builds, so it is set on every entry
+and left in place rather than restored, which would race with other jobs.
+"""
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+
+from app.config import settings
+
+RESOURCE_CLASSES = ("whisper", "demucs", "mt", "ffmpeg")
+
+_interop_configured = False
+_interop_lock = threading.Lock()
+
+
+def parse_cpu_set(spec: str) -> set[int]:
+    """Parse a core list like "0-3,8,10-11" into a set of CPU ids."""
+    cpus = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            cpus.update(range(int(start), int(end) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
+
+def cpu_count() -> int:
+    """Cores available to this process (respects an inherited affinity mask)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def cpu_set(resource_class: str) -> set[int] | None:
+    """Configured core set for a resource class, or None for no pinning."""
+    spec = getattr(settings, f"{resource_class}_cpu_affinity")
+    if not spec or not hasattr(os, "sched_setaffinity"):
+        return None
+    return parse_cpu_set(spec)
+
+
+def threads_for(resource_class: str) -> int:
+    """
+    Intra-op threads for one call of this resource class: the explicit
+    setting if non-zero, else an equal share of the machine per concurrent
+    job, never more than the cores it is pinned to.
+    """
+    if resource_class not in RESOURCE_CLASSES:
+        raise ValueError(f"Unknown resource class: {resource_class}")
+    threads = getattr(settings, f"{resource_class}_threads")
+    if threads <= 0:
+        threads = cpu_count() // max(1, settings.max_concurrent_jobs)
+    cpus = cpu_set(resource_class)
+    if cpus:
+        threads = min(threads, len(cpus))
+    return max(1, threads)
+
+
+def configure_torch():
+    """
+    Set torch's inter-op pool size once per process. torch only accepts this
+    before any parallel work has run, so it is called from app startup.
+    """
+    global _interop_configured
+    if not settings.thread_budget_enabled:
+        return
+    with _interop_lock:
+        if _interop_configured:
+            return
+        import torch
+        try:
+            torch.set_num_interop_threads(max(1, settings.inference_interop_threads))
+        except RuntimeError as e:
+            print(f"Could not set torch inter-op threads: {e}")
+        _interop_configured = True
+
+
+@contextmanager
+def thread_budget(resource_class: str, parallel: int = 1):
+    """
+    Limit torch intra-op threads (and pin to the class's core set, if any)
+    for the duration of one inference call on the current thread. When one
+    job runs `parallel` calls at once, each gets that share of the budget.
+    """
+    if not settings.thread_budget_enabled:
+        yield
+        return
+
+    import torch
+
+    threads = max(1, threads_for(resource_class) // max(1, parallel))
+    cpus = cpu_set(resource_class)
+    previous_cpus = os.sched_getaffinity(0) if cpus else None
+
+    torch.set_num_threads(threads)
+    if cpus:
+        os.sched_setaffinity(0, cpus)
+    try:
+        yield
+    finally:
+        if previous_cpus is not None:
+            os.sched_setaffinity(0, previous_cpus)
+
+
+def ffmpeg_thread_args() -> list[str]:
+    """Output options limiting ffmpeg's encoder/filter threads."""
+    if not settings.thread_budget_enabled:
+        return []
+    return ["-threads", str(threads_for("ffmpeg"))]
+
+
+def ffmpeg_command_prefix() -> list[str]:
+    """
+    `taskset -c <cpus>` to put in front of an ffmpeg command, pinning the
+    child to the ffmpeg core set. Pinning in the child with preexec_fn is not
+    safe in a process running threads, so taskset sets the affinity
+    before it execs ffmpeg. Without taskset the child is not pinned.
+    """
+    if not settings.thread_budget_enabled:
+        return []
+    cpus = cpu_set("ffmpeg")
+    if not cpus or not shutil.which("taskset"):
+        return []
+    return ["taskset", "-c", ",".join(str(cpu) for cpu in sorted(cpus))]
+
+
+def describe() -> dict:
+    """Effective budget per resource class, for /api/metrics."""
+    return {
+        "enabled": settings.thread_budget_enabled,
+        "cpu_count": cpu_count(),
+        "max_concurrent_jobs": settings.max_concurrent_jobs,
+        "classes": {
+            cls: {
+                "threads": threads_for(cls),
+                "cpus": sorted(cpu_set(cls) or []),
+            }
+            for cls in RESOURCE_CLASSES
+        },
+    }
@@ -0,0 +1,78 @@
+"""
+Micro-benchmark for _split_text_into_chunks on a large text file.
+
+Compares the previous implementation, which re-encoded the whole growing
+chunk for every sentence, with the batched token-count packer. Run from the
+backend directory:
+
+    python -m benchmarks.chunker --size-mb 1
+    python -m benchmarks.chunker --file path/to/input.txt
+"""
+import argparse
+import re
+import time
+from pathlib import Path
+
+from benchmarks.translation_backends import CORPUS
+
+
+def _legacy_split(text: str, tokenizer, max_tokens: int = 512) -> list[str]:
+    """The pre-batching chunker, kept here as the baseline."""
+    sentences = re.split(r"(?<=[.!?])\s+", text)
+    chunks = []
+    current_chunk = ""
+    for sentence in sentences:
+        candidate = (current_chunk + " " + sentence).strip() if current_chunk else sentence
+        token_count = len(tokenizer.encode(candidate))
+        if token_count > max_tokens and current_chunk:
+            chunks.append(current_chunk)
+            current_chunk = sentence
+        else:
+            current_chunk = candidate
+    if current_chunk:
+        chunks.append(current_chunk)
+    return chunks
+
+
+def _make_text(size_bytes: int) -> str:
+    parts = []
+    total = 0
+    i = 0
+    while total < size_bytes:
+        sentence = CORPUS[i % len(CORPUS)]
+        parts.append(sentence)
+        total += len(sentence) + 1
+        i += 1
+    return " ".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=float, default=1.0)
+    parser.add_argument("--file", help="Use this file instead of generated text")
+    parser.add_argument("--model", default="Helsinki-NLP/opus-mt-en-es")
+    args = parser.parse_args()
+
+    from transformers import AutoTokenizer
+    from app.services.translation import _split_text_into_chunks
+
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    if args.file:
+        text = Path(args.file).read_text(encoding="utf-8")
+    else:
+        text = _make_text(int(args.size_mb * 1024 * 1024))
+    print(f"Input: {len(text.encode('utf-8')) / (1024 * 1024):.2f} MB")
+
+    for name, split in [("legacy", _legacy_split), ("batched", _split_text_into_chunks)]:
+        t0 = time.perf_counter()
+        chunks = split(text, tokenizer, 512)
+        elapsed = time.perf_counter() - t0
+        longest = max(len(tokenizer.encode(c)) for c in chunks)
+        print(
+            f"{name:>8}: {elapsed:8.2f}s  {len(chunks):6d} chunks  "
+            f"longest {longest} tokens"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Compare transcription backends (openai-whisper vs faster-whisper) on fixed
+audio fixtures, reporting real-time factor (processing time / audio length;
+below 1.0 is faster than real time).
+
+Each backend runs in its own process so RSS numbers are not polluted by the
+other model. The fixtures are generated once with Edge TTS from a fixed
+script, so every run and every machine transcribes the same audio. Run from
+the backend directory:
+
+    python -m benchmarks.transcription_backends --make-fixtures
+    python -m benchmarks.transcription_backends --runs 2
+    python -m benchmarks.transcription_backends --audio talk.mp3 --backends faster-whisper
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.translation_backends import CORPUS
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# (file name, voice, number of corpus sentences) -- roughly 10 s, 30 s, 60 s
+FIXTURES = [
+    ("short_en.mp3", "en-US-GuyNeural", 3),
+    ("medium_en.mp3", "en-US-JennyNeural", 10),
+    ("long_en.mp3", "en-GB-RyanNeural", 20),
+]
+
+
+def make_fixtures():
+    import asyncio
+    import edge_tts
+
+    async def synthesize():
+        FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+        for name, voice, sentences in FIXTURES:
+            path = FIXTURES_DIR / name
+            text = " ".join(CORPUS[:sentences])
+            await edge_tts.Communicate(text=text, voice=voice).save(str(path))
+            print(f"Wrote {path}")
+
+    asyncio.run(synthesize())
+
+
+def _audio_seconds(path: str) -> float:
+    from pydub import AudioSegment
+    return AudioSegment.from_file(path).duration_seconds
+
+
+def _run_child(backend: str, audio: list[str], runs: int) -> dict:
+    from app.config import settings
+    settings.transcription_backend = backend
+    settings.whisper_replicas = 1
+
+    from app.models.model_manager import ModelManager
+    from app.services.transcription import transcribe_audio
+
+    model_manager = ModelManager()
+    started = time.perf_counter()
+    model_manager.start_preload(["whisper"]).join()
+    ready_seconds = time.perf_counter() - started
+
+    files = {}
+    total_audio = 0.0
+    total_elapsed = 0.0
+    for path in audio:
+        seconds = _audio_seconds(path)
+        best = None
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            result = transcribe_audio(path, "en", model_manager)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        files[Path(path).name] = {
+            "audio_s": round(seconds, 1),
+            "rtf": round(best / seconds, 3),
+            "segments": len(result["segments"]),
+            "words": sum(len(seg["words"]) for seg in result["segments"]),
+        }
+        total_audio += seconds
+        total_elapsed += best
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "backend": backend,
+        "model": settings.whisper_model_size,
+        "ready_s": round(ready_seconds, 2),
+        "rtf": round(total_elapsed / total_audio, 3),
+        "peak_rss_mb": round(peak_kb / 1024, 1),
+        "files": files,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backends", default="openai,faster-whisper")
+    parser.add_argument("--audio", nargs="*", help="Audio files (default: the fixtures)")
+    parser.add_argument("--runs", type=int, default=2, help="Runs per file; the best is kept")
+    parser.add_argument("--make-fixtures", action="store_true", help="Generate the fixtures and exit")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.make_fixtures:
+        make_fixtures()
+        return
+
+    audio = args.audio or [str(FIXTURES_DIR / name) for name, _, _ in FIXTURES]
+    missing = [path for path in audio if not Path(path).exists()]
+    if missing:
+        parser.error(f"Missing audio: {', '.join(missing)} (run with --make-fixtures)")
+
+    if args.child:
+        print(json.dumps(_run_child(args.child, audio, args.runs)))
+        return
+
+    rows = []
+    for backend in args.backends.split(","):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.transcription_backends",
+             "--runs", str(args.runs), "--child", backend, "--audio", *audio],
+            capture_output=True, text=True, check=True,
+        )
+        rows.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    columns = ["backend", "model", "ready_s", "rtf", "peak_rss_mb"]
+    print(" | ".join(f"{c:>15}" for c in columns))
+    for row in rows:
+        print(" | ".join(f"{str(row[c]):>15}" for c in columns))
+    print()
+    for row in rows:
+        for name, stats in row["files"].items():
+            print(
+                f"{row['backend']:>15} {name:>15}: {stats['audio_s']}s audio, "
+                f"RTF {stats['rtf']}, {stats['segments']} segments, {stats['words']} words"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Compare translation inference backends (fp32 vs int8) on a fixed corpus.
+
+Each backend runs in its own process so RSS numbers are not polluted by the
+other model. Run from the backend directory:
+
+    python -m benchmarks.translation_backends --pair en-es --runs 3
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+CORPUS = [
+    "The meeting has been moved to Thursday afternoon.",
+    "Please upload the video again if the first attempt failed.",
+    "Our new feature lets you translate documents without losing formatting.",
+    "The weather forecast predicts heavy rain for the rest of the week.",
+    "She finished the marathon in just under four hours.",
+    "Click the button below to download your subtitles.",
+    "This recipe needs two cups of flour and a pinch of salt.",
+    "The museum is closed on Mondays and public holidays.",
+    "We could not process your file because it is too large.",
+    "Thank you for your patience while we improve our service.",
+    "The train to the airport leaves every fifteen minutes.",
+    "He has been learning to play the piano since he was six.",
+    "Remember to save your work before closing the application.",
+    "The conference will be streamed live on our website.",
+    "Children under twelve must be accompanied by an adult.",
+    "Our support team is available twenty-four hours a day.",
+    "The report shows a steady increase in sales over the last quarter.",
+    "Turn left at the second traffic light and continue straight.",
+    "Most of the audience stayed until the very end of the concert.",
+    "A new version of the app is available in the store.",
+    "The hotel offers free breakfast to all of its guests.",
+    "Scientists have discovered a new species of frog in the rainforest.",
+    "Your order has been shipped and should arrive within three days.",
+    "The library extended its opening hours during exam season.",
+    "Please speak slowly so that everyone can follow the discussion.",
+    "The bridge will be closed for repairs until the end of the month.",
+    "I would like to book a table for four people at eight o'clock.",
+    "The film was shot entirely on location in northern Scotland.",
+    "Regular exercise can improve both physical and mental health.",
+    "The company plans to open three new offices next year.",
+    "Don't forget to bring your passport to the check-in desk.",
+    "The garden looks beautiful in the spring when everything blooms.",
+]
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MB (Linux)."""
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * resource.getpagesize() / (1024 * 1024)
+
+
+def _run_child(backend: str, src: str, tgt: str, runs: int) -> dict:
+    from app.config import settings
+    settings.translation_backend = backend
+    settings.translation_cache_enabled = False
+    settings.translation_batching = False
+
+    from app.models.model_manager import ModelManager
+    from app.services.translation import translate_batch, translate_text
+
+    rss_before = _rss_mb()
+    model_manager = ModelManager()
+    started = time.perf_counter()
+    model_manager.get_translation_model(src, tgt)
+    load_seconds = time.perf_counter() - started
+
+    # Warm-up: first call pays for allocator and kernel setup
+    translate_text(CORPUS[0], src, tgt, model_manager)
+
+    latencies = []
+    for sentence in CORPUS:
+        t0 = time.perf_counter()
+        translate_text(sentence, src, tgt, model_manager)
+        latencies.append(time.perf_counter() - t0)
+    latencies.sort()
+
+    throughputs = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        translate_batch(CORPUS, src, tgt, model_manager)
+        throughputs.append(len(CORPUS) / (time.perf_counter() - t0))
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "backend": backend,
+        "load_s": round(load_seconds, 2),
+        "latency_p50_ms": round(1000 * latencies[len(latencies) // 2], 1),
+        "latency_p95_ms": round(1000 * latencies[int(len(latencies) * 0.95)], 1),
+        "throughput_sps": round(max(throughputs), 2),
+        "model_rss_mb": round(_rss_mb() - rss_before, 1),
+        "peak_rss_mb": round(peak_kb / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pair", default="en-es", help="src-tgt, e.g. en-es")
+    parser.add_argument("--backends", default="fp32,int8")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    src, tgt = args.pair.split("-")
+
+    if args.child:
+        print(json.dumps(_run_child(args.child, src, tgt, args.runs)))
+        return
+
+    rows = []
+    for backend in args.backends.split(","):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.translation_backends",
+             "--pair", args.pair, "--runs", str(args.runs), "--child", backend],
+            capture_output=True, text=True, check=True,
+        )
+        rows.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    columns = list(rows[0].keys())
+    print(" | ".join(f"{c:>15}" for c in columns))
+    for row in rows:
+        print(" | ".join(f"{str(row[c]):>15}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
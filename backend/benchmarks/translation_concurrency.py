@@ -0,0 +1,83 @@
+"""
+Load-test concurrent translation on one shared NLLB-200 model.
+
+Several threads translate into English from different source languages at
+once, the case that used to race on `tokenizer.src_lang`. Every output is
+compared with a sequential reference run, then throughput is reported for
+both. Run from the backend directory:
+
+    python -m benchmarks.translation_concurrency --sources es,fr,de --threads 6
+    python -m benchmarks.translation_concurrency --batching --concurrency 2
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.translation_backends import CORPUS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sources", default="es,fr,de", help="Source languages")
+    parser.add_argument("--threads", type=int, default=6)
+    parser.add_argument("--rounds", type=int, default=3, help="Passes over the corpus per thread")
+    parser.add_argument(
+        "--batching", action="store_true",
+        help="Go through the shared batcher instead of direct generate calls",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=2,
+        help="translation_concurrency when --batching is set",
+    )
+    args = parser.parse_args()
+    sources = [s.strip() for s in args.sources.split(",") if s.strip()]
+
+    from app.config import settings
+    settings.translation_cache_enabled = False
+    settings.translation_batching = args.batching
+    settings.translation_concurrency = args.concurrency
+    settings.translation_routing = "balanced"  # every pair goes to the resident NLLB
+
+    from app.models.model_manager import ModelManager
+    from app.services.translation import translate_batch
+
+    model_manager = ModelManager()
+    model_manager.get_nllb()
+
+    # Source texts: the English corpus translated into each source language
+    inputs = {src: translate_batch(CORPUS, "en", src, model_manager) for src in sources}
+
+    started = time.perf_counter()
+    reference = {src: translate_batch(inputs[src], src, "en", model_manager) for src in sources}
+    sequential_s = time.perf_counter() - started
+
+    jobs = [sources[i % len(sources)] for i in range(args.threads)]
+
+    def run(src: str) -> tuple[str, int]:
+        mismatches = 0
+        for _ in range(args.rounds):
+            output = translate_batch(inputs[src], src, "en", model_manager)
+            mismatches += sum(a != b for a, b in zip(output, reference[src]))
+        return src, mismatches
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = list(pool.map(run, jobs))
+    concurrent_s = time.perf_counter() - started
+
+    sentences = len(CORPUS)
+    print(f"Sequential: {len(sources) * sentences / sequential_s:.2f} sentences/s")
+    print(
+        f"Concurrent ({args.threads} threads"
+        f"{f', batching x{args.concurrency}' if args.batching else ''}): "
+        f"{args.threads * args.rounds * sentences / concurrent_s:.2f} sentences/s"
+    )
+    mismatched = sum(m for _, m in results)
+    for src, mismatches in results:
+        if mismatches:
+            print(f"  {src}->en: {mismatches} outputs differ from the sequential run")
+    print("Outputs match the sequential run." if not mismatched else f"{mismatched} mismatches.")
+
+
+if __name__ == "__main__":
+    main()
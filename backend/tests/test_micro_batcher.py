@@ -0,0 +1,124 @@
+import threading
+
+import pytest
+
+from app.services.translation_batcher import MicroBatcher, TranslationBatcher
+
+
+def test_requests_are_grouped_by_key_and_split_back():
+    calls = []
+    gate = threading.Event()
+
+    def run(items, src, tgt):
+        gate.wait()
+        calls.append((src, tgt, list(items)))
+        return [f"{item}:{tgt}" for item in items]
+
+    batcher = MicroBatcher("test", run, window_ms=200, max_items=100)
+    try:
+        futures = [
+            batcher.submit(["a", "b"], "en", "es"),
+            batcher.submit(["c"], "en", "fr"),
+            batcher.submit(["d"], "en", "es"),
+        ]
+        gate.set()
+        results = [f.result(timeout=5) for f in futures]
+    finally:
+        batcher.stop()
+
+    assert results == [["a:es", "b:es"], ["c:fr"], ["d:es"]]
+    assert sorted(calls) == [("en", "es", ["a", "b", "d"]), ("en", "fr", ["c"])]
+    stats = batcher.stats()
+    assert stats["requests"] == 3
+    assert stats["batches"] == 2
+    assert stats["queue_depth"] == 0
+
+
+def test_key_fn_merges_requests_with_different_args():
+    calls = []
+
+    def run(items, language):
+        calls.append(list(items))
+        return items
+
+    batcher = MicroBatcher(
+        "test", run, window_ms=200, max_items=100, key_fn=lambda language: None,
+    )
+    try:
+        futures = [batcher.submit([1], "en"), batcher.submit([2], "de")]
+        assert [f.result(timeout=5) for f in futures] == [[1], [2]]
+    finally:
+        batcher.stop()
+
+    assert calls == [[1, 2]]
+
+
+def test_batches_stop_at_max_items():
+    sizes = []
+
+    def run(items):
+        sizes.append(len(items))
+        return items
+
+    batcher = MicroBatcher("test", run, window_ms=200, max_items=3)
+    try:
+        futures = [batcher.submit([i]) for i in range(7)]
+        assert [f.result(timeout=5) for f in futures] == [[i] for i in range(7)]
+    finally:
+        batcher.stop()
+
+    assert max(sizes) <= 3
+    assert sum(sizes) == 7
+
+
+def test_errors_reach_every_request_of_the_group():
+    def run(items):
+        raise ValueError("boom")
+
+    batcher = MicroBatcher("test", run, window_ms=50, max_items=10)
+    try:
+        futures = [batcher.submit([1]), batcher.submit([2])]
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result(timeout=5)
+    finally:
+        batcher.stop()
+
+
+def test_stop_finishes_queued_work_then_fails_late_requests():
+    started = threading.Event()
+    release = threading.Event()
+
+    def run(items):
+        started.set()
+        release.wait()
+        return items
+
+    batcher = MicroBatcher("test", run, window_ms=0, max_items=1, workers=2)
+    busy = batcher.submit(["busy"])
+    assert started.wait(5)
+    queued = batcher.submit(["queued"])
+    batcher.stop()
+    late = batcher.submit(["late"])
+    release.set()
+
+    assert busy.result(timeout=5) == ["busy"]
+    assert queued.result(timeout=5) == ["queued"]
+    with pytest.raises(RuntimeError, match="stopped"):
+        late.result(timeout=5)
+    for thread in batcher._threads:
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+
+def test_translation_batcher_passes_pair_and_profile():
+    def run(chunks, src, tgt, profile):
+        return [f"{src}>{tgt}/{profile}:{c}" for c in chunks]
+
+    batcher = TranslationBatcher("m", run, window_ms=10, max_chunks=8)
+    try:
+        assert batcher.translate(["x"], "en", ("es", "fr"), "fast") == [
+            "en>('es', 'fr')/fast:x"
+        ]
+    finally:
+        batcher.stop()
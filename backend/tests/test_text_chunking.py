@@ -0,0 +1,61 @@
+from app.services.translation import _split_text_into_chunks
+
+
+class CharTokenizer:
+    """One token per non-space character, like a CJK-heavy vocabulary."""
+
+    def __call__(self, texts, add_special_tokens=False):
+        return {"input_ids": [[ord(c) for c in text if not c.isspace()] for text in texts]}
+
+
+def _tokens(text):
+    return sum(1 for c in text if not c.isspace())
+
+
+def test_short_text_is_one_chunk():
+    assert _split_text_into_chunks("Hello there. How are you?", CharTokenizer()) == [
+        "Hello there. How are you?"
+    ]
+
+
+def test_sentences_are_packed_under_the_budget():
+    text = " ".join(["abcdefghij."] * 10)  # 11 tokens per sentence
+    chunks = _split_text_into_chunks(text, CharTokenizer(), max_tokens=40)
+
+    assert all(_tokens(chunk) <= 36 for chunk in chunks)
+    assert " ".join(chunks) == text
+    assert len(chunks) == 4
+
+
+def test_oversize_sentence_splits_at_clauses_then_words():
+    text = "alpha beta gamma, delta epsilon zeta, " + "word " * 20 + "end."
+    chunks = _split_text_into_chunks(text, CharTokenizer(), max_tokens=24)
+
+    assert all(_tokens(chunk) <= 20 for chunk in chunks)
+    assert "".join(chunks).replace(" ", "") == text.replace(" ", "")
+
+
+def test_cjk_punctuation_is_a_boundary():
+    text = "今天天气很好。" * 6
+    chunks = _split_text_into_chunks(text, CharTokenizer(), max_tokens=18)
+
+    assert all(_tokens(chunk) <= 14 for chunk in chunks)
+    assert all(chunk.replace(" ", "").endswith("。") for chunk in chunks)
+    assert "".join(chunks).replace(" ", "") == text
+
+
+def test_cjk_chunks_are_rejoined_without_spaces():
+    text = "今天天气很好。我们去公园散步吧！" * 4
+    chunks = _split_text_into_chunks(text, CharTokenizer(), max_tokens=20)
+
+    assert len(chunks) > 1
+    assert not any(" " in chunk for chunk in chunks)
+    assert "".join(chunks) == text
+
+
+def test_unbroken_text_falls_back_to_character_windows():
+    text = "字" * 100
+    chunks = _split_text_into_chunks(text, CharTokenizer(), max_tokens=34)
+
+    assert all(_tokens(chunk) <= 30 for chunk in chunks)
+    assert "".join(chunks).replace(" ", "") == text
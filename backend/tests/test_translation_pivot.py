@@ -0,0 +1,73 @@
+from app.config import settings
+from app.services import translation
+from app.utils.language_map import get_pivot_chain
+
+
+class FakeModelManager:
+    """Routes every pair to Opus-MT; translation itself is monkeypatched."""
+
+    def get_translation_model(self, src, tgt):
+        return None, None, "opus"
+
+    def translation_route(self, src, tgt):
+        return {"leg": f"{src}->{tgt}", "engine": "opus"}
+
+
+def _fake_legs(monkeypatch):
+    legs = []
+
+    def translate_single(texts, src, tgt, model_manager, use_cache, profile):
+        legs.append((src, tgt))
+        return [f"{text}>{tgt}" for text in texts]
+
+    monkeypatch.setattr(translation, "_translate_batch_single", translate_single)
+    return legs
+
+
+def test_pivot_chain_is_direct_by_default(monkeypatch):
+    monkeypatch.setattr(settings, "translation_opus_pivot", False)
+    assert get_pivot_chain("hi", "fr") == [("hi", "fr")]
+
+
+def test_pivot_chain_goes_through_english_on_opus(monkeypatch):
+    monkeypatch.setattr(settings, "translation_opus_pivot", True)
+    assert get_pivot_chain("hi", "fr") == [("hi", "en"), ("en", "fr")]
+    # Direct Opus-MT pairs and English legs never pivot
+    assert get_pivot_chain("es", "fr") == [("es", "fr")]
+    assert get_pivot_chain("hi", "en") == [("hi", "en")]
+
+
+def test_translate_multi_shares_the_english_leg(monkeypatch):
+    monkeypatch.setattr(settings, "translation_opus_pivot", True)
+    legs = _fake_legs(monkeypatch)
+
+    result = translation.translate_multi(
+        ["namaste"], "hi", ["fr", "de"], FakeModelManager(), use_cache=False
+    )
+
+    assert result == {"fr": ["namaste>en>fr"], "de": ["namaste>en>de"]}
+    assert legs.count(("hi", "en")) == 1
+    assert sorted(legs) == [("en", "de"), ("en", "fr"), ("hi", "en")]
+
+
+def test_translate_multi_reuses_english_target(monkeypatch):
+    monkeypatch.setattr(settings, "translation_opus_pivot", True)
+    legs = _fake_legs(monkeypatch)
+
+    result = translation.translate_multi(
+        ["namaste"], "hi", ["en", "fr"], FakeModelManager(), use_cache=False
+    )
+
+    assert result == {"en": ["namaste>en"], "fr": ["namaste>en>fr"]}
+    assert legs.count(("hi", "en")) == 1
+
+
+def test_plan_translation_reports_shared_pivot(monkeypatch):
+    monkeypatch.setattr(settings, "translation_opus_pivot", True)
+    plan = translation.plan_translation("hi", ["fr", "de", "es"])
+
+    assert plan["fr"] == {
+        "legs": ["hi->en", "en->fr"], "pivot": "en", "shared_pivot": True,
+    }
+    assert plan["es"]["pivot"] == "en"
+    assert plan["es"]["shared_pivot"] is True
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services.vad import SAMPLE_RATE, plan_chunks, speech_regions
+
+
+@pytest.fixture(autouse=True)
+def vad_settings(monkeypatch):
+    monkeypatch.setattr(settings, "vad_min_silence_ms", 500)
+    monkeypatch.setattr(settings, "vad_threshold_db", -35.0)
+    monkeypatch.setattr(settings, "vad_chunk_s", 30)
+
+
+def _audio(total_s: float, speech: list[tuple[float, float]]):
+    """Silence with bursts of noise standing in for speech."""
+    rng = np.random.default_rng(0)
+    audio = np.zeros(int(total_s * SAMPLE_RATE), dtype=np.float32)
+    for start, end in speech:
+        a, b = int(start * SAMPLE_RATE), int(end * SAMPLE_RATE)
+        audio[a:b] = rng.normal(0, 0.1, b - a)
+    return audio
+
+
+def test_silence_and_empty_audio_have_no_speech():
+    assert speech_regions(np.zeros(0, dtype=np.float32)) == []
+    assert speech_regions(np.zeros(SAMPLE_RATE * 5, dtype=np.float32)) == []
+    assert plan_chunks(np.zeros(SAMPLE_RATE * 5, dtype=np.float32)) == []
+
+
+def test_regions_are_padded_and_short_gaps_merged():
+    audio = _audio(20, [(2, 4), (4.3, 6), (10, 12)])
+    regions = [(s / SAMPLE_RATE, e / SAMPLE_RATE) for s, e in speech_regions(audio)]
+
+    # The 300 ms gap is below vad_min_silence_ms; the 4 s gap is not
+    assert len(regions) == 2
+    (a_start, a_end), (b_start, b_end) = regions
+    assert a_start == pytest.approx(1.8, abs=0.05)
+    assert a_end == pytest.approx(6.2, abs=0.05)
+    assert b_start == pytest.approx(9.8, abs=0.05)
+    assert b_end == pytest.approx(12.2, abs=0.05)
+
+
+def test_padding_is_clipped_at_the_edges():
+    audio = _audio(6, [(0, 2), (4, 6)])
+
+    (a_start, a_end), (b_start, b_end) = speech_regions(audio)
+    assert a_start == 0 and b_end == len(audio)
+    assert a_end / SAMPLE_RATE == pytest.approx(2.2, abs=0.05)
+    assert b_start / SAMPLE_RATE == pytest.approx(3.8, abs=0.05)
+
+
+def test_chunks_respect_max_length_and_skip_silence():
+    speech = [(t, t + 4) for t in range(1, 115, 7)]
+    audio = _audio(120, speech)
+    chunks = plan_chunks(audio, max_s=20)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert sum(e - s for s, e in chunk) <= 20 * SAMPLE_RATE
+    pieces = [piece for chunk in chunks for piece in chunk]
+    assert pieces == sorted(pieces)
+    assert pieces == speech_regions(audio)
+
+
+def test_long_region_is_cut_inside_the_window():
+    audio = _audio(70, [(0, 70)])
+    chunks = plan_chunks(audio, max_s=30)
+
+    pieces = [piece for chunk in chunks for piece in chunk]
+    assert all(e - s <= 30 * SAMPLE_RATE for s, e in pieces)
+    # Contiguous cuts cover the whole region
+    assert all(a[1] == b[0] for a, b in zip(pieces, pieces[1:]))
+    assert pieces[0][0] == 0 and pieces[-1][1] == len(audio)
+    # Each cut lands in the second half of its window
+    for s, e in pieces[:-1]:
+        assert e - s >= 15 * SAMPLE_RATE
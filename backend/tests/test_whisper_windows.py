@@ -0,0 +1,48 @@
+from app.services.transcription import _split_at_timestamps, _to_source
+
+TB = 1000  # timestamp_begin: tokens at or above it are timestamps
+PRECISION = 0.02
+
+
+def _split(tokens, duration=30.0):
+    return _split_at_timestamps(tokens, TB, PRECISION, duration)
+
+
+def test_timestamp_pairs_end_segments():
+    tokens = [TB, 1, 2, TB + 100, TB + 100, 3, TB + 150]
+    assert _split(tokens) == [
+        (0.0, 2.0, [TB, 1, 2, TB + 100]),
+        (2.0, 3.0, [TB + 100, 3, TB + 150]),
+    ]
+
+
+def test_open_last_segment_runs_to_window_end():
+    tokens = [TB, 1, 2, TB + 100, TB + 100, 3, 4]
+    segments = _split(tokens, duration=12.5)
+
+    assert segments[-1] == (2.0, 12.5, [TB + 100, 3, 4])
+
+
+def test_text_before_first_timestamp_starts_at_zero():
+    assert _split([1, 2, TB + 100]) == [(0.0, 2.0, [1, 2, TB + 100])]
+    assert _split([1, 2], duration=7.0) == [(0.0, 7.0, [1, 2])]
+
+
+def test_timestamp_only_pieces_are_dropped():
+    tokens = [TB, 1, TB + 50, TB + 50, TB + 60]
+    assert _split(tokens) == [(0.0, 1.0, [TB, 1, TB + 50])]
+
+
+# (offset in chunk, offset in source, length) in seconds
+SPANS = [(0.0, 10.0, 5.0), (5.0, 30.0, 4.0)]
+
+
+def test_to_source_maps_each_piece():
+    assert _to_source(0.0, SPANS) == 10.0
+    assert _to_source(4.5, SPANS) == 14.5
+    assert _to_source(5.0, SPANS) == 30.0
+    assert _to_source(7.25, SPANS) == 32.25
+
+
+def test_to_source_clamps_past_the_last_piece():
+    assert _to_source(20.0, SPANS) == 34.0
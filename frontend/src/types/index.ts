@@ -56,6 +56,7 @@ export interface ProgressUpdate {
   progress: number;
   step: string;
   detail: string;
+  transcript?: { start: number; end: number; text: string }[];
 }
 
 export interface User {